@@ -0,0 +1 @@
+"""MSTY Debt Tracker application package."""
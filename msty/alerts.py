@@ -0,0 +1,368 @@
+"""Rule-based alerts on MSTR market metrics.
+
+Users register rules such as "MSTR price below 310", "convergence above its
+10-day average" or "put ask for the 2026-12-18 300 strike below 12". All rules
+live in one table, ``<MSTY_DATA_DIR>/alerts/rules.parquet``, and each new chain
+snapshot is checked against the whole table in one vectorized pass: scalar
+metrics are looked up with a map and contract quotes with one join against the
+chain, so thousands of rules cost about as much as one.
+
+Rules are edge-triggered. A rule fires when its condition becomes true and
+re-arms once it is false again, so a breached level is mailed once instead of
+on every rerun. A rule compared against another metric (``reference``)
+therefore fires when the two cross. A rule whose email fails to go out is
+re-armed, so the send is retried on the next check.
+"""
+import logging
+import os
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timezone
+from email.message import EmailMessage
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from msty import config, files, perf
+from msty.memo import memoize
+
+logger = logging.getLogger(__name__)
+
+# Metrics computed from each snapshot (see ``snapshot_metrics``)
+METRICS = {
+    "price": "MSTR price",
+    "put_call_oi": "Put/Call ratio (OI)",
+    "put_call_volume": "Put/Call ratio (volume)",
+    "covered_call_ratio": "Covered call ratio",
+    "market_activity_ratio": "Market activity ratio",
+    "convergence": "Convergence",
+    "convergence_ma10": "Convergence 10-day average",
+}
+
+# Quotes of one contract: metric -> (option type, chain column)
+CONTRACT_METRICS = {
+    "put_ask": ("P", "ask"),
+    "put_bid": ("P", "bid"),
+    "call_ask": ("C", "ask"),
+    "call_bid": ("C", "bid"),
+}
+
+OPS = ("above", "below")
+MA_DAYS = 10
+
+_RULE_DTYPES = {
+    "id": "object",
+    "email": "object",
+    "metric": "object",
+    "op": "object",
+    "threshold": "float64",
+    "reference": "object",
+    "expiration": "datetime64[ns]",
+    "strike": "float64",
+    "note": "object",
+    "created_at": "datetime64[ns]",
+    "active": "bool",
+    "last_triggered": "datetime64[ns]",
+    "last_value": "float64",
+}
+
+# Rule and metric updates are read-modify-write on one file each
+_lock = threading.Lock()
+
+
+def alerts_dir(root=None):
+    return root or os.path.join(config.DATA_DIR, "alerts")
+
+
+def snapshot_metrics(chain, spot):
+    """Market metrics of one chain snapshot in the ``msty.snapshots`` column layout"""
+    is_call = (chain["type"] == "C").to_numpy()
+    strike = chain["strike"].to_numpy(dtype=float)
+    oi = chain["open_interest"].to_numpy(dtype=float)
+    volume = chain["volume"].to_numpy(dtype=float)
+    near = (strike >= spot * 0.95) & (strike <= spot * 1.05)
+
+    call_oi, put_oi = oi[is_call].sum(), oi[~is_call].sum()
+    call_volume, put_volume = volume[is_call].sum(), volume[~is_call].sum()
+    ntm_call_oi = oi[is_call & near].sum()
+    ntm_call_volume = volume[is_call & near].sum()
+    covered_call_ratio = ntm_call_oi / call_oi if call_oi > 0 else 0.0
+    market_activity_ratio = ntm_call_volume / call_volume if call_volume > 0 else 0.0
+    return {
+        "price": float(spot),
+        "total_call_oi": float(call_oi),
+        "total_put_oi": float(put_oi),
+        "total_call_volume": float(call_volume),
+        "total_put_volume": float(put_volume),
+        "ntm_call_oi": float(ntm_call_oi),
+        "ntm_call_volume": float(ntm_call_volume),
+        "covered_call_ratio": float(covered_call_ratio),
+        "market_activity_ratio": float(market_activity_ratio),
+        "put_call_oi": float(put_oi / call_oi) if call_oi > 0 else np.nan,
+        "put_call_volume": float(put_volume / call_volume) if call_volume > 0 else np.nan,
+        "convergence": float(covered_call_ratio - market_activity_ratio),
+    }
+
+
+@memoize(maxsize=8)
+def _read(path, mtime):
+    return None if mtime is None else pq.read_table(path, memory_map=True).to_pandas()
+
+
+def _cached(path):
+    """File contents memoized on its modification time; treat as read-only"""
+    return _read(path, os.stat(path).st_mtime_ns if os.path.exists(path) else None)
+
+
+def _metrics_path(root):
+    return os.path.join(alerts_dir(root), "metrics.parquet")
+
+
+def metrics_history(root=None):
+    """Stored daily metrics, one row per day; shared, treat as read-only"""
+    history = _cached(_metrics_path(root))
+    return pd.DataFrame(columns=["date"]) if history is None else history
+
+
+def with_history(metrics, day=None, root=None):
+    """Store today's metrics and add the moving averages that need history.
+
+    Returns ``(metrics, changed)``; ``changed`` is False when today's stored
+    metrics are identical, i.e. there is no new snapshot to check.
+    """
+    day = pd.Timestamp(day or datetime.now(timezone.utc).date())
+    path = _metrics_path(root)
+    row = pd.DataFrame([{"date": day, **metrics}])
+    changed = True
+    with _lock:
+        history = _cached(path)
+        if history is not None:
+            stored = history[history["date"] == day]
+            if not stored.empty:
+                same = stored.iloc[-1][list(metrics)].astype(float).to_numpy()
+                changed = not np.allclose(same, row[list(metrics)].to_numpy(dtype=float), equal_nan=True)
+            history = history[history["date"] < day]
+            history = pd.concat([history, row], ignore_index=True) if not history.empty else row
+        else:
+            history = row
+        if changed:
+            files.write_parquet(history, path)
+
+    metrics = dict(metrics, convergence_ma10=float(history["convergence"].tail(MA_DAYS).mean()))
+    return metrics, changed
+
+
+def _empty_rules():
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in _RULE_DTYPES.items()})
+
+
+def _rules_path(root):
+    return os.path.join(alerts_dir(root), "rules.parquet")
+
+
+def load_rules(root=None):
+    """All registered rules"""
+    rules = _cached(_rules_path(root))
+    return _empty_rules() if rules is None else rules
+
+
+def add_rule(email, metric, op, threshold=None, reference=None, expiration=None, strike=None, note="", root=None):
+    """Register a rule and return its id.
+
+    The rule compares ``metric`` against a fixed ``threshold`` or against
+    another metric named by ``reference``. Contract metrics (``put_ask`` etc.)
+    also need the contract's ``expiration`` and ``strike``.
+    """
+    if not email or "@" not in email:
+        raise ValueError("A valid email address is required")
+    if metric not in METRICS and metric not in CONTRACT_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if op not in OPS:
+        raise ValueError(f"Condition must be one of {', '.join(OPS)}")
+    if (threshold is None) == (not reference):
+        raise ValueError("Give either a threshold or a reference metric")
+    if reference and reference not in METRICS:
+        raise ValueError(f"Unknown reference metric: {reference}")
+    if metric in CONTRACT_METRICS and (expiration is None or strike is None):
+        raise ValueError("Contract alerts need an expiration and a strike")
+
+    rule = {
+        "id": uuid.uuid4().hex[:12],
+        "email": email.strip(),
+        "metric": metric,
+        "op": op,
+        "threshold": np.nan if threshold is None else float(threshold),
+        "reference": reference or "",
+        "expiration": pd.Timestamp(expiration) if expiration is not None else pd.NaT,
+        "strike": np.nan if strike is None else float(strike),
+        "note": note,
+        "created_at": pd.Timestamp.now(tz="UTC").tz_localize(None),
+        "active": False,
+        "last_triggered": pd.NaT,
+        "last_value": np.nan,
+    }
+    with _lock:
+        rules = load_rules(root)
+        row = pd.DataFrame([rule]).astype(_RULE_DTYPES)
+        rules = pd.concat([rules, row], ignore_index=True) if not rules.empty else row
+        files.write_parquet(rules, _rules_path(root))
+    return rule["id"]
+
+
+def remove_rule(rule_id, root=None):
+    with _lock:
+        rules = load_rules(root)
+        files.write_parquet(rules[rules["id"] != rule_id], _rules_path(root))
+
+
+def _contract_values(rules, chain):
+    """Current quote for each contract rule, NaN for the rest or unlisted contracts"""
+    fields = rules["metric"].map(CONTRACT_METRICS)
+    is_contract = fields.notna().to_numpy()
+    values = np.full(len(rules), np.nan)
+    if chain is None or not is_contract.any():
+        return values
+
+    wanted = pd.DataFrame({
+        "position": np.flatnonzero(is_contract),
+        "expiration": pd.to_datetime(rules["expiration"].to_numpy()[is_contract]),
+        "type": [kind for kind, _ in fields[is_contract]],
+        "strike": np.round(rules["strike"].to_numpy(dtype=float)[is_contract], 2),
+        "field": [column for _, column in fields[is_contract]],
+    })
+    quotes = pd.DataFrame({
+        "expiration": pd.to_datetime(chain["expiration"].astype("datetime64[ns]")).to_numpy(),
+        "type": chain["type"].astype(str).to_numpy(),
+        "strike": np.round(chain["strike"].to_numpy(dtype=float), 2),
+        "bid": chain["bid"].to_numpy(dtype=float),
+        "ask": chain["ask"].to_numpy(dtype=float),
+    })
+    matched = wanted.merge(quotes, on=["expiration", "type", "strike"], how="inner")
+    values[matched["position"].to_numpy()] = np.where(matched["field"] == "ask", matched["ask"], matched["bid"])
+    return values
+
+
+def evaluate(rules, metrics, chain=None):
+    """Whether each rule's condition holds, and the value it compared.
+
+    ``metrics`` maps metric names to values; ``chain`` is the snapshot frame
+    used for contract metrics. Rules whose inputs are missing evaluate False.
+    """
+    values = rules["metric"].map(metrics).to_numpy(dtype=float)
+    is_contract = rules["metric"].isin(list(CONTRACT_METRICS)).to_numpy()
+    values = np.where(is_contract, _contract_values(rules, chain), values)
+
+    has_reference = (rules["reference"] != "").to_numpy()
+    compared = np.where(has_reference, rules["reference"].map(metrics).to_numpy(dtype=float),
+                        rules["threshold"].to_numpy(dtype=float))
+    above = (rules["op"] == "above").to_numpy()
+    with np.errstate(invalid="ignore"):
+        holds = np.where(above, values > compared, values < compared)
+    return holds, values
+
+
+def check(metrics, chain=None, root=None, now=None, notify=None):
+    """Evaluate every rule, record which are active and return the ones that just fired.
+
+    Fired rules are recorded as active before ``notify`` is called with them,
+    outside the lock, so concurrent checks don't mail the same alert twice and
+    a slow mail server doesn't hold up rule edits. If ``notify`` raises
+    ``OSError`` or ``smtplib.SMTPException``, those rules are re-armed to fire
+    again on the next check, and none are returned.
+    """
+    now = now or pd.Timestamp.now(tz="UTC").tz_localize(None)
+    with _lock:
+        rules = load_rules(root)
+        if rules.empty:
+            return rules
+        with perf.span("alerts.evaluate", "compute", rules=len(rules)):
+            holds, values = evaluate(rules, metrics, chain)
+        active = rules["active"].to_numpy(dtype=bool)
+        fired = holds & ~active
+        if not (holds != active).any():
+            return rules[fired]
+        previous = rules.loc[fired, ["id", "last_value", "last_triggered"]]
+        rules = rules.copy()
+        rules["active"] = holds
+        rules.loc[fired, "last_value"] = values[fired]
+        rules.loc[fired, "last_triggered"] = now
+        files.write_parquet(rules, _rules_path(root))
+
+    triggered = rules[fired]
+    if notify is None or triggered.empty:
+        return triggered
+    try:
+        notify(triggered)
+    except (OSError, smtplib.SMTPException) as e:
+        logger.warning("Could not send %d alerts, retrying on the next check: %s", len(triggered), e)
+        _rearm(previous, root)
+        return triggered.iloc[:0]
+    return triggered
+
+
+def _rearm(previous, root=None):
+    """Mark rules inactive again with the values they had before firing"""
+    with _lock:
+        rules = load_rules(root)
+        restored = rules[["id"]].merge(previous, on="id", how="left")
+        rearm = rules["id"].isin(previous["id"]).to_numpy()
+        if not rearm.any():
+            return
+        rules = rules.copy()
+        rules.loc[rearm, "active"] = False
+        rules.loc[rearm, "last_value"] = restored.loc[rearm, "last_value"].to_numpy()
+        rules.loc[rearm, "last_triggered"] = restored.loc[rearm, "last_triggered"].to_numpy()
+        files.write_parquet(rules, _rules_path(root))
+
+
+def describe(rule):
+    """One-line description of a rule, e.g. ``MSTR price below 310.00``"""
+    if rule["metric"] in CONTRACT_METRICS:
+        kind, field = rule["metric"].split("_")
+        subject = f"MSTR {pd.Timestamp(rule['expiration']):%Y-%m-%d} ${rule['strike']:,.2f} {kind} {field}"
+    else:
+        subject = METRICS[rule["metric"]]
+    target = METRICS[rule["reference"]] if rule["reference"] else f"{rule['threshold']:,.2f}"
+    return f"{subject} {rule['op']} {target}"
+
+
+def send(triggered):
+    """Mail fired rules, one message per recipient; returns the number of messages sent"""
+    if triggered.empty:
+        return 0
+    if not (config.EMAIL_FROM and config.SMTP_SERVER):
+        logger.warning("%d alerts fired but EMAIL_FROM/SMTP_SERVER are not configured", len(triggered))
+        return 0
+
+    sent = 0
+    with perf.span("alerts.send", "fetch", alerts=len(triggered)):
+        with smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT, timeout=10) as server:
+            server.starttls()
+            if config.EMAIL_PASSWORD:
+                server.login(config.EMAIL_FROM, config.EMAIL_PASSWORD)
+            for email, group in triggered.groupby("email"):
+                lines = [f"- {describe(rule)} (now {rule['last_value']:,.2f})"
+                         + (f": {rule['note']}" if rule["note"] else "")
+                         for _, rule in group.iterrows()]
+                message = EmailMessage()
+                message["Subject"] = f"MSTY Tool: {len(group)} alert(s) triggered"
+                message["From"] = config.EMAIL_FROM
+                message["To"] = email
+                message.set_content("The following alerts were triggered:\n\n" + "\n".join(lines))
+                server.send_message(message)
+                sent += 1
+    return sent
+
+
+def check_snapshot(chain, spot, root=None, force=False):
+    """Check all rules against a new chain snapshot and mail whatever fired.
+
+    Returns ``(metrics, fired)``. Snapshots identical to the last one checked
+    today are skipped unless ``force`` is set.
+    """
+    metrics, changed = with_history(snapshot_metrics(chain, spot), root=root)
+    if not (changed or force):
+        return metrics, _empty_rules()
+    return metrics, check(metrics, chain, root, notify=send)
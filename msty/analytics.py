@@ -0,0 +1,240 @@
+"""Historical options analytics over stored chain snapshots.
+
+Five derived tables are computed with grouped, vectorized operations across
+all snapshots and persisted as Parquet next to the snapshots:
+
+- ``term_structure``: ATM implied vol per snapshot and expiration
+- ``skew``: 25-delta put IV minus 25-delta call IV per snapshot and expiration
+- ``max_pain``: max-pain strike per snapshot and expiration
+- ``strike_activity``: OI and volume per strike with the change since the
+  previous snapshot
+- ``premium_yield``: covered-call yield per moneyness bucket (see
+  ``msty.yields``), tracked over time as a proxy for MSTY distributions
+
+Snapshots are append-only, so ``refresh`` only processes snapshot files that
+are not in the derived tables yet. The snapshots each table was built from
+and the tables themselves are memoized on the tables' modification times, so
+reruns that find nothing new cost a snapshot listing and one ``stat`` per
+table.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from msty import config, files, perf, pricing, snapshots, yields
+from msty.memo import memoize
+
+TABLES = ("term_structure", "skew", "max_pain", "strike_activity", "premium_yield")
+
+SNAPSHOT_COLUMNS = ["expiration", "type", "strike", "bid", "ask", "last_price", "volume", "open_interest",
+                    "implied_volatility"]
+
+# Yahoo reports placeholder IVs near zero for contracts without quotes
+MIN_IV = 0.01
+SKEW_DELTA = 0.25
+
+# One refresh at a time, so sessions don't fold the same snapshots in twice
+_lock = threading.Lock()
+
+
+def derived_dir(symbol, root=None):
+    return os.path.join(root or os.path.join(config.DATA_DIR, "derived"), symbol)
+
+
+def _source(path):
+    """Snapshot identity stored in the derived tables: ``date=.../HHMMSS.parquet``"""
+    return "/".join(path.replace(os.sep, "/").split("/")[-2:])
+
+
+def load_snapshots(paths, columns=SNAPSHOT_COLUMNS):
+    """Concatenate snapshots into one frame with per-row snapshot time and spot"""
+    tables = []
+    for path in paths:
+        table = snapshots.read_snapshot(path, columns=columns)
+        meta = snapshots.snapshot_metadata(table.schema)
+        n = table.num_rows
+        table = table.append_column("source", pa.array([_source(path)] * n).dictionary_encode())
+        table = table.append_column("taken_at", pa.array(np.full(n, np.datetime64(meta["taken_at"].replace(tzinfo=None), "s"))))
+        table = table.append_column("spot", pa.array(np.full(n, meta["underlying_price"], dtype=np.float32)))
+        tables.append(table.replace_schema_metadata(None))
+    if not tables:
+        return pd.DataFrame(columns=columns + ["source", "taken_at", "spot"])
+    df = pa.concat_tables(tables, promote_options="default").to_pandas()
+    df["expiration"] = pd.to_datetime(df["expiration"])
+    df["years"] = (df["expiration"] - df["taken_at"].dt.normalize()).dt.days.to_numpy() / pricing.DAYS_PER_YEAR
+    return df
+
+
+def term_structure(df):
+    """ATM implied vol per snapshot and expiration (mean of the ATM call and put)"""
+    quoted = df[(df["implied_volatility"] > MIN_IV) & (df["years"] > 0)].reset_index(drop=True)
+    quoted = quoted.assign(distance=(quoted["strike"] - quoted["spot"]).abs())
+    keys = ["source", "taken_at", "expiration"]
+    atm = quoted.loc[quoted.groupby(keys + ["type"], observed=True)["distance"].idxmin()]
+    return (atm.groupby(keys, observed=True)
+            .agg(atm_iv=("implied_volatility", "mean"), years=("years", "first"), spot=("spot", "first"))
+            .reset_index())
+
+
+def skew(df, target=SKEW_DELTA):
+    """25-delta risk reversal per snapshot and expiration: put IV minus call IV"""
+    quoted = df[(df["implied_volatility"] > MIN_IV) & (df["years"] > 0)].reset_index(drop=True)
+    is_call = (quoted["type"] == "C").to_numpy()
+    args = (quoted["spot"].to_numpy(), quoted["strike"].to_numpy(), quoted["years"].to_numpy(),
+            quoted["implied_volatility"].to_numpy())
+    delta = np.where(is_call, pricing.call_delta(*args), pricing.put_delta(*args))
+    quoted = quoted.assign(delta_gap=np.abs(np.abs(delta) - target))
+    keys = ["source", "taken_at", "expiration"]
+    wings = quoted.loc[quoted.groupby(keys + ["type"], observed=True)["delta_gap"].idxmin()]
+    table = wings.pivot_table(index=keys, columns="type", values="implied_volatility", observed=True)
+    table = table.reindex(columns=["C", "P"]).rename(columns={"C": "call_iv", "P": "put_iv"})
+    table["skew"] = table["put_iv"] - table["call_iv"]
+    table.columns.name = None
+    return table.reset_index()
+
+
+def max_pain(df):
+    """Strike minimizing total option holder payout, per snapshot and expiration.
+
+    For strikes K sorted within a group, call payout at settlement S_j is
+    S_j * cumsum(C) - cumsum(C * K) and put payout is the mirror image over
+    the strikes above, so every candidate is evaluated with grouped cumsums
+    instead of a strikes x strikes matrix.
+    """
+    keys = ["source", "taken_at", "expiration"]
+    oi = (df.pivot_table(index=keys + ["strike"], columns="type", values="open_interest",
+                         aggfunc="sum", fill_value=0, observed=True)
+          .reindex(columns=["C", "P"], fill_value=0)
+          .astype(float)
+          .reset_index())
+    strike = oi["strike"].astype(float)
+    oi["CK"] = oi["C"] * strike
+    oi["PK"] = oi["P"] * strike
+    grouped = oi.groupby(keys, observed=True, sort=False)
+    prefix = grouped[["C", "CK", "P", "PK"]].cumsum()
+    totals = grouped[["C", "P", "PK"]].transform("sum")
+
+    call_pay = strike * prefix["C"] - prefix["CK"]
+    # Suffix sums over the strikes at and above the settlement strike
+    put_pay = (totals["PK"] - prefix["PK"] + oi["PK"]) - strike * (totals["P"] - prefix["P"] + oi["P"])
+
+    oi["holder_payout"] = (call_pay + put_pay) * 100
+    oi["total_oi"] = totals["C"] + totals["P"]
+    best = oi.loc[grouped["holder_payout"].idxmin()]
+    return best.rename(columns={"strike": "max_pain"})[keys + ["max_pain", "holder_payout", "total_oi"]].reset_index(drop=True)
+
+
+def strike_activity(df):
+    """OI and volume per strike with changes versus the previous snapshot"""
+    keys = ["expiration", "type", "strike"]
+    table = (df.groupby(keys + ["source", "taken_at"], observed=True)
+             [["open_interest", "volume"]].sum()
+             .reset_index())
+    return with_changes(table)
+
+
+def with_changes(table):
+    table = table.sort_values(["expiration", "type", "strike", "taken_at"], kind="stable").reset_index(drop=True)
+    grouped = table.groupby(["expiration", "type", "strike"], observed=True)
+    table["oi_change"] = grouped["open_interest"].diff()
+    table["volume_change"] = grouped["volume"].diff()
+    return table
+
+
+def premium_yield(df):
+    """OI-weighted annualized covered-call yield per snapshot and moneyness bucket"""
+    keys = ["source", "taken_at"]
+    calls = yields.call_yields(df, df["spot"], df["taken_at"])
+    calls[keys] = df.loc[calls.index, keys]
+    table = yields.yield_by_bucket(calls, by=keys)
+    table = table.join(yields.distribution_proxies(calls, keys), on=keys)
+    table["bucket"] = table["bucket"].astype(str)
+    return table
+
+
+_BUILDERS = {
+    "term_structure": term_structure,
+    "skew": skew,
+    "max_pain": max_pain,
+    "strike_activity": strike_activity,
+    "premium_yield": premium_yield,
+}
+
+
+def _read(path):
+    return pq.read_table(path, memory_map=True).to_pandas() if os.path.exists(path) else None
+
+
+@memoize(maxsize=16)
+def _sources(path, mtime):
+    return frozenset(pq.read_table(path, columns=["source"], memory_map=True).column("source").to_pylist())
+
+
+def _processed(path):
+    """Snapshots a derived table was built from"""
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        return frozenset()
+    return _sources(path, mtime)
+
+
+def refresh(symbol, snapshot_root=None, root=None):
+    """Fold snapshots not yet processed into the derived tables on disk.
+
+    Each table tracks the snapshots it was built from, so a table added later
+    is backfilled without recomputing the others. Returns the number of
+    snapshots read.
+    """
+    with _lock:
+        return _refresh(symbol, snapshot_root, root)
+
+
+def _refresh(symbol, snapshot_root, root):
+    directory = derived_dir(symbol, root)
+    paths = snapshots.list_snapshots(symbol, snapshot_root)
+    missing = {}
+    for name in TABLES:
+        done = _processed(os.path.join(directory, f"{name}.parquet"))
+        missing[name] = {_source(p) for p in paths if _source(p) not in done}
+    new_paths = [p for p in paths if any(_source(p) in m for m in missing.values())]
+    if not new_paths:
+        return 0
+
+    with perf.span("analytics.refresh", "compute", snapshots=len(new_paths)):
+        df = load_snapshots(new_paths)
+        df["source"] = df["source"].astype(str)
+        for name in TABLES:
+            if not missing[name]:
+                continue
+            path = os.path.join(directory, f"{name}.parquet")
+            table = _BUILDERS[name](df[df["source"].isin(missing[name])])
+            table["source"] = table["source"].astype(str)
+            existing = _read(path)
+            if existing is not None:
+                existing["source"] = existing["source"].astype(str)
+                table = pd.concat([existing, table], ignore_index=True)
+            if name == "strike_activity":
+                table = with_changes(table.drop(columns=["oi_change", "volume_change"]))
+            files.write_parquet(table, path)
+    return len(new_paths)
+
+
+@memoize(maxsize=8)
+def _load(paths_and_mtimes):
+    return {name: _read(path) for name, path, _ in paths_and_mtimes}
+
+
+def derived_tables(symbol, root=None):
+    """The derived tables as DataFrames (None where nothing is stored yet)"""
+    directory = derived_dir(symbol, root)
+    entries = []
+    for name in TABLES:
+        path = os.path.join(directory, f"{name}.parquet")
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        entries.append((name, path, mtime))
+    return _load(tuple(entries))
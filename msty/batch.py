@@ -0,0 +1,226 @@
+"""Headless batch runs of the simulators, without Streamlit.
+
+    python -m msty.batch scenarios/ --out results/ --format parquet --workers 4
+
+Each argument is a JSON parameter file or a directory of them. A file holds
+up to three sections, each taking the same inputs as its tab::
+
+    {
+      "name": "base-case",
+      "compounding": {"initial_shares": 1000, "avg_dividend": 2.0, "reinvest_price": 25.0,
+                      "months": 120, "acct_type": "Taxable", "fed_tax": 22, "state_tax": 5,
+                      "reinvest_dividends": true, "reinvest_percent": 100, "withdrawal": 0},
+      "return_on_debt": {"debt_amount": 100000, "monthly_principal": 3000, "interest_rate": 5,
+                         "share_cost": 25, "loan_term": 36, "compounding_term": 36,
+                         "reinvest_price": 30, "avg_dividend": 2, "expected_price": 40},
+      "hedge": {"msty_holdings": 5000, "msty_price": 25, "expected_exit_price": 17.5,
+                "hedge_percentage": 50, "correlation": 0.85, "days": 30}
+    }
+
+``compounding.lots`` may be a list of ``{"Shares", "Price", "Months Held"}``
+lots. Hedges are evaluated against the latest stored MSTR option snapshot
+(see ``msty.snapshots``), so a batch makes no Yahoo calls; ``mstr_price``
+overrides the snapshot's underlying price and ``expiration`` picks an
+expiration instead of the first one at least ``days`` out.
+
+Files are processed in parallel on a process pool. Results go to
+``<out>/<name>/<section>.<format>``, plus ``summary.<format>`` with one row
+per file; the exit status is 1 if any file failed. ``name`` (default: the
+file name) may only use letters, digits, ``.``, ``_`` and ``-``, and files
+sharing a name are reported as failed instead of overwriting each other.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from msty import files, snapshots
+from msty.debt import return_on_debt
+from msty.hedging import position_metrics, hedge_strategies, cost_benefit
+from msty.simulator import simulate_compounding
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "parquet")
+SECTIONS = ("compounding", "return_on_debt", "hedge")
+HEDGE_DAYS = 30
+_NAME = re.compile(r"^(?!\.+$)[\w.-]{1,128}$")
+_PUT_COLUMNS = ["expiration", "strike", "last_price", "bid", "ask", "volume", "open_interest", "implied_volatility"]
+
+
+def parameter_files(paths):
+    """JSON files named directly or found (non-recursively) in the given directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json"))
+        else:
+            files.append(path)
+    return files
+
+
+def run_compounding(params):
+    params = dict(params)
+    today = datetime.today()
+    params.setdefault("start_year", today.year)
+    params.setdefault("start_month", today.month)
+    if params.get("lots") is not None:
+        params["lots"] = pd.DataFrame(params["lots"])
+    monthly_df, totals = simulate_compounding(**params)
+    return monthly_df, totals
+
+
+def run_return_on_debt(params):
+    result = return_on_debt(**params)
+    return pd.DataFrame([result]), result
+
+
+def snapshot_puts(path, days=HEDGE_DAYS, expiration=None, now=None):
+    """Puts of one expiration from a stored snapshot, and the snapshot's underlying price"""
+    table = snapshots.read_snapshot(path, columns=["expiration"])
+    meta = snapshots.snapshot_metadata(table.schema)
+    if expiration is None:
+        now = pd.Timestamp(now or meta["taken_at"].date())
+        expirations = pd.to_datetime(table.column("expiration").unique().to_pandas()).sort_values()
+        later = expirations[expirations >= now + pd.Timedelta(days=days)]
+        if later.empty:
+            raise ValueError(f"No expiration at least {days} days out in {path}")
+        expiration = later.iloc[0]
+    chain = snapshots.to_frame(snapshots.read_snapshot(path, expirations=[expiration]))
+    puts = chain[chain["type"] == "P"][_PUT_COLUMNS].reset_index(drop=True)
+    if puts.empty:
+        raise ValueError(f"No puts for {pd.Timestamp(expiration):%Y-%m-%d} in {path}")
+    return puts.astype({"strike": float, "ask": float}), meta["underlying_price"]
+
+
+def run_hedge(params, snapshot_path):
+    params = dict(params)
+    if snapshot_path is None:
+        raise ValueError("No stored MSTR option snapshot; open Market Monitoring once to capture one")
+    puts, spot = snapshot_puts(snapshot_path, params.pop("days", HEDGE_DAYS), params.pop("expiration", None))
+    current_mstr_price = params.pop("mstr_price", spot)
+    metrics = position_metrics(current_mstr_price=current_mstr_price, **params)
+    _, strategies = hedge_strategies(puts, current_mstr_price, metrics["mstr_equivalent_exit"],
+                                     metrics["contracts_needed"])
+    table = cost_benefit(strategies, metrics["msty_position_value"], metrics["max_loss_without_hedge"])
+    table.insert(1, "Expiration", puts["expiration"].iloc[0])
+    table["Contracts"] = [s["contracts"] for s in strategies]
+    table["Premium per Contract"] = [s["ask"] for s in strategies]
+    return table, dict(metrics, mstr_price=current_mstr_price)
+
+
+def write_frame(df, path, fmt):
+    if fmt == "parquet":
+        files.write_parquet(df, path)
+    else:
+        files.atomic_write(path, lambda tmp_path: df.to_csv(tmp_path, index=False))
+
+
+def result_name(path, params):
+    """Output directory name of a parameter file: its ``name``, or the file name"""
+    name = params.get("name", os.path.splitext(os.path.basename(path))[0])
+    if not isinstance(name, str) or not _NAME.match(name):
+        raise ValueError(f"Invalid name {name!r}; use letters, digits, '.', '_' and '-'")
+    return name
+
+
+def _peek_name(path):
+    try:
+        with open(path) as f:
+            return result_name(path, json.load(f))
+    except Exception:
+        # run_file reports unreadable files and bad names
+        return None
+
+
+def run_file(path, out_dir, fmt, snapshot_path=None):
+    """Run every section of one parameter file and write its results; returns a summary row"""
+    start = time.perf_counter()
+    name = os.path.splitext(os.path.basename(path))[0]
+    row = {"file": path, "name": name}
+    try:
+        with open(path) as f:
+            params = json.load(f)
+        name = row["name"] = params.get("name", name)
+        result_name(path, params)
+        unknown = set(params) - set(SECTIONS) - {"name"}
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+
+        runners = {
+            "compounding": run_compounding,
+            "return_on_debt": run_return_on_debt,
+            "hedge": lambda p: run_hedge(p, snapshot_path),
+        }
+        for section in SECTIONS:
+            if section not in params:
+                continue
+            table, totals = runners[section](params[section])
+            write_frame(table, os.path.join(out_dir, name, f"{section}.{fmt}"), fmt)
+            row.update({f"{section}.{key}": value for key, value in totals.items()
+                        if isinstance(value, (int, float, str))})
+        row["status"] = "ok"
+    except Exception as e:
+        row["status"] = f"error: {type(e).__name__}: {e}"
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+def run_batch(paths, out_dir, fmt="csv", workers=None, snapshot_path=None):
+    """Run all parameter files on a process pool and write the summary table"""
+    paths = parameter_files(paths)
+    if snapshot_path is None:
+        snapshot_path = snapshots.latest_snapshot("MSTR")
+
+    rows = {}
+    by_name = {}
+    for path in paths:
+        by_name.setdefault(_peek_name(path), []).append(path)
+    for name, shared in by_name.items():
+        if name is not None and len(shared) > 1:
+            for path in shared:
+                rows[path] = {"file": path, "name": name, "seconds": 0.0,
+                              "status": f"error: ValueError: Name {name!r} is used by {len(shared)} files"}
+
+    pending = [path for path in paths if path not in rows]
+    if workers == 1 or len(pending) < 2:
+        results = [run_file(path, out_dir, fmt, snapshot_path) for path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_file, pending, [out_dir] * len(pending), [fmt] * len(pending),
+                                    [snapshot_path] * len(pending)))
+    rows.update(zip(pending, results))
+    summary = pd.DataFrame([rows[path] for path in paths])
+    write_frame(summary, os.path.join(out_dir, f"summary.{fmt}"), fmt)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m msty.batch", description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", help="parameter files or directories of them")
+    parser.add_argument("--out", default="results", help="output directory (default: results)")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--snapshot", default=None, help="option snapshot file for hedges (default: latest stored)")
+    args = parser.parse_args(argv)
+    if not parameter_files(args.paths):
+        parser.error("no parameter files found")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    summary = run_batch(args.paths, args.out, args.format, args.workers, args.snapshot)
+    failed = summary[summary["status"] != "ok"]
+    for _, row in failed.iterrows():
+        logger.error("%s: %s", row["file"], row["status"])
+    logger.info("%d of %d files ok, results in %s", len(summary) - len(failed), len(summary), args.out)
+    return 1 if len(failed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""Settings read from the environment (see the README)."""
+import os
+
+# Root directory for locally stored market data
+DATA_DIR = os.getenv("MSTY_DATA_DIR", "data")
+
+# Option-income ETFs shown in the fund tracker
+FUND_SYMBOLS = [s.strip().upper() for s in os.getenv("MSTY_FUNDS", "MSTY,YMAX,ULTY,CONY,QYLD,JEPI").split(",")
+                if s.strip()]
+
+# Outgoing mail for alerts
+EMAIL_FROM = os.getenv("EMAIL_FROM")
+EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+SMTP_SERVER = os.getenv("SMTP_SERVER")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+
+# Live quote source for streaming mode: "yahoo" or "simulated"
+QUOTE_PROVIDER = os.getenv("MSTY_QUOTES", "yahoo")
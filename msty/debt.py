@@ -0,0 +1,45 @@
+"""Return on debt calculations, independent of the Streamlit UI."""
+import numpy as np
+import pandas as pd
+
+from msty.memo import memoize
+
+
+@memoize(maxsize=32)
+def return_on_debt(debt_amount, monthly_principal, interest_rate, share_cost, loan_term,
+                   compounding_term, reinvest_price, avg_dividend, expected_price):
+    """Shares bought with debt, interest cost and the value at the exit price"""
+    initial_shares = debt_amount / share_cost
+    monthly_interest = (debt_amount * (interest_rate / 100)) / 12
+    total_interest = monthly_interest * loan_term
+    monthly_income = initial_shares * avg_dividend
+    reinvestable = max(monthly_income - monthly_principal, 0)
+    new_shares = (reinvestable / reinvest_price) * compounding_term
+    final_share_count = initial_shares + new_shares
+    final_value = final_share_count * expected_price
+    return {
+        "initial_shares": initial_shares,
+        "total_interest": total_interest,
+        "new_shares": new_shares,
+        "final_share_count": final_share_count,
+        "final_value": final_value,
+    }
+
+
+def loan_balances(debt_amount, monthly_principal, loan_term):
+    """Balance outstanding after each of months ``0..loan_term``; the rest is due at the end of the term"""
+    balances = np.maximum(debt_amount - monthly_principal * np.arange(loan_term + 1), 0.0)
+    balances[-1] = 0.0
+    return balances
+
+
+@memoize(maxsize=32)
+def loan_schedule(debt_amount, monthly_principal, interest_rate, loan_term, start):
+    """Monthly payments from ``start``: interest on the balance, principal and the balance after paying"""
+    balances = loan_balances(debt_amount, monthly_principal, loan_term)
+    return pd.DataFrame({
+        "Date": pd.date_range(pd.Timestamp(start), periods=loan_term + 1, freq="MS")[1:],
+        "Interest": balances[:-1] * interest_rate / 100 / 12,
+        "Principal": balances[:-1] - balances[1:],
+        "Balance": balances[1:],
+    })
@@ -0,0 +1,36 @@
+"""Atomic writes for files stored under ``MSTY_DATA_DIR``.
+
+A file is written to a uniquely named temporary file in its own directory and
+then moved into place, so readers never see a half-written file and writers
+in other sessions, batch runs or processes never share a temporary file; the
+last complete write wins. Temporary names start with a dot, which Arrow
+dataset scans skip.
+"""
+import os
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def atomic_write(path, write):
+    """Call ``write(tmp_path)`` on a fresh temporary file next to ``path``, then replace ``path`` with it"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_parquet(df, path, **kwargs):
+    """Atomically write a DataFrame (without its index) as zstd-compressed Parquet"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    atomic_write(path, lambda tmp_path: pq.write_table(table, tmp_path, compression="zstd", **kwargs))
@@ -0,0 +1,143 @@
+"""Holdings and flow tracker for option-income ETFs.
+
+One row per fund per day is kept in ``<MSTY_DATA_DIR>/funds/history.parquet``
+with the fund's price, NAV, AUM, volume and shares outstanding. Creations and
+redemptions show up as changes in shares outstanding, so the daily flow
+estimate is the share change times NAV. Funds that do not report a share
+count fall back to the AUM change net of the NAV move.
+
+Flows are computed when a day is recorded, against the fund's previous stored
+day only, so recording never rescans the history.
+"""
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from msty import config, files, perf
+from msty.memo import memoize
+
+COLUMNS = ["date", "symbol", "name", "price", "nav", "aum", "volume", "shares_outstanding", "flow_shares", "flow"]
+
+# Fields compared to decide whether a day's row changed since it was stored
+_VALUES = ["price", "nav", "aum", "volume", "shares_outstanding"]
+
+# Sessions recording at the same time would otherwise drop each other's rows
+_lock = threading.Lock()
+
+
+def history_path(root=None):
+    return os.path.join(root or os.path.join(config.DATA_DIR, "funds"), "history.parquet")
+
+
+def _number(info, *keys):
+    for key in keys:
+        value = info.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return float(value)
+    return np.nan
+
+
+def fund_rows(infos, day):
+    """One history row per fund from ``{symbol: info}``"""
+    rows = []
+    for symbol, info in infos.items():
+        price = _number(info, "regularMarketPrice", "previousClose")
+        nav = _number(info, "navPrice")
+        nav = price if np.isnan(nav) else nav
+        aum = _number(info, "totalAssets")
+        shares = _number(info, "sharesOutstanding")
+        if np.isnan(shares) and nav > 0:
+            shares = aum / nav
+        rows.append({
+            "date": day,
+            "symbol": symbol,
+            "name": info.get("longName") or info.get("shortName") or symbol,
+            "price": price,
+            "nav": nav,
+            "aum": aum,
+            "volume": _number(info, "volume", "regularMarketVolume"),
+            "shares_outstanding": shares,
+        })
+    return pd.DataFrame(rows, columns=COLUMNS[:-2])
+
+
+def estimate_flows(rows, previous):
+    """Share change and dollar flow of ``rows`` versus ``previous`` (aligned by position).
+
+    Missing previous values leave the estimate NaN rather than counting the
+    whole fund as a creation.
+    """
+    def values(frame, column):
+        return frame[column].to_numpy(dtype=float)
+
+    flow_shares = values(rows, "shares_outstanding") - values(previous, "shares_outstanding")
+    flow = flow_shares * values(rows, "nav")
+    # AUM change that is not explained by the NAV move
+    aum_flow = values(rows, "aum") - values(previous, "aum") * values(rows, "nav") / values(previous, "nav")
+    return rows.assign(flow_shares=flow_shares, flow=np.where(np.isnan(flow), aum_flow, flow))
+
+
+@memoize(maxsize=4)
+def _load(path, mtime):
+    if mtime is None:
+        return pd.DataFrame(columns=COLUMNS)
+    df = pq.read_table(path, memory_map=True).to_pandas()
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+    return df
+
+
+def load_history(root=None):
+    """The stored fund history, memoized on the file's modification time"""
+    path = history_path(root)
+    return _load(path, os.path.getmtime(path) if os.path.exists(path) else None)
+
+
+def record(infos, day=None, root=None):
+    """Store today's row for each fund and return the full history.
+
+    A fund already recorded today is replaced by the fresher values; the file
+    is only rewritten when something changed.
+    """
+    day = day or datetime.now(timezone.utc).date()
+    rows = fund_rows(infos, day)
+    with _lock:
+        return _record(rows, day, root)
+
+
+def _record(rows, day, root):
+    history = load_history(root)
+    if rows.empty:
+        return history
+
+    stored = history[(history["date"] == day) & history["symbol"].isin(rows["symbol"])]
+    if len(stored) == len(rows):
+        merged = rows.merge(stored, on="symbol", suffixes=("", "_stored"))
+        same = [np.allclose(merged[c], merged[f"{c}_stored"], equal_nan=True) for c in _VALUES]
+        if len(merged) == len(rows) and all(same):
+            return history
+
+    with perf.span("funds.record", "compute", funds=len(rows)):
+        earlier = history[history["date"] < day]
+        previous = (earlier.sort_values("date", kind="stable").groupby("symbol").tail(1)
+                    .set_index("symbol").reindex(rows["symbol"]).reset_index())
+        rows = estimate_flows(rows, previous)
+        kept = history[~((history["date"] == day) & history["symbol"].isin(rows["symbol"]))]
+        frames = [frame for frame in (kept, rows) if not frame.empty]
+        history = pd.concat(frames, ignore_index=True).sort_values(["symbol", "date"], kind="stable")
+        history = history.reset_index(drop=True)
+        files.write_parquet(history[COLUMNS], history_path(root))
+    return history
+
+
+def latest(history):
+    """Most recent row per fund"""
+    return history.sort_values("date", kind="stable").groupby("symbol").tail(1).reset_index(drop=True)
+
+
+def flow_table(history):
+    """Estimated daily flows, dates x funds"""
+    return history.pivot(index="date", columns="symbol", values="flow")
@@ -0,0 +1,99 @@
+"""Put hedge calculations for MSTY positions, independent of the Streamlit UI."""
+import numpy as np
+import pandas as pd
+
+from msty.memo import memoize
+
+CONTRACT_SIZE = 100
+
+
+def position_metrics(msty_holdings, msty_price, expected_exit_price, hedge_percentage,
+                     current_mstr_price, correlation):
+    """Position value, hedge size and MSTR-equivalent exit for an MSTY holding"""
+    msty_position_value = msty_holdings * msty_price
+    hedge_value_needed = msty_position_value * (hedge_percentage / 100)
+
+    # Calculate max loss with protection against division by zero
+    if msty_position_value > 0:
+        max_loss_without_hedge = msty_position_value - (msty_holdings * expected_exit_price)
+        max_loss_percentage = f"-{(max_loss_without_hedge/msty_position_value*100):,.1f}%"
+    else:
+        max_loss_without_hedge = 0
+        max_loss_percentage = "0%"
+
+    mstr_equivalent = hedge_value_needed / (current_mstr_price * correlation)
+    return {
+        "msty_position_value": msty_position_value,
+        "hedge_value_needed": hedge_value_needed,
+        "max_loss_without_hedge": max_loss_without_hedge,
+        "max_loss_percentage": max_loss_percentage,
+        "mstr_equivalent": mstr_equivalent,
+        "contracts_needed": mstr_equivalent / CONTRACT_SIZE,
+        "mstr_equivalent_exit": expected_exit_price / msty_price * current_mstr_price,
+    }
+
+
+def hedge_cost(strike_price, option_price, contracts_needed, mstr_equivalent_exit):
+    """Contracts, premium, notional protection and protection at the exit price"""
+    contracts = round(contracts_needed, 2)
+    total_cost = contracts * option_price * CONTRACT_SIZE
+    max_protection = contracts * strike_price * CONTRACT_SIZE
+    protection_at_exit = contracts * max(0, strike_price - mstr_equivalent_exit) * CONTRACT_SIZE
+    return contracts, total_cost, max_protection, protection_at_exit
+
+
+@memoize(maxsize=32)
+def hedge_strategies(puts, current_mstr_price, mstr_equivalent_exit, contracts_needed):
+    """Rank a put chain and pick the target-exit, ATM and OTM strikes.
+
+    Returns the ranked chain and a list of strategy dicts; the OTM strategy is
+    omitted when no strike is below the current price. The chain must not be
+    empty.
+    """
+    puts_df = puts.copy()
+    puts_df['Strike_Diff'] = abs(puts_df['strike'] - mstr_equivalent_exit)
+    puts_df['Strike_Pct'] = (puts_df['strike'] - current_mstr_price) / current_mstr_price * 100
+    puts_df = puts_df.sort_values('Strike_Diff')
+    puts_df['Current_Price_Diff'] = abs(puts_df['strike'] - current_mstr_price)
+
+    picks = [("Target Exit", puts_df.iloc[0]),
+             ("ATM", puts_df.sort_values('Current_Price_Diff').iloc[0])]
+    otm_puts = puts_df[puts_df['strike'] < current_mstr_price].sort_values('strike', ascending=False)
+    if not otm_puts.empty:
+        picks.append(("OTM", otm_puts.iloc[0]))
+
+    strategies = []
+    for name, put in picks:
+        contracts, total_cost, max_protection, exit_protection = hedge_cost(
+            put['strike'], put['ask'], contracts_needed, mstr_equivalent_exit)
+        strategies.append({
+            "name": name,
+            "strike": put['strike'],
+            "ask": put['ask'],
+            "contracts": contracts,
+            "total_cost": total_cost,
+            "max_protection": max_protection,
+            "exit_protection": exit_protection,
+        })
+    return puts_df, strategies
+
+
+@memoize(maxsize=32)
+def hedged_values(strikes, msty_position_value, mstr_equivalent, current_mstr_price, points=100):
+    """Hedged position value across an MSTR price range, one row per strike"""
+    price_range = np.linspace(current_mstr_price * 0.5, current_mstr_price * 1.5, points)
+    strikes = np.asarray(strikes, dtype=float)[:, None]
+    values = msty_position_value - np.maximum(0, strikes - price_range) * mstr_equivalent
+    return price_range, values
+
+
+def cost_benefit(strategies, msty_position_value, max_loss_without_hedge):
+    """Cost-benefit table comparing hedge strategies"""
+    return pd.DataFrame({
+        'Strategy': [s["name"] for s in strategies],
+        'Strike Price': [s["strike"] for s in strategies],
+        'Total Cost': [s["total_cost"] for s in strategies],
+        'Protection at Exit': [s["exit_protection"] for s in strategies],
+        'Cost % of Position': [s["total_cost"]/msty_position_value*100 for s in strategies],
+        'Protection % at Exit': [s["exit_protection"]/max_loss_without_hedge*100 for s in strategies]
+    })
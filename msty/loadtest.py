@@ -0,0 +1,367 @@
+"""Load test of concurrent Streamlit sessions against replayed market data.
+
+    python -m msty.loadtest record
+    python -m msty.loadtest run --sessions 20 --concurrency 5 --tabs market_monitoring hedging
+
+``record`` fetches Yahoo data once through ``msty.market`` and stores it under
+``<MSTY_DATA_DIR>/replay/``: quote info per symbol as JSON, five years of
+daily bars for MSTR and MSTY, and a full MSTR option chain snapshot in the
+``msty.snapshots`` format.
+
+``run`` drives simulated sessions through the app with Streamlit's testing
+interface (``AppTest``), several at a time on threads of one process, the
+way a server runs them. Every session gets its own workspace, opens each
+tab and reruns it. Yahoo is replaced by the recorded data at the
+``msty.market`` ticker level, so the shared scheduler, caches and call
+counters all run as in production; ``--latency`` adds a delay to every
+replayed call to stand in for Yahoo's response time. Live quotes come from
+the simulated feed. Workspaces and anything the app stores while running go
+to a temporary data directory. One unmeasured session runs first to pay
+for imports, so the measured sessions start on a warm server.
+
+The report gives rerun latency percentiles per tab (end to end, as seen by
+the session), resident memory added per open session and the upstream calls
+counted in ``msty.perf``. A run fails (exit status 1) if any rerun raised,
+the app logged a warning or error while the sessions ran (such as a failed
+store), or a tab's p95 latency exceeds ``--max-p95-ms``. Errors a view shows
+about the inputs, such as a margin call warning, are part of normal use and
+don't fail the run.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pandas as pd
+
+from msty import config, market, perf, snapshots
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SYMBOLS = ("MSTR", "MSTY")
+CHAIN_SYMBOLS = ("MSTR",)
+HISTORY_PERIOD = "5y"
+LATENCY = 0.25
+PERCENTILES = (50, 95, 99)
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Calendar offsets of the yfinance periods the views ask for
+_PERIODS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+}
+
+# Snapshot column -> yfinance option_chain column
+_CHAIN_COLUMNS = {column: name for name, column in snapshots._COLUMNS.items()}
+
+
+def replay_root(root=None):
+    return root or os.path.join(config.DATA_DIR, "replay")
+
+
+def _info_path(root, symbol):
+    return os.path.join(root, "info", f"{symbol}.json")
+
+
+def _history_path(root, symbol):
+    return os.path.join(root, "history", f"{symbol}.parquet")
+
+
+def record(root=None, symbols=None):
+    """Fetch and store the data ``run`` replays; returns the number of files written"""
+    root = replay_root(root)
+    symbols = list(dict.fromkeys([*HISTORY_SYMBOLS, *CHAIN_SYMBOLS, *(symbols or config.FUND_SYMBOLS)]))
+    for directory in ("info", "history"):
+        os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+    written = 0
+    infos = market.infos(symbols)
+    for symbol, info in infos.items():
+        with open(_info_path(root, symbol), "w") as f:
+            json.dump(info, f, default=str)
+        written += 1
+    for symbol in HISTORY_SYMBOLS:
+        market.history(symbol, HISTORY_PERIOD).to_parquet(_history_path(root, symbol))
+        written += 1
+    for symbol in CHAIN_SYMBOLS:
+        chains = market.chain_scan(symbol)
+        snapshots.write_snapshot(snapshots.build_snapshot(symbol, chains, infos[symbol]["regularMarketPrice"]),
+                                 os.path.join(root, "chains"))
+        written += 1
+    return written
+
+
+class ReplayTicker:
+    """Stands in for ``yfinance.Ticker``, serving recorded data after ``latency`` seconds"""
+
+    def __init__(self, symbol, root, latency=0.0):
+        self.symbol = symbol
+        self.root = root
+        self.latency = latency
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def info(self):
+        self._wait()
+        path = _info_path(self.root, self.symbol)
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded quote info for {self.symbol}")
+        with open(path) as f:
+            return json.load(f)
+
+    def _snapshot(self):
+        path = snapshots.latest_snapshot(self.symbol, os.path.join(self.root, "chains"))
+        if path is None:
+            raise LookupError(f"No recorded option chain for {self.symbol}")
+        return path
+
+    @property
+    def options(self):
+        self._wait()
+        table = snapshots.read_snapshot(self._snapshot(), columns=["expiration"])
+        return tuple(sorted({str(d) for d in table.column("expiration").to_pylist()}))
+
+    def option_chain(self, date):
+        self._wait()
+        df = snapshots.to_frame(snapshots.read_snapshot(self._snapshot(), expirations=[date]))
+        df = df.rename(columns=_CHAIN_COLUMNS)
+        df["contractSymbol"] = df["contractSymbol"].astype(str)
+        sides = {kind: df[df["type"] == kind].drop(columns=["expiration", "type"]).reset_index(drop=True)
+                 for kind in ("C", "P")}
+        return SimpleNamespace(calls=sides["C"], puts=sides["P"], underlying={})
+
+    def history(self, period="1mo", interval="1d"):
+        self._wait()
+        path = _history_path(self.root, self.symbol)
+        if interval != "1d" or not os.path.exists(path):
+            raise LookupError(f"No recorded {interval} history for {self.symbol}")
+        bars = pd.read_parquet(path)
+        end = bars.index[-1]
+        start = pd.Timestamp(end.year, 1, 1, tz=end.tz) if period == "ytd" else end - _PERIODS[period]
+        return bars[bars.index > start]
+
+
+def install_replay(root=None, latency=0.0):
+    """Serve every ``msty.market`` call from recorded data"""
+    root = replay_root(root)
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"No replay data in {root}; run `python -m msty.loadtest record` first")
+    market._ticker = lambda symbol: ReplayTicker(symbol, root, latency)
+
+
+def _rss_bytes():
+    """Resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        # Peak rather than current outside Linux; kilobytes there except on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def _overlapping_runs():
+    """Let ``AppTest`` runs on different threads overlap.
+
+    Each run installs a mock Streamlit runtime and config patch and removes
+    them when it finishes, which would pull them from under runs still going
+    on other threads. Keep the last runtime available and the config patched
+    until all sessions are done.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1.util import patch_config_options
+
+    instance = Runtime.__dict__["instance"]
+    last = []
+
+    def shared_instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        if not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    Runtime.instance = classmethod(shared_instance)
+    try:
+        with patch_config_options({"global.appTest": True}):
+            yield
+    finally:
+        Runtime.instance = instance
+
+
+class _ProblemLog(logging.Handler):
+    """Collects the warnings and errors the app logs"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(f"{record.name}: {record.getMessage()}")
+
+
+@contextmanager
+def _logged_problems():
+    handler = _ProblemLog()
+    app_logger = logging.getLogger("msty")
+    app_logger.addHandler(handler)
+    try:
+        yield handler.messages
+    finally:
+        app_logger.removeHandler(handler)
+
+
+def run_session(number, tabs, reruns, timeout):
+    """Open every tab in one new session; returns the open ``AppTest`` and its rerun timings"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    app.query_params["workspace"] = f"load-{number}"
+    timings = []
+
+    def rerun(tab, kind):
+        start = time.perf_counter()
+        app.run()
+        timings.append({"session": number, "tab": tab, "kind": kind, "ms": (time.perf_counter() - start) * 1000,
+                        "errors": len(app.exception)})
+
+    # The first run loads the page on the default tab
+    rerun(None, "page load")
+    for tab in tabs:
+        app.sidebar.selectbox[0].select(tab)
+        rerun(tab, "open")
+        for _ in range(reruns):
+            rerun(tab, "rerun")
+    return app, timings
+
+
+def run_load(sessions, concurrency, tabs, reruns=1, timeout=120):
+    """Rerun timings, per-session memory and upstream call counts of one load test.
+
+    One session goes through the tabs first and is not measured, so imports
+    and other one-time costs don't count against the sessions. Sessions are
+    kept open until all of them finish, so the memory figure is what each
+    open session adds to the server. Warnings and errors logged by the app
+    while the sessions run are returned in ``summary["problems"]``.
+    """
+    from msty.views import TABS
+
+    with _overlapping_runs():
+        run_session("warmup", tabs, 0, timeout)
+    perf.reset()
+    rss_before = _rss_bytes()
+    open_sessions = []
+    timings = []
+    lock = threading.Lock()
+
+    def session(number):
+        app, session_timings = run_session(number, tabs, reruns, timeout)
+        with lock:
+            open_sessions.append(app)
+            timings.extend(session_timings)
+
+    start = time.perf_counter()
+    with _logged_problems() as problems, _overlapping_runs(), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(session, number) for number in range(sessions)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    rss_after = _rss_bytes()
+
+    timings = pd.DataFrame(timings)
+    timings["tab"] = timings["tab"].map(lambda tab: TABS.get(tab) or "(page load)")
+    latency = timings.groupby(["tab", "kind"], sort=False).agg(
+        reruns=("ms", "size"),
+        errors=("errors", lambda e: int((e > 0).sum())),
+        **{f"p{pct}_ms": ("ms", lambda ms, pct=pct: ms.quantile(pct / 100)) for pct in PERCENTILES},
+        max_ms=("ms", "max"),
+    )
+    upstream = pd.DataFrame.from_dict(perf.counters(), orient="index", columns=["calls", "bytes"]).sort_index()
+    upstream["calls_per_session"] = upstream["calls"] / sessions
+    summary = {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "reruns": len(timings),
+        "failed_reruns": int((timings["errors"] > 0).sum()),
+        "memory_per_session_mb": (rss_after - rss_before) / sessions / 2 ** 20,
+        "problems": list(problems),
+    }
+    open_sessions.clear()
+    return summary, latency, upstream
+
+
+def main(argv=None):
+    from msty.views import TABS
+
+    views = {name: label for label, name in TABS.items() if name}
+    parser = argparse.ArgumentParser(prog="python -m msty.loadtest", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--replay", default=None, help="replay data directory (default: <MSTY_DATA_DIR>/replay)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("record", help="fetch and store the market data to replay")
+    run = commands.add_parser("run", help="drive concurrent sessions through the app")
+    run.add_argument("--sessions", type=int, default=10)
+    run.add_argument("--concurrency", type=int, default=4, help="sessions running at once (default: 4)")
+    run.add_argument("--tabs", nargs="+", choices=sorted(views), default=sorted(views), metavar="TAB",
+                     help=f"views to open, in order (default: all of {', '.join(sorted(views))})")
+    run.add_argument("--reruns", type=int, default=1, help="extra reruns of each tab after opening it (default: 1)")
+    run.add_argument("--latency", type=float, default=LATENCY,
+                     help=f"seconds added to every replayed Yahoo call (default: {LATENCY})")
+    run.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun (default: 120)")
+    run.add_argument("--max-p95-ms", type=float, default=None,
+                     help="fail if any tab's p95 rerun latency is above this many milliseconds")
+    run.add_argument("--out", default=None, help="also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    root = replay_root(args.replay)
+    if args.command == "record":
+        logger.info("Recorded %d files in %s", record(root), root)
+        return 0
+
+    if not os.path.isdir(root):
+        parser.error(f"no replay data in {root}; run `python -m msty.loadtest record` first")
+    install_replay(root, args.latency)
+    config.QUOTE_PROVIDER = "simulated"
+    with tempfile.TemporaryDirectory(prefix="msty-loadtest-") as data_dir:
+        config.DATA_DIR = data_dir
+        summary, latency, upstream = run_load(args.sessions, args.concurrency, [views[t] for t in args.tabs],
+                                              args.reruns, args.timeout)
+
+    logger.info("%d sessions (%d at a time) in %.1f s, %d reruns, %d with errors, %.1f MB per session",
+                summary["sessions"], summary["concurrency"], summary["seconds"], summary["reruns"],
+                summary["failed_reruns"], summary["memory_per_session_mb"])
+    logger.info("\nRerun latency\n%s", latency.round(1).to_string())
+    logger.info("\nUpstream calls\n%s", upstream.round(2).to_string() if not upstream.empty else "none")
+    slow = latency.index[latency["p95_ms"] > args.max_p95_ms].tolist() if args.max_p95_ms is not None else []
+    if summary["problems"]:
+        counts = pd.Series(summary["problems"]).value_counts()
+        logger.info("\nLogged problems\n%s", "\n".join(f"{n:>5}  {message}" for message, n in counts.items()))
+    for tab, kind in slow:
+        logger.info("%s %s p95 is over %.0f ms", tab, kind, args.max_p95_ms)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"summary": summary, "latency": latency.reset_index().to_dict(orient="records"),
+                       "upstream": upstream.to_dict(orient="index")}, f, indent=2)
+    return 1 if summary["failed_reruns"] or summary["problems"] or slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Loan-to-value of a debt-funded MSTY position.
+
+LTV is the loan balance over the market value of the MSTY collateral, and a
+margin call triggers above ``max_ltv``. Stress scenarios cover every month
+left on the loan schedule against a grid of price shocks. The price only
+enters as a divisor, so the grid is split in two:
+
+- ``stress_base``: balance / (shares x (1 + shock)), memoized on the loan
+  schedule and holdings, i.e. LTV for a price of $1,
+- ``stress_grid``: that base divided by the current price.
+
+A new price quote therefore costs one array division, not a rebuild of the
+scenarios.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from msty.debt import loan_balances
+from msty.memo import memoize
+
+MAX_LTV = 0.70
+WARNING_LTV = 0.50
+SHOCKS = np.round(np.arange(-0.80, 0.21, 0.05), 2)
+STRESS_MONTHS = 24
+
+
+def months_elapsed(start, today=None):
+    """Whole monthly payments made since a loan started"""
+    today = today or date.today()
+    return max((today.year - start.year) * 12 + today.month - start.month, 0)
+
+
+def remaining_balances(loan, today=None, months=STRESS_MONTHS):
+    """Loan balance now and after each of the next ``months`` payments"""
+    balances = loan_balances(loan["debt_amount"], loan["monthly_principal"], loan["loan_term"])
+    elapsed = min(months_elapsed(loan["start"], today), len(balances) - 1)
+    return balances[elapsed:elapsed + months + 1]
+
+
+def collateral_shares(blocks):
+    """Shares held across the Cost Basis Tool lots"""
+    return float(sum(block["Shares"] for block in blocks))
+
+
+def ltv(balance, shares, price):
+    value = shares * price
+    return balance / value if value > 0 else np.inf
+
+
+def margin_call_price(balance, shares, max_ltv=MAX_LTV):
+    """MSTY price at which the loan balance reaches ``max_ltv`` of the collateral"""
+    return balance / (max_ltv * shares) if shares > 0 else np.inf
+
+
+@memoize(maxsize=16)
+def stress_base(balances, shares, shocks=SHOCKS):
+    """LTV at a $1 price for every month ahead x price shock"""
+    balances = np.asarray(balances, dtype=float)[:, None]
+    with np.errstate(divide="ignore"):
+        return balances / (shares * (1 + np.asarray(shocks, dtype=float))[None, :])
+
+
+def stress_grid(base, price, shocks=SHOCKS):
+    """LTV for every month ahead x price shock at the current price"""
+    return pd.DataFrame(base / price, columns=[f"{s:+.0%}" for s in shocks])
@@ -0,0 +1,175 @@
+"""Upstream market data access.
+
+All Yahoo Finance calls go through these helpers so every fetch is timed and
+counted in ``msty.perf``. Byte counts are the in-memory size of the returned
+payload, which tracks the response size closely enough to spot heavy calls.
+
+Quote info, full chain scans and daily price history are cached for a short
+while, so reruns and sessions share them instead of each spending a request. Calls that do go
+upstream are dispatched through one process-wide ``Scheduler``, so concurrent
+sessions share a request budget (``MSTY_YAHOO_RATE`` requests per second with
+bursts of ``MSTY_YAHOO_BURST``) and identical in-flight requests share a call.
+"""
+import json
+import os
+import threading
+import time
+
+from msty import perf
+from msty.memo import Memo, memoize
+from msty.scheduler import Scheduler, NORMAL, BULK
+
+# yfinance caches quote info and expirations on the Ticker object, so reuse
+# one per symbol for a short while instead of refetching them for every call
+TICKER_TTL = 60
+
+# Seconds to back off after Yahoo starts throttling
+THROTTLE_BACKOFF = 30
+REQUEST_TIMEOUT = 120
+# Full chain scans are shared by every view and session for this long
+CHAIN_SCAN_TTL = 60
+# Quote info is shared for this long, so reruns and sessions don't each spend a request on it
+INFO_TTL = 30
+# Daily bars only gain a row once a day, so longer histories are shared for this long
+DAILY_HISTORY_TTL = 15 * 60
+
+_tickers = {}
+_tickers_lock = threading.Lock()
+_info_memo = Memo(maxsize=64, ttl=INFO_TTL)
+_daily_history_memo = Memo(maxsize=16, ttl=DAILY_HISTORY_TTL)
+
+scheduler = Scheduler(rate=float(os.getenv("MSTY_YAHOO_RATE", "2")),
+                      burst=int(os.getenv("MSTY_YAHOO_BURST", "5")))
+
+
+def _ticker(symbol):
+    # Imported on first fetch so views that never touch market data don't pay for it
+    import yfinance as yf
+    now = time.monotonic()
+    with _tickers_lock:
+        created, ticker = _tickers.get(symbol, (None, None))
+        if ticker is None or now - created > TICKER_TTL:
+            ticker = yf.Ticker(symbol)
+            _tickers[symbol] = (now, ticker)
+        return ticker
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _throttled(call):
+    """Drain the shared bucket when Yahoo reports rate limiting"""
+    def run():
+        try:
+            return call()
+        except Exception as e:
+            if type(e).__name__ == "YFRateLimitError" or "Too Many Requests" in str(e):
+                scheduler.bucket.penalize(THROTTLE_BACKOFF)
+            raise
+    return run
+
+
+def _submit(kind, symbol, call, priority, key=()):
+    return scheduler.submit((kind, symbol) + key, _throttled(call), priority)
+
+
+def _collect(kind, symbol, future, created, size, **attrs):
+    """Wait for a scheduled call inside a fetch span and count it"""
+    with perf.span(f"fetch:{kind}:{symbol}", "fetch", coalesced=not created, **attrs):
+        try:
+            result = future.result(timeout=REQUEST_TIMEOUT)
+        except Exception:
+            if created:
+                perf.count(f"yahoo.{kind}.errors")
+            raise
+    if created:
+        perf.count(f"yahoo.{kind}", nbytes=size(result))
+    else:
+        perf.count(f"yahoo.{kind}.coalesced")
+    return result
+
+
+def _fetch(kind, symbol, call, size, priority, key=(), **attrs):
+    future, created = _submit(kind, symbol, call, priority, key)
+    return _collect(kind, symbol, future, created, size, **attrs)
+
+
+def _chain_bytes(chain):
+    return _frame_bytes(chain.calls) + _frame_bytes(chain.puts)
+
+
+def _info_size(data):
+    return len(json.dumps(data, default=str))
+
+
+def info(symbol, priority=NORMAL):
+    """Quote and profile fields for a symbol, shared for ``INFO_TTL`` seconds"""
+    return _info_memo.get_or_compute(
+        symbol, lambda: _fetch("info", symbol, lambda: _ticker(symbol).info, _info_size, priority))
+
+
+def infos(symbols, priority=NORMAL):
+    """``{symbol: info}`` for many symbols, fetched concurrently.
+
+    Symbols whose fetch fails are left out instead of failing the batch.
+    """
+    results = {}
+    pending = []
+    for symbol in symbols:
+        cached = _info_memo.get(symbol)
+        if cached is not None:
+            results[symbol] = cached
+        else:
+            pending.append((symbol, *_submit("info", symbol, lambda symbol=symbol: _ticker(symbol).info, priority)))
+    for symbol, future, created in pending:
+        try:
+            results[symbol] = _collect("info", symbol, future, created, _info_size)
+        except Exception:
+            continue
+        _info_memo.put(symbol, results[symbol])
+    return {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+
+def options(symbol, priority=NORMAL):
+    """Available option expiration dates"""
+    return _fetch("options", symbol, lambda: _ticker(symbol).options,
+                  lambda dates: sum(len(d) for d in dates), priority)
+
+
+def option_chain(symbol, date, priority=NORMAL):
+    """Calls and puts for one expiration date"""
+    return _fetch("option_chain", symbol, lambda: _ticker(symbol).option_chain(date),
+                  _chain_bytes, priority, key=(date,), expiration=date)
+
+
+def option_chains(symbol, dates, priority=BULK):
+    """Chains for many expirations, queued together and returned in order"""
+    pending = [(date, *_submit("option_chain", symbol,
+                               lambda date=date: _ticker(symbol).option_chain(date),
+                               priority, key=(date,)))
+               for date in dates]
+    return [_collect("option_chain", symbol, future, created, _chain_bytes, expiration=date)
+            for date, future, created in pending]
+
+
+@memoize(maxsize=8, ttl=CHAIN_SCAN_TTL)
+def chain_scan(symbol, priority=BULK):
+    """``{expiration: chain}`` for every listed expiration"""
+    dates = options(symbol, priority)
+    return dict(zip(dates, option_chains(symbol, dates, priority)))
+
+
+def history(symbol, period, interval="1d", priority=NORMAL):
+    """OHLCV price history"""
+    return _fetch("history", symbol, lambda: _ticker(symbol).history(period=period, interval=interval),
+                  _frame_bytes, priority, key=(period, interval), period=period)
+
+
+def daily_history(symbol, period, priority=NORMAL):
+    """Daily OHLCV history, shared for ``DAILY_HISTORY_TTL`` seconds.
+
+    The frame is shared between callers, so treat it as read-only.
+    """
+    return _daily_history_memo.get_or_compute(
+        (symbol, period), lambda: history(symbol, period, "1d", priority))
@@ -0,0 +1,135 @@
+"""Process-wide memoization for pure compute functions.
+
+Widget changes rerun the whole script, so compute functions wrapped with
+``memoize`` are keyed on a stable hash of their inputs and only recomputed
+when those inputs actually change. Results are shared across sessions and
+must be treated as read-only by callers.
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from msty import perf
+
+
+def _update(h, value):
+    """Feed a canonical byte encoding of value into the hash"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}[{len(value)}](".encode())
+        for item in value:
+            _update(h, item)
+        h.update(b")")
+    elif isinstance(value, dict):
+        h.update(f"dict[{len(value)}](".encode())
+        for key in sorted(value, key=repr):
+            _update(h, key)
+            _update(h, value[key])
+        h.update(b")")
+    elif isinstance(value, pd.DataFrame):
+        h.update(b"DataFrame(")
+        _update(h, [str(c) for c in value.columns])
+        _update(h, [str(t) for t in value.dtypes])
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        h.update(b")")
+    elif isinstance(value, pd.Series):
+        h.update(f"Series({value.name!r},{value.dtype})".encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray({value.dtype},{value.shape})".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        _update(h, value.item())
+    elif hasattr(value, "isoformat"):
+        h.update(f"{type(value).__name__}:{value.isoformat()};".encode())
+    else:
+        raise TypeError(f"Cannot hash memo argument of type {type(value).__name__}")
+
+
+def stable_hash(*args, **kwargs):
+    """Hash of the arguments that is stable across reruns and processes"""
+    h = hashlib.sha1()
+    _update(h, args)
+    _update(h, kwargs)
+    return h.hexdigest()
+
+
+class Memo:
+    """Bounded least-recently-used cache keyed by ``stable_hash``.
+
+    With ``ttl`` set, entries older than that many seconds are recomputed,
+    which suits wrappers around upstream data rather than pure functions.
+    """
+
+    def __init__(self, maxsize=64, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """The fresh cached value for ``key``, or ``default``"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] <= self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            # Compute outside the lock so slow calls don't block other sessions
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def memoize(maxsize=64, ttl=None):
+    """Decorator caching a pure function's result by a hash of its inputs"""
+
+    def decorator(func):
+        memo = Memo(maxsize, ttl)
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with perf.span(func.__qualname__, "compute"):
+                key = stable_hash(prefix, *args, **kwargs)
+                return memo.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.memo = memo
+        return wrapper
+
+    return decorator
@@ -0,0 +1,217 @@
+"""Search for the best debt-financed MSTY plan.
+
+A plan is a loan amount, a principal schedule (months to pay the loan off,
+0 for interest-only with the balance repaid at the end), the share of
+positive monthly cash flow reinvested and the share of the position hedged
+with one-month at-the-money puts rolled monthly. Every month a plan receives
+distributions, pays interest, principal and put premium, collects put
+payoffs, reinvests or withdraws surplus cash and sells shares to cover
+shortfalls. A margin call (loan balance above ``max_ltv`` of the position)
+liquidates the position.
+
+The kernel steps through the months once for a whole batch of plans against
+one set of price paths (common random numbers), as ``plans x paths`` arrays.
+Constraints are on breach probabilities that can only grow over a path
+(margin call, drawdown beyond a limit), so plans that have already breached
+on too many paths are dropped mid-run. ``optimize`` runs successive stages on
+more paths, keeping only feasible plans near the top of the previous stage.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from msty import pricing
+from msty.memo import memoize
+
+MONTHS_PER_YEAR = 12
+TRADING_DAYS_PER_MONTH = 21
+STAGES = (64, 256, 1024)
+KEEP = 0.25
+MIN_KEEP = 20
+# Largest plans x paths block simulated at once
+MAX_CELLS = 2_000_000
+PRUNE_EVERY = 6
+
+
+def plan_grid(loans, payoff_months, reinvest_pct, hedge_pct):
+    """Every combination of loan amount, payoff schedule, reinvest and hedge percentage"""
+    return pd.MultiIndex.from_product([loans, payoff_months, reinvest_pct, hedge_pct],
+                                      names=["loan", "payoff_months", "reinvest_pct", "hedge_pct"]
+                                      ).to_frame(index=False)
+
+
+def simulated_returns(months, n_paths, annual_drift, annual_vol, seed=None):
+    """Monthly simple price returns of lognormal paths, ``n_paths x months``"""
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / MONTHS_PER_YEAR
+    log_returns = rng.standard_normal((n_paths, months)) * annual_vol * np.sqrt(dt) + \
+        (annual_drift - 0.5 * annual_vol ** 2) * dt
+    return np.expm1(log_returns)
+
+
+def bootstrap_returns(closes, months, n_paths, seed=None):
+    """Monthly returns drawn from random 21-day windows of a daily close history"""
+    closes = np.asarray(closes, dtype=float)
+    if len(closes) <= TRADING_DAYS_PER_MONTH:
+        raise ValueError(f"Need more than {TRADING_DAYS_PER_MONTH} days of history, got {len(closes)}")
+    monthly = closes[TRADING_DAYS_PER_MONTH:] / closes[:-TRADING_DAYS_PER_MONTH] - 1
+    rng = np.random.default_rng(seed)
+    return monthly[rng.integers(0, len(monthly), size=(n_paths, months))]
+
+
+def _simulate_batch(plans, returns, own_equity, rate, dividend_yield, put_cost, max_ltv,
+                    max_call_prob, max_drawdown, drawdown_prob, slack):
+    """Metrics of one batch of plans; plans breaching a limit are dropped as soon as they do"""
+    n_paths, months = returns.shape
+    loan = plans["loan"].to_numpy(dtype=float)[:, None]
+    payoff = plans["payoff_months"].to_numpy(dtype=float)[:, None]
+    payment = np.where(payoff > 0, loan / np.maximum(payoff, 1), 0.0)
+    reinvest = plans["reinvest_pct"].to_numpy(dtype=float)[:, None] / 100
+    hedge = plans["hedge_pct"].to_numpy(dtype=float)[:, None] / 100
+    # Distributions less put premium per dollar of position
+    carry = dividend_yield - hedge * put_cost
+
+    shape = (len(plans), n_paths)
+    # Prices start at 1, so shares are counted in dollars at the start
+    shares = np.broadcast_to(own_equity + loan, shape).copy()
+    balance = np.broadcast_to(loan, shape).copy()
+    cash = np.zeros(shape)
+    peak = np.full(shape, float(own_equity))
+    called = np.zeros(shape, dtype=bool)
+    deep = np.zeros(shape, dtype=bool)
+    rows = np.arange(len(plans))
+    prices = np.cumprod(1 + returns, axis=1)
+
+    out = {name: np.full(len(plans), np.nan) for name in
+           ("mean_equity", "p5_equity", "call_prob", "drawdown_prob", "pruned_month")}
+    call_limit = None if max_call_prob is None else max_call_prob + slack
+    drawdown_limit = None if max_drawdown is None else drawdown_prob + slack
+
+    def finish(keep, month=None):
+        nonlocal shares, balance, cash, peak, called, deep, rows, payment, reinvest, hedge, carry
+        done = rows[~keep]
+        if month is None:
+            equity = shares[~keep] * prices[:, -1] + cash[~keep] - balance[~keep]
+            out["mean_equity"][done] = equity.mean(axis=1)
+            out["p5_equity"][done] = np.percentile(equity, 5, axis=1)
+        else:
+            out["pruned_month"][done] = month + 1
+        out["call_prob"][done] = called[~keep].mean(axis=1)
+        out["drawdown_prob"][done] = deep[~keep].mean(axis=1)
+        shares, balance, cash, peak, called, deep, rows = (a[keep] for a in
+                                                           (shares, balance, cash, peak, called, deep, rows))
+        payment, reinvest, hedge, carry = payment[keep], reinvest[keep], hedge[keep], carry[keep]
+
+    monthly_rate = rate / MONTHS_PER_YEAR
+    price_prev = np.ones(n_paths)
+    for month in range(months):
+        price = prices[:, month]
+        # Distributions less premium, plus the put payoff, per share
+        per_share = carry * price_prev + hedge * np.maximum(price_prev - price, 0.0)
+        flow = shares * per_share
+        flow -= balance * monthly_rate
+        principal = np.minimum(payment, balance)
+        balance -= principal
+        flow -= principal
+
+        shortfall = np.minimum(flow, 0.0)
+        flow -= shortfall
+        cash += flow * (1 - reinvest)
+        flow *= reinvest
+        flow += shortfall
+        flow /= price
+        shares += flow
+        if (shares < 0).any():
+            # A shortfall larger than the position is borrowed
+            balance += np.maximum(-shares, 0.0) * price
+            np.maximum(shares, 0.0, out=shares)
+
+        value = shares * price
+        # Called positions hold nothing and owe nothing, so they cannot be called again
+        call = balance > max_ltv * value
+        if call.any():
+            cash += np.where(call, value - balance, 0.0)
+            shares[call] = 0.0
+            balance[call] = 0.0
+            called |= call
+            value = shares * price
+
+        equity = value
+        equity += cash
+        equity -= balance
+        np.maximum(peak, equity, out=peak)
+        if max_drawdown is not None:
+            deep |= equity < peak * (1 - max_drawdown)
+        price_prev = price
+
+        last = month == months - 1
+        if last or (month + 1) % PRUNE_EVERY == 0:
+            breached = np.zeros(len(rows), dtype=bool)
+            if call_limit is not None:
+                breached |= called.mean(axis=1) > call_limit
+            if drawdown_limit is not None:
+                breached |= deep.mean(axis=1) > drawdown_limit
+            if breached.any() and not last:
+                finish(~breached, month)
+                if not len(rows):
+                    break
+    if len(rows):
+        finish(np.zeros(len(rows), dtype=bool))
+
+    metrics = plans.reset_index(drop=True).assign(**out)
+    metrics["feasible"] = metrics["pruned_month"].isna()
+    if call_limit is not None:
+        metrics["feasible"] &= metrics["call_prob"] <= call_limit
+    if drawdown_limit is not None:
+        metrics["feasible"] &= metrics["drawdown_prob"] <= drawdown_limit
+    return metrics.set_index(plans.index)
+
+
+def simulate_plans(plans, returns, own_equity, rate, dividend_yield, vol, max_ltv=0.7, max_call_prob=None,
+                   max_drawdown=None, drawdown_prob=0.05, slack=0.0):
+    """Terminal equity and breach probabilities of every plan on every path.
+
+    ``returns`` is ``paths x months`` monthly price returns; ``rate`` is the
+    annual loan rate and ``dividend_yield`` the monthly distribution as a
+    fraction of the price. Plans whose margin call probability or probability
+    of a drawdown beyond ``max_drawdown`` exceeds its limit plus ``slack`` are
+    infeasible and stop being simulated when that happens.
+    """
+    put_cost = float(pricing.put_price(1.0, 1.0, 1.0 / MONTHS_PER_YEAR, vol))
+    batch = max(1, MAX_CELLS // returns.shape[0])
+    return pd.concat([
+        _simulate_batch(plans.iloc[start:start + batch], returns, own_equity, rate, dividend_yield, put_cost,
+                        max_ltv, max_call_prob, max_drawdown, drawdown_prob, slack)
+        for start in range(0, len(plans), batch)
+    ])
+
+
+@memoize(maxsize=8)
+def optimize(plans, returns, own_equity, rate, dividend_yield, vol, max_ltv=0.7, max_call_prob=0.05,
+             max_drawdown=None, drawdown_prob=0.05, stages=STAGES, keep=KEEP):
+    """Feasible plans ranked by expected terminal equity, and per-stage search statistics.
+
+    Each stage simulates the surviving plans on the first ``stages[i]`` paths.
+    Before the last stage, constraints get a two-standard-error allowance so
+    plans are not dropped on sampling noise, and only the best ``keep``
+    share of feasible plans (at least ``MIN_KEEP``) moves on.
+    """
+    stages = [min(n, len(returns)) for n in stages[:-1]] + [len(returns)]
+    limit = max(p for p in (max_call_prob, None if max_drawdown is None else drawdown_prob, 0.0) if p is not None)
+    candidates = plans
+    stats = []
+    for i, n_paths in enumerate(stages):
+        last = i == len(stages) - 1
+        slack = 0.0 if last else 2 * math.sqrt(max(limit * (1 - limit), 0.01) / n_paths)
+        metrics = simulate_plans(candidates, returns[:n_paths], own_equity, rate, dividend_yield, vol, max_ltv,
+                                 max_call_prob, max_drawdown, drawdown_prob, slack)
+        feasible = metrics[metrics["feasible"]].sort_values("mean_equity", ascending=False)
+        stats.append({"stage": i + 1, "paths": n_paths, "plans": len(candidates),
+                      "pruned_early": int(metrics["pruned_month"].notna().sum()), "feasible": len(feasible)})
+        if last:
+            break
+        candidates = plans.loc[feasible.index[:max(MIN_KEEP, math.ceil(len(feasible) * keep))]]
+        if candidates.empty:
+            break
+    return feasible.drop(columns=["pruned_month", "feasible"]), pd.DataFrame(stats)
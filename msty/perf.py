@@ -0,0 +1,216 @@
+"""Startup, rerun and hot-path timing for the Streamlit app.
+
+The module is imported once per server process, so its import time is used as
+the process start. Cold start is the time until the first rerun finishes;
+after that every rerun and every lazily imported view is recorded.
+
+Inside a rerun, ``span`` times individual fetch, compute and render steps and
+``count`` tallies upstream calls and payload bytes. Each rerun's spans form a
+trace that is kept in memory, logged as one JSON line (and appended to
+``MSTY_TRACE_FILE`` when set) and can be exported from the diagnostics panel.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROCESS_START = time.perf_counter()
+
+# Keep enough reruns for meaningful percentiles without growing unbounded
+MAX_RERUNS = 500
+MAX_TRACES = 100
+
+_cold_start = None
+_imports = {}
+_reruns = deque(maxlen=MAX_RERUNS)
+_traces = deque(maxlen=MAX_TRACES)
+_lock = threading.Lock()
+_counters = defaultdict(lambda: {"calls": 0, "bytes": 0})
+_span_totals = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+
+# Streamlit runs each session's script in its own thread
+_local = threading.local()
+
+
+def enabled():
+    """Whether diagnostics should be shown in the sidebar by default"""
+    return os.getenv("MSTY_PERF", "").lower() in ("1", "true", "yes")
+
+
+def record_import(module_name, seconds):
+    """Record the first-use import time of a lazily loaded module"""
+    _imports[module_name] = seconds
+    logger.info("imported %s in %.1f ms", module_name, seconds * 1000)
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def span(name, kind="compute", **attrs):
+    """Time one step of the current rerun; kind is fetch, compute or render"""
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            totals = _span_totals[name]
+            totals["count"] += 1
+            totals["seconds"] += end - start
+        trace = current_trace()
+        if trace is not None:
+            record = {
+                "name": name,
+                "kind": kind,
+                "start_ms": round((start - trace["_start"]) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3),
+            }
+            if attrs:
+                record["attrs"] = attrs
+            if error:
+                record["error"] = error
+            trace["spans"].append(record)
+
+
+def timed(name, kind="compute"):
+    """Decorator form of ``span``"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name, calls=1, nbytes=0):
+    """Tally upstream calls and payload bytes, per rerun and per process"""
+    with _lock:
+        counter = _counters[name]
+        counter["calls"] += calls
+        counter["bytes"] += nbytes
+    trace = current_trace()
+    if trace is not None:
+        counter = trace["counters"].setdefault(name, {"calls": 0, "bytes": 0})
+        counter["calls"] += calls
+        counter["bytes"] += nbytes
+
+
+class RerunTimer:
+    """Context manager timing one script rerun for the selected tab"""
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.start = None
+        self.seconds = None
+        self.trace = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.trace = {"tab": self.tab, "at": time.time(), "spans": [], "counters": {}, "_start": self.start}
+        _local.trace = self.trace
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _cold_start
+        end = time.perf_counter()
+        _local.trace = None
+        self.seconds = end - self.start
+        if _cold_start is None:
+            _cold_start = end - PROCESS_START
+            logger.info("cold start %.1f ms", _cold_start * 1000)
+        _reruns.append({"tab": self.tab, "seconds": self.seconds, "at": time.time()})
+
+        trace = self.trace
+        del trace["_start"]
+        trace["duration_ms"] = round(self.seconds * 1000, 3)
+        _traces.append(trace)
+        line = json.dumps(trace, default=str)
+        logger.debug("rerun %s", line)
+        trace_file = os.getenv("MSTY_TRACE_FILE")
+        if trace_file:
+            with _lock, open(trace_file, "a") as f:
+                f.write(line + "\n")
+        return False
+
+
+def cold_start_seconds():
+    return _cold_start
+
+
+def import_times():
+    return dict(_imports)
+
+
+def rerun_times(tab=None):
+    """Recorded rerun durations in seconds, optionally for one tab"""
+    return [r["seconds"] for r in _reruns if tab is None or r["tab"] == tab]
+
+
+def traces():
+    """Recent per-rerun traces, oldest first"""
+    return list(_traces)
+
+
+def export_traces():
+    """Recent traces as JSON lines"""
+    return "\n".join(json.dumps(trace, default=str) for trace in traces()) + "\n"
+
+
+def counters():
+    with _lock:
+        return {name: dict(c) for name, c in _counters.items()}
+
+
+def span_totals():
+    with _lock:
+        return {name: dict(t) for name, t in _span_totals.items()}
+
+
+def reset():
+    """Clear recorded reruns, traces and counters"""
+    with _lock:
+        _reruns.clear()
+        _traces.clear()
+        _counters.clear()
+        _span_totals.clear()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summary():
+    """Cold start, import and rerun latency summary, in milliseconds"""
+    reruns = rerun_times()
+
+    def ms(value):
+        return None if value is None else value * 1000
+
+    return {
+        "cold_start_ms": ms(_cold_start),
+        "imports_ms": {name: s * 1000 for name, s in _imports.items()},
+        "reruns": len(reruns),
+        "last_rerun_ms": ms(reruns[-1]) if reruns else None,
+        "p50_rerun_ms": ms(percentile(reruns, 50)),
+        "p95_rerun_ms": ms(percentile(reruns, 95)),
+    }
@@ -0,0 +1,203 @@
+"""Streaming quotes shared by every session.
+
+A ``QuoteProvider`` is an async source of ticks ``(epoch seconds, price,
+size)``. ``PollingFeed`` polls Yahoo's one-minute bars through the shared
+scheduler; ``SimulatedFeed`` generates a random walk locally for testing and
+offline use. ``MSTY_QUOTES`` (``config.QUOTE_PROVIDER``) picks the provider,
+``yahoo`` or ``simulated``.
+
+One ``QuoteStream`` per symbol runs its provider on an asyncio loop in a
+background thread and aggregates ticks into OHLCV bars in a fixed-size
+``BarBuffer``. Every change to the buffer gets a sequence number, so readers
+ask for the bars changed since the last sequence they saw and only append
+or update those, instead of refetching the history. A stream stops by itself
+once nobody has read it for ``IDLE_SECONDS``.
+"""
+import abc
+import asyncio
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from msty import config, market
+from msty.scheduler import NORMAL
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 15.0
+BAR_SECONDS = 60
+BAR_CAPACITY = 390
+IDLE_SECONDS = 120
+FIELDS = ("time", "open", "high", "low", "close", "volume")
+
+
+class QuoteProvider(abc.ABC):
+    """Async source of ``(epoch seconds, price, size)`` ticks for a symbol"""
+
+    @abc.abstractmethod
+    def ticks(self, symbol):
+        """Async iterator of ticks, run until the consumer closes it"""
+
+
+class PollingFeed(QuoteProvider):
+    """Latest one-minute bar from Yahoo every ``interval`` seconds"""
+
+    def __init__(self, interval=POLL_SECONDS, priority=NORMAL):
+        self.interval = interval
+        self.priority = priority
+
+    async def ticks(self, symbol):
+        day_volume = None
+        while True:
+            try:
+                bars = await asyncio.to_thread(market.history, symbol, "1d", "1m", self.priority)
+            except Exception as e:
+                logger.warning("Quote poll for %s failed: %s", symbol, e)
+            else:
+                if not bars.empty:
+                    volume = float(bars["Volume"].sum())
+                    size = 0.0 if day_volume is None else max(volume - day_volume, 0.0)
+                    day_volume = volume
+                    yield time.time(), float(bars["Close"].iloc[-1]), size
+            await asyncio.sleep(self.interval)
+
+
+class SimulatedFeed(QuoteProvider):
+    """Geometric random walk ticks every ``interval`` seconds"""
+
+    def __init__(self, start_price=100.0, vol=0.8, interval=0.5, seed=None):
+        self.start_price = start_price
+        self.vol = vol
+        self.interval = interval
+        self.seed = seed
+
+    async def ticks(self, symbol):
+        rng = np.random.default_rng(self.seed)
+        price = self.start_price
+        # Volatility per tick, treating the feed as trading around the clock
+        step = self.vol * np.sqrt(self.interval / (365 * 24 * 3600))
+        while True:
+            price *= float(np.exp(rng.standard_normal() * step))
+            yield time.time(), price, float(rng.integers(1, 500))
+            await asyncio.sleep(self.interval)
+
+
+class BarBuffer:
+    """Ring buffer of the last ``capacity`` OHLCV bars built from ticks"""
+
+    def __init__(self, capacity=BAR_CAPACITY, bar_seconds=BAR_SECONDS):
+        self.capacity = capacity
+        self.bar_seconds = bar_seconds
+        self._bars = np.full((capacity, len(FIELDS)), np.nan)
+        # Sequence number of the last change to each slot
+        self._changed = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def add_tick(self, timestamp, price, size=0.0):
+        start = timestamp - timestamp % self.bar_seconds
+        with self._lock:
+            last = (self.count - 1) % self.capacity
+            if self.count and start < self._bars[last, 0]:
+                return
+            self.seq += 1
+            if self.count and start == self._bars[last, 0]:
+                bar = self._bars[last]
+                bar[2] = max(bar[2], price)
+                bar[3] = min(bar[3], price)
+                bar[4] = price
+                bar[5] += size
+            else:
+                last = self.count % self.capacity
+                self._bars[last] = (start, price, price, price, price, size)
+                self.count += 1
+            self._changed[last] = self.seq
+
+    def since(self, seq=0):
+        """``(bars, seq)``: bars changed after sequence ``seq``, oldest first, and the current sequence.
+
+        Bars are indexed by their running bar number, so a reader can replace
+        the ones it already has and append the rest.
+        """
+        with self._lock:
+            first = max(self.count - self.capacity, 0)
+            numbers = np.arange(first, self.count)
+            slots = numbers % self.capacity
+            fresh = self._changed[slots] > seq
+            bars = pd.DataFrame(self._bars[slots[fresh]], columns=FIELDS, index=numbers[fresh])
+            current = self.seq
+        bars["time"] = pd.to_datetime(bars["time"], unit="s")
+        return bars, current
+
+    def last(self):
+        """The most recent bar as a dict, or None"""
+        with self._lock:
+            if not self.count:
+                return None
+            return dict(zip(FIELDS, self._bars[(self.count - 1) % self.capacity].tolist()))
+
+
+class QuoteStream:
+    """A provider running in a background thread, feeding one ``BarBuffer``"""
+
+    def __init__(self, symbol, provider, buffer=None):
+        self.symbol = symbol
+        self.provider = provider
+        self.buffer = buffer or BarBuffer()
+        self.last_read = time.monotonic()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self.last_read = time.monotonic()
+            self._thread = threading.Thread(target=asyncio.run, args=(self._consume(),), daemon=True,
+                                            name=f"quotes-{self.symbol}")
+            self._thread.start()
+
+    async def _consume(self):
+        ticks = self.provider.ticks(self.symbol)
+        try:
+            async for timestamp, price, size in ticks:
+                self.buffer.add_tick(timestamp, price, size)
+                if time.monotonic() - self.last_read > IDLE_SECONDS:
+                    break
+        except Exception:
+            logger.exception("Quote stream for %s stopped", self.symbol)
+        finally:
+            await ticks.aclose()
+
+    def since(self, seq=0):
+        self.last_read = time.monotonic()
+        return self.buffer.since(seq)
+
+    def last(self):
+        self.last_read = time.monotonic()
+        return self.buffer.last()
+
+
+_streams = {}
+_lock = threading.Lock()
+
+
+def default_provider(start_price=None):
+    if config.QUOTE_PROVIDER == "simulated":
+        return SimulatedFeed(start_price or 100.0)
+    return PollingFeed()
+
+
+def stream(symbol, provider=None, start_price=None):
+    """The process-wide running ``QuoteStream`` for a symbol, started on first use"""
+    with _lock:
+        quote_stream = _streams.get(symbol)
+        if quote_stream is None:
+            quote_stream = _streams[symbol] = QuoteStream(symbol, provider or default_provider(start_price))
+        quote_stream.start()
+    return quote_stream
@@ -0,0 +1,113 @@
+"""Value at Risk and expected shortfall for an MSTY position and its put hedges.
+
+Two scenario sets of joint MSTR/MSTY returns over the horizon:
+
+- historical simulation: every overlapping horizon-length window of the
+  aligned daily closes,
+- Monte Carlo: MSTR returns bootstrapped from its daily history, with MSTY
+  following through the estimated beta plus a normal residual.
+
+Aligned closes, the beta fit, scenarios and per-share put P&L are memoized,
+and a hedge's P&L is linear in the number of shares hedged, so moving a slider
+only rescales the cached arrays and re-sorts them.
+"""
+import numpy as np
+import pandas as pd
+
+from msty import pricing
+from msty.memo import memoize
+
+HORIZONS = {"1 Day": 1, "1 Month": 21}
+CONFIDENCE = 0.95
+TRADING_DAYS = 252
+MC_SCENARIOS = 20000
+MIN_DAYS = 30
+
+
+@memoize(maxsize=8)
+def aligned_closes(mstr_closes, msty_closes):
+    """MSTR and MSTY closes on the days both traded"""
+    def by_day(series):
+        index = pd.to_datetime(series.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return series.set_axis(index.normalize())
+
+    return pd.concat({"mstr": by_day(mstr_closes), "msty": by_day(msty_closes)}, axis=1, join="inner").dropna()
+
+
+@memoize(maxsize=8)
+def estimate_beta(closes):
+    """Beta of MSTY daily log returns on MSTR's, with the daily residual vol"""
+    log_returns = np.log(closes).diff().dropna()
+    if len(log_returns) < MIN_DAYS:
+        raise ValueError(f"Need at least {MIN_DAYS} days of aligned MSTR/MSTY history, got {len(log_returns)}")
+    x, y = log_returns["mstr"].to_numpy(), log_returns["msty"].to_numpy()
+    beta = np.cov(x, y)[0, 1] / np.var(x, ddof=1)
+    residual = y - beta * x
+    return {
+        "beta": float(beta),
+        "correlation": float(np.corrcoef(x, y)[0, 1]),
+        "mstr_vol": float(x.std(ddof=1) * np.sqrt(TRADING_DAYS)),
+        "residual_vol": float(residual.std(ddof=1)),
+        "residual_mean": float(residual.mean()),
+    }
+
+
+@memoize(maxsize=16)
+def historical_scenarios(closes, horizon):
+    """Simple MSTR and MSTY returns over every overlapping ``horizon``-day window"""
+    prices = closes[["mstr", "msty"]].to_numpy(dtype=float)
+    if len(prices) <= horizon:
+        raise ValueError(f"Need more than {horizon} days of aligned history, got {len(prices)}")
+    returns = prices[horizon:] / prices[:-horizon] - 1
+    return returns[:, 0], returns[:, 1]
+
+
+@memoize(maxsize=16)
+def monte_carlo_scenarios(closes, horizon, n=MC_SCENARIOS, seed=7):
+    """MSTR returns bootstrapped from daily history, MSTY through the beta plus residual noise"""
+    fit = estimate_beta(closes)
+    daily = np.log(closes["mstr"]).diff().dropna().to_numpy()
+    rng = np.random.default_rng(seed)
+    mstr_log = daily[rng.integers(0, len(daily), size=(n, horizon))].sum(axis=1)
+    noise = rng.standard_normal(n) * fit["residual_vol"] * np.sqrt(horizon)
+    msty_log = fit["beta"] * mstr_log + fit["residual_mean"] * horizon + noise
+    return np.expm1(mstr_log), np.expm1(msty_log)
+
+
+@memoize(maxsize=32)
+def put_pnl(mstr_returns, spot, strikes, tenor_days, vol, horizon):
+    """Per-share P&L of buying each put now and marking it after ``horizon`` trading days.
+
+    Returns a ``len(strikes) x scenarios`` array.
+    """
+    strikes = np.asarray(strikes, dtype=float)[:, None]
+    premium = pricing.put_price(spot, strikes, tenor_days / pricing.DAYS_PER_YEAR, vol)
+    remaining = max(tenor_days - horizon * pricing.DAYS_PER_YEAR / TRADING_DAYS, 0.0)
+    later = pricing.put_price(spot * (1 + mstr_returns)[None, :], strikes, remaining / pricing.DAYS_PER_YEAR, vol)
+    return later - premium
+
+
+def var_cvar(pnl, confidence=CONFIDENCE):
+    """VaR and CVaR (as positive losses) along the last axis"""
+    pnl = np.sort(pnl, axis=-1)
+    k = max(1, int(np.floor(pnl.shape[-1] * (1 - confidence))))
+    return -pnl[..., k - 1], -pnl[..., :k].mean(axis=-1)
+
+
+def position_risk(position_value, msty_returns, hedge_shares, hedge_pnl, names, confidence=CONFIDENCE):
+    """VaR/CVaR of the position unhedged and with each hedge.
+
+    ``hedge_pnl`` is the per-share output of ``put_pnl`` for the hedges in
+    ``names``; every hedge covers ``hedge_shares`` MSTR shares.
+    """
+    unhedged = position_value * msty_returns
+    pnl = np.vstack([unhedged[None, :], unhedged[None, :] + hedge_shares * hedge_pnl])
+    var, cvar = var_cvar(pnl, confidence)
+    return pd.DataFrame({
+        "hedge": ["Unhedged"] + list(names),
+        "var": var,
+        "cvar": cvar,
+        "expected_cost": np.r_[0.0, -hedge_shares * hedge_pnl.mean(axis=1)],
+    })
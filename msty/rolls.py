@@ -0,0 +1,116 @@
+"""Rolling put program simulator.
+
+A roll rule buys puts struck at ``moneyness`` times spot with ``tenor`` days
+to expiry, sells them ``roll_before`` days before expiry and buys the next
+ones, until the horizon ends and the open put is sold. Puts are priced with
+``msty.pricing.put_price`` at a flat volatility.
+
+Roll dates depend only on the rule, not on the path, so every position held
+by every rule is a leg ``(rule, open day, close day)``. All legs are priced
+against all paths in one array call, and per-rule totals are reduced with
+``np.add.reduceat``; the cost of a run is one pricing pass over
+``legs x paths`` regardless of how many rules are compared.
+"""
+import numpy as np
+import pandas as pd
+
+from msty import pricing
+from msty.memo import memoize
+
+TRADING_DAYS = 252
+
+
+def simulated_paths(spot, days, vol, n_paths=1000, drift=0.0, seed=None):
+    """Geometric Brownian motion paths, ``n_paths x (days + 1)`` trading days"""
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / TRADING_DAYS
+    shocks = rng.standard_normal((n_paths, days)) * vol * np.sqrt(dt) + (drift - 0.5 * vol ** 2) * dt
+    log_paths = np.concatenate([np.zeros((n_paths, 1)), np.cumsum(shocks, axis=1)], axis=1)
+    return spot * np.exp(log_paths)
+
+
+def historical_paths(closes, days, spot=None, step=1):
+    """Every ``days``-long window of a price history, rescaled to start at ``spot``"""
+    closes = np.asarray(closes, dtype=float)
+    if len(closes) <= days:
+        raise ValueError(f"Need more than {days} days of history, got {len(closes)}")
+    windows = np.lib.stride_tricks.sliding_window_view(closes, days + 1)[::step]
+    start = closes[-1] if spot is None else spot
+    return windows / windows[:, :1] * start
+
+
+def roll_rules(moneyness, tenors, roll_before):
+    """Every combination of strike rule, tenor and roll timing that can be held"""
+    grid = pd.MultiIndex.from_product([moneyness, tenors, roll_before],
+                                      names=["moneyness", "tenor", "roll_before"]).to_frame(index=False)
+    return grid[grid["tenor"] > grid["roll_before"]].reset_index(drop=True)
+
+
+def _legs(rules, days):
+    """Rule index, open day and close day (trading days) of every put each rule holds"""
+    rule_idx, opens, closes = [], [], []
+    for i, (tenor, roll_before) in enumerate(zip(rules["tenor"], rules["roll_before"])):
+        hold = max(1, round((tenor - roll_before) * TRADING_DAYS / pricing.DAYS_PER_YEAR))
+        starts = np.arange(0, days, hold)
+        rule_idx.append(np.full(len(starts), i))
+        opens.append(starts)
+        closes.append(np.minimum(starts + hold, days))
+    return np.concatenate(rule_idx), np.concatenate(opens), np.concatenate(closes)
+
+
+@memoize(maxsize=16)
+def simulate_rolls(paths, rules, vol, rate=pricing.RISK_FREE_RATE):
+    """Per-share cash flows of each roll rule on each path.
+
+    ``paths`` is ``n_paths x (days + 1)`` in trading days; ``rules`` has
+    ``moneyness``, ``tenor`` and ``roll_before`` columns (tenors in calendar
+    days). Returns ``n_rules x n_paths`` arrays: ``premium`` paid, ``proceeds``
+    from selling the puts at each roll and at the horizon, ``payoff`` (the
+    intrinsic part of the proceeds, i.e. protection delivered), ``net_cost``
+    (premium minus proceeds) and the number of ``rolls``.
+    """
+    days = paths.shape[1] - 1
+    rule_idx, opens, closes = _legs(rules, days)
+    moneyness = rules["moneyness"].to_numpy(dtype=float)[rule_idx][:, None]
+    tenor = rules["tenor"].to_numpy(dtype=float)[rule_idx][:, None]
+    calendar = pricing.DAYS_PER_YEAR / TRADING_DAYS
+
+    spot_open = paths[:, opens].T
+    spot_close = paths[:, closes].T
+    strike = moneyness * spot_open
+    remaining = np.maximum(tenor - (closes - opens)[:, None] * calendar, 0.0)
+
+    premium = pricing.put_price(spot_open, strike, tenor / pricing.DAYS_PER_YEAR, vol, rate)
+    proceeds = pricing.put_price(spot_close, strike, remaining / pricing.DAYS_PER_YEAR, vol, rate)
+    payoff = np.maximum(strike - spot_close, 0.0)
+
+    # Legs are grouped by rule, so each rule's legs are one contiguous block
+    starts = np.flatnonzero(np.r_[True, rule_idx[1:] != rule_idx[:-1]])
+    totals = {name: np.add.reduceat(values, starts, axis=0)
+              for name, values in (("premium", premium), ("proceeds", proceeds), ("payoff", payoff))}
+    totals["net_cost"] = totals["premium"] - totals["proceeds"]
+    totals["rolls"] = np.bincount(rule_idx) - 1
+    return totals
+
+
+def summarize(paths, rules, results, shares=1.0, tail=0.05):
+    """Cost versus protection per rule, averaged over paths and scaled to ``shares``.
+
+    ``worst_unhedged`` and ``worst_hedged`` are the average P&L over the
+    ``tail`` share of paths with the largest unhedged loss; ``hedged_tail`` is
+    the ``tail`` quantile of hedged P&L.
+    """
+    unhedged = (paths[:, -1] - paths[:, 0]) * shares
+    hedged = unhedged - results["net_cost"] * shares
+    worst = np.argsort(unhedged)[:max(1, int(len(unhedged) * tail))]
+    start_value = paths[0, 0] * shares
+    table = rules.copy()
+    table["rolls"] = results["rolls"]
+    table["premium_paid"] = results["premium"].mean(axis=1) * shares
+    table["net_cost"] = results["net_cost"].mean(axis=1) * shares
+    table["cost_pct"] = table["net_cost"] / start_value * 100
+    table["protection"] = results["payoff"].mean(axis=1) * shares
+    table["worst_unhedged"] = unhedged[worst].mean()
+    table["worst_hedged"] = hedged[:, worst].mean(axis=1)
+    table["hedged_tail"] = np.percentile(hedged, tail * 100, axis=1)
+    return table
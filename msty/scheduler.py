@@ -0,0 +1,175 @@
+"""Shared, rate-limited scheduler for upstream requests.
+
+Every session in the server process submits its Yahoo Finance calls here, so
+the process as a whole stays under a configurable request rate:
+
+- a token bucket limits the sustained rate while allowing short bursts,
+- identical requests already queued or running are coalesced onto one call,
+- queued requests are dispatched highest priority first, and only when a
+  worker is free to run them, so an interactive single-expiration fetch is
+  not stuck behind a bulk chain scan.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``capacity``"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def release(self):
+        """Return an unused token"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def penalize(self, seconds):
+        """Stop handing out tokens for roughly ``seconds`` after upstream throttling"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class _Request:
+    def __init__(self, key, fn, priority):
+        self.key = key
+        self.fn = fn
+        self.priority = priority
+        self.future = Future()
+        self.started = False
+
+
+class Scheduler:
+    """Rate-limited, coalescing, prioritized executor for upstream calls"""
+
+    def __init__(self, rate=2.0, burst=5, workers=4):
+        self.bucket = TokenBucket(rate, burst)
+        self.workers = workers
+        self._queue = []
+        self._seq = itertools.count()
+        self._inflight = {}
+        self._cond = threading.Condition()
+        self._pool = None
+        self._dispatcher = None
+        # Free workers; a request leaves the heap only once it can start running
+        self._slots = threading.Semaphore(workers)
+        self.submitted = 0
+        self.coalesced = 0
+
+    def submit(self, key, fn, priority=NORMAL):
+        """Queue ``fn`` under ``key``.
+
+        Returns ``(future, created)``; ``created`` is False when the call was
+        coalesced onto an identical request that is already queued or running.
+        """
+        with self._cond:
+            request = self._inflight.get(key)
+            if request is not None:
+                self.coalesced += 1
+                if priority < request.priority and not request.started:
+                    # Re-queue at the higher priority; the stale heap entry is skipped
+                    request.priority = priority
+                    heapq.heappush(self._queue, (priority, next(self._seq), request))
+                    self._cond.notify()
+                return request.future, False
+
+            request = _Request(key, fn, priority)
+            self._inflight[key] = request
+            heapq.heappush(self._queue, (priority, next(self._seq), request))
+            self.submitted += 1
+            self._start()
+            self._cond.notify()
+            return request.future, True
+
+    def pending(self):
+        with self._cond:
+            return sum(1 for r in self._inflight.values() if not r.started)
+
+    def _start(self):
+        if self._dispatcher is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="msty-upstream")
+            self._dispatcher = threading.Thread(target=self._run, name="msty-scheduler", daemon=True)
+            self._dispatcher.start()
+
+    def _pop(self):
+        while self._queue:
+            priority, _, request = heapq.heappop(self._queue)
+            if not request.started and priority == request.priority:
+                request.started = True
+                return request
+        return None
+
+    def _run(self):
+        while True:
+            self._slots.acquire()
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+            # Take a worker and a token first, then pick whatever is most urgent by now
+            self.bucket.acquire()
+            with self._cond:
+                request = self._pop()
+            if request is None:
+                self.bucket.release()
+                self._slots.release()
+                continue
+            self._pool.submit(self._execute, request)
+
+    def _execute(self, request):
+        try:
+            result = request.fn()
+        except BaseException as e:
+            with self._cond:
+                self._inflight.pop(request.key, None)
+            request.future.set_exception(e)
+        else:
+            with self._cond:
+                self._inflight.pop(request.key, None)
+            request.future.set_result(result)
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        return {
+            "rate": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "pending": self.pending(),
+        }
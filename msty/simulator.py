@@ -0,0 +1,156 @@
+"""Compounding simulator calculations, independent of the Streamlit UI."""
+import numpy as np
+import pandas as pd
+
+from msty import taxes
+from msty.memo import memoize
+
+VIEW_MODES = ["Monthly", "Yearly", "Total"]
+
+
+@memoize(maxsize=32)
+def simulate_compounding(initial_shares, avg_dividend, reinvest_price, months, acct_type,
+                         fed_tax, state_tax, reinvest_dividends, reinvest_percent,
+                         withdrawal, start_year, start_month, cost_basis=None, state="Other",
+                         roc_percent=0.0, ltcg_tax=15.0, payment_method=taxes.QUARTERLY,
+                         prior_year_tax=0.0, high_income=False, lots=None, state_prior_year_tax=0.0):
+    """Project monthly share growth from dividends.
+
+    ``lots`` optionally replaces the initial position with existing purchase
+    lots (``Shares``, ``Price`` and optionally ``Months Held`` columns); every
+    reinvestment opens a new lot. In taxable accounts ``roc_percent`` of each
+    distribution is return of capital, which reduces lot basis instead of being
+    taxed, and taxes are paid per ``payment_method`` (see ``msty.taxes``) with
+    ``prior_year_tax`` and ``state_prior_year_tax`` as last year's federal and
+    state tax.
+
+    Returns the monthly DataFrame and a dict of totals.
+    """
+    if lots is None:
+        lots = pd.DataFrame({"Shares": [initial_shares],
+                             "Price": [reinvest_price if cost_basis is None else cost_basis]})
+    held = lots["Shares"].to_numpy(dtype=float)
+    n_held = len(held)
+    lot_shares = np.concatenate([held, np.zeros(months)])
+
+    # Reinvestment in month i opens lot n_held + i - 1, bought at the end of month i
+    roc = np.full(months, avg_dividend * roc_percent / 100)
+    lot_age = np.concatenate([lots["Months Held"].to_numpy(dtype=float) if "Months Held" in lots
+                              else np.zeros(n_held), np.zeros(months)])
+    basis, short_term, long_term = taxes.lot_schedule(
+        roc,
+        np.concatenate([np.zeros(n_held, dtype=int), np.arange(1, months + 1)]),
+        np.concatenate([lots["Price"].to_numpy(dtype=float), np.full(months, reinvest_price)]),
+        lot_age,
+    )
+
+    taxable = acct_type == "Taxable"
+    federal, state_account, state_rate = taxes.accounts(payment_method, state, state_tax, prior_year_tax,
+                                                        high_income, state_prior_year_tax)
+
+    shares = float(held.sum())
+    monthly_data = []
+    total_dividends = 0
+    total_reinvested = 0
+    total_tax_paid = 0
+    total_penalties = 0
+    total_roc = 0
+    total_gains = 0
+
+    for i in range(1, months + 1):
+        current_month = (start_month + i - 1) % 12 or 12
+        current_year = start_year + (start_month + i - 2) // 12
+        date_label = f"{current_year}-{current_month:02d}"
+
+        gross_div = shares * avg_dividend
+        roc_amount = shares * float(roc[i - 1])
+        gains = 0.0
+        tax = penalty = 0.0
+        if taxable:
+            ordinary = gross_div - roc_amount
+            short_gain = float(short_term[:, i - 1] @ lot_shares)
+            long_gain = float(long_term[:, i - 1] @ lot_shares)
+            gains = short_gain + long_gain
+            federal.accrue(current_year, current_month,
+                           (ordinary + short_gain) * fed_tax / 100 + long_gain * ltcg_tax / 100)
+            state_account.accrue(current_year, current_month, (ordinary + gains) * state_rate / 100)
+            for account in (federal, state_account):
+                paid, fee = account.step(current_year, current_month)
+                tax += paid
+                penalty += fee
+
+        net_div = gross_div - tax - penalty
+        if reinvest_dividends:
+            reinvest_amount = max(0, net_div) * (reinvest_percent / 100)
+        else:
+            reinvest_amount = max(0, net_div - withdrawal)
+
+        new_shares = reinvest_amount / reinvest_price
+        lot_shares[n_held + i - 1] = new_shares
+        shares += new_shares
+        total_tax_paid += tax
+        total_penalties += penalty
+
+        monthly_data.append({
+            "Date": date_label,
+            "Shares": round(shares, 4),
+            "Net Dividends": round(net_div, 2),
+            "Reinvested": round(reinvest_amount, 2),
+            "New Shares": round(new_shares, 4),
+            "Return of Capital": round(roc_amount, 2),
+            "Capital Gains": round(gains, 2),
+            "Cost Basis": round(float(basis[:, i] @ lot_shares), 2),
+            "Taxes Paid": round(tax, 2),
+            "Cumulative Taxes": round(total_tax_paid, 2),
+            "Penalties Paid": round(penalty, 2)
+        })
+
+        total_dividends += net_div
+        total_reinvested += reinvest_amount
+        total_roc += roc_amount
+        total_gains += gains
+
+    totals = {
+        "shares": shares,
+        "dividends": total_dividends,
+        "reinvested": total_reinvested,
+        "tax_paid": total_tax_paid,
+        "penalties": total_penalties,
+        "tax_due": federal.unpaid() + state_account.unpaid() if taxable else 0.0,
+        "return_of_capital": total_roc,
+        "capital_gains": total_gains,
+        "cost_basis": float(basis[:, -1] @ lot_shares),
+    }
+    return pd.DataFrame(monthly_data), totals
+
+
+def aggregate(df, view_mode):
+    """Re-aggregate a monthly projection for display without mutating it"""
+    if view_mode == "Yearly":
+        df = df.assign(Year=pd.to_datetime(df['Date']).dt.year)
+        return df.groupby("Year").agg({
+            "Shares": "last",
+            "Net Dividends": "sum",
+            "Reinvested": "sum",
+            "New Shares": "sum",
+            "Return of Capital": "sum",
+            "Capital Gains": "sum",
+            "Cost Basis": "last",
+            "Taxes Paid": "sum",
+            "Cumulative Taxes": "last",
+            "Penalties Paid": "sum"
+        }).reset_index()
+    if view_mode == "Total":
+        return pd.DataFrame([{
+            "Shares": df["Shares"].iloc[-1],
+            "Net Dividends": df["Net Dividends"].sum(),
+            "Reinvested": df["Reinvested"].sum(),
+            "New Shares": df["New Shares"].sum(),
+            "Return of Capital": df["Return of Capital"].sum(),
+            "Capital Gains": df["Capital Gains"].sum(),
+            "Cost Basis": df["Cost Basis"].iloc[-1],
+            "Taxes Paid": df["Taxes Paid"].sum(),
+            "Cumulative Taxes": df["Cumulative Taxes"].iloc[-1],
+            "Penalties Paid": df["Penalties Paid"].sum()
+        }])
+    return df
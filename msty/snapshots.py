@@ -0,0 +1,203 @@
+"""Compact columnar storage for option chain snapshots.
+
+A snapshot is every call and put across all expirations for one symbol at one
+point in time, written as one zstd-compressed Parquet file:
+
+- contract symbols and option type are dictionary-encoded strings,
+- strikes are float32 and expirations are dates, both dictionary-encoded on
+  disk (they repeat heavily across contracts),
+- volume and open interest are uint32, prices and implied vol are float32,
+- the snapshot time, symbol and underlying price are stored once in the file
+  metadata instead of being repeated on every row.
+
+Rows are sorted by expiration, type and strike with one row group per
+expiration, so reads with an expiration filter only decode the groups they
+need. Files are read through a memory map with column projection, so loading a
+few columns of a historical chain never copies the whole file.
+
+Files live under ``<root>/<SYMBOL>/date=YYYY-MM-DD/<HHMMSS>.parquet``.
+"""
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from msty import config, files
+
+FORMAT_VERSION = "1"
+
+SCHEMA = pa.schema([
+    ("expiration", pa.date32()),
+    ("type", pa.dictionary(pa.int8(), pa.string())),
+    ("strike", pa.float32()),
+    ("contract", pa.dictionary(pa.int32(), pa.string())),
+    ("last_trade", pa.timestamp("s", tz="UTC")),
+    ("last_price", pa.float32()),
+    ("bid", pa.float32()),
+    ("ask", pa.float32()),
+    ("change", pa.float32()),
+    ("percent_change", pa.float32()),
+    ("volume", pa.uint32()),
+    ("open_interest", pa.uint32()),
+    ("implied_volatility", pa.float32()),
+    ("in_the_money", pa.bool_()),
+])
+
+# yfinance option_chain column -> snapshot column
+_COLUMNS = {
+    "contractSymbol": "contract",
+    "lastTradeDate": "last_trade",
+    "strike": "strike",
+    "lastPrice": "last_price",
+    "bid": "bid",
+    "ask": "ask",
+    "change": "change",
+    "percentChange": "percent_change",
+    "volume": "volume",
+    "openInterest": "open_interest",
+    "impliedVolatility": "implied_volatility",
+    "inTheMoney": "in_the_money",
+}
+
+# Parquet dictionary pages for the columns that repeat across contracts
+_DICTIONARY_COLUMNS = ["expiration", "type", "strike", "contract"]
+
+_capture_lock = threading.Lock()
+
+
+def snapshot_root(root=None):
+    return root or os.path.join(config.DATA_DIR, "chains")
+
+
+def build_snapshot(symbol, chains, underlying_price, taken_at=None):
+    """Build a compact Arrow table from ``{expiration: option_chain}``"""
+    taken_at = taken_at or datetime.now(timezone.utc)
+    frames = []
+    for expiration, chain in chains.items():
+        for kind, df in (("C", chain.calls), ("P", chain.puts)):
+            if df.empty:
+                continue
+            df = df.reindex(columns=list(_COLUMNS)).rename(columns=_COLUMNS)
+            df["expiration"] = pd.Timestamp(expiration).date()
+            df["type"] = kind
+            frames.append(df)
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=SCHEMA.names)
+
+    df["last_trade"] = pd.to_datetime(df["last_trade"], utc=True).dt.floor("s")
+    for column in ("volume", "open_interest"):
+        # Missing volume/OI means none was reported for the contract
+        values = pd.to_numeric(df[column], errors="coerce").fillna(0)
+        df[column] = values.clip(0, np.iinfo(np.uint32).max).astype(np.uint32)
+    df["in_the_money"] = df["in_the_money"].fillna(False).astype(bool)
+    df = df.sort_values(["expiration", "type", "strike"], kind="stable")
+
+    table = pa.Table.from_pandas(df[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+    metadata = {
+        b"msty.format": FORMAT_VERSION.encode(),
+        b"msty.symbol": symbol.encode(),
+        b"msty.taken_at": taken_at.isoformat().encode(),
+        b"msty.underlying_price": repr(float(underlying_price)).encode(),
+    }
+    return table.replace_schema_metadata(metadata)
+
+
+def write_snapshot(table, root=None):
+    """Write a snapshot table and return its path"""
+    meta = snapshot_metadata(table.schema)
+    taken_at = meta["taken_at"]
+    directory = os.path.join(snapshot_root(root), meta["symbol"], f"date={taken_at:%Y-%m-%d}")
+    path = os.path.join(directory, f"{taken_at:%H%M%S}.parquet")
+
+    # One row group per expiration so expiration filters can skip the rest
+    expirations = table.column("expiration").to_numpy()
+    if len(expirations):
+        _, counts = np.unique(expirations, return_counts=True)
+        row_group_size = int(counts.max())
+    else:
+        row_group_size = None
+
+    files.atomic_write(path, lambda tmp_path: pq.write_table(
+        table, tmp_path, compression="zstd", use_dictionary=_DICTIONARY_COLUMNS, row_group_size=row_group_size))
+    return path
+
+
+def capture_daily(symbol, chains, underlying_price, root=None):
+    """Write today's snapshot unless one exists; returns the new path or None"""
+    taken_at = datetime.now(timezone.utc)
+    # Sessions loading the chain at the same time must not both take the day's snapshot
+    with _capture_lock:
+        if has_snapshot_for(symbol, taken_at, root):
+            return None
+        return write_snapshot(build_snapshot(symbol, chains, underlying_price, taken_at), root)
+
+
+def snapshot_metadata(schema):
+    """Symbol, snapshot time and underlying price stored in a file's metadata"""
+    meta = schema.metadata or {}
+    return {
+        "format": meta.get(b"msty.format", b"").decode(),
+        "symbol": meta[b"msty.symbol"].decode(),
+        "taken_at": datetime.fromisoformat(meta[b"msty.taken_at"].decode()),
+        "underlying_price": float(meta[b"msty.underlying_price"]),
+    }
+
+
+def read_snapshot(path, columns=None, expirations=None):
+    """Memory-map a snapshot, reading only the requested columns and expirations"""
+    filters = None
+    if expirations is not None:
+        filters = [("expiration", "in", [pd.Timestamp(e).date() for e in expirations])]
+    return pq.read_table(path, columns=columns, filters=filters, memory_map=True,
+                         read_dictionary=["type", "contract"])
+
+
+def to_frame(table):
+    """Convert a snapshot table to pandas, keeping the narrow dtypes.
+
+    Contract and type come back as categoricals; expiration becomes a
+    categorical of timestamps since it has only a few dozen distinct values.
+    """
+    df = table.to_pandas()
+    if "expiration" in df:
+        df["expiration"] = pd.to_datetime(df["expiration"]).astype("category")
+    return df
+
+
+def list_snapshots(symbol, root=None):
+    """Snapshot files for a symbol, oldest first"""
+    directory = os.path.join(snapshot_root(root), symbol)
+    if not os.path.isdir(directory):
+        return []
+    paths = []
+    for day in sorted(os.listdir(directory)):
+        day_dir = os.path.join(directory, day)
+        if os.path.isdir(day_dir):
+            paths.extend(os.path.join(day_dir, name) for name in sorted(os.listdir(day_dir))
+                         if name.endswith(".parquet"))
+    return paths
+
+
+def latest_snapshot(symbol, root=None):
+    paths = list_snapshots(symbol, root)
+    return paths[-1] if paths else None
+
+
+def has_snapshot_for(symbol, day, root=None):
+    """Whether a complete snapshot was already written on the given date"""
+    directory = os.path.join(snapshot_root(root), symbol, f"date={day:%Y-%m-%d}")
+    return os.path.isdir(directory) and any(name.endswith(".parquet") and not name.startswith(".")
+                                            for name in os.listdir(directory))
+
+
+def open_dataset(symbol, root=None):
+    """All snapshots for a symbol as one Arrow dataset, partitioned by date"""
+    return ds.dataset(os.path.join(snapshot_root(root), symbol), format="parquet",
+                      partitioning="hive", exclude_invalid_files=True)
@@ -0,0 +1,132 @@
+"""Server-side state: per-user workspaces and shared market data.
+
+Portfolio data (Cost Basis Tool lots, actual performance entries, simulation
+results and the margin loan) belongs to a workspace, persisted as one JSON
+file under ``<MSTY_DATA_DIR>/workspaces/`` and identified by the
+``workspace`` URL query parameter. Every browser tab opened with the same
+link works on the same workspace object, and a Streamlit session only keeps
+the workspace id.
+
+Market data is the same for everyone and is not copied into sessions:
+``market_history`` serves the daily metrics stored by ``msty.alerts`` from a
+process-wide cache that is read once per file change.
+"""
+import json
+import os
+import re
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import pandas as pd
+
+from msty import alerts, config, files
+
+# Keys of a workspace and their empty values
+DEFAULTS = {
+    "blocks": list,
+    "actual_performance": list,
+    "simulation_results": lambda: None,
+    "loan": lambda: None,
+}
+MAX_WORKSPACES = 256
+HISTORY_DAYS = 30
+
+_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_lock = threading.Lock()
+_workspaces = OrderedDict()
+
+
+def workspaces_dir(root=None):
+    return root or os.path.join(config.DATA_DIR, "workspaces")
+
+
+def new_id():
+    return secrets.token_urlsafe(9)
+
+
+def valid_id(workspace_id):
+    return bool(workspace_id) and _ID.match(workspace_id) is not None
+
+
+def _encode(value):
+    if isinstance(value, pd.DataFrame):
+        return {"__frame__": json.loads(value.to_json(orient="split", date_format="iso"))}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+
+def _decode(obj):
+    if "__frame__" in obj:
+        frame = obj["__frame__"]
+        return pd.DataFrame(frame["data"], index=frame["index"], columns=frame["columns"])
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class Workspace:
+    """One user's portfolio data, shared by all of their sessions.
+
+    Values returned by ``get`` are shared; change them through ``append`` and
+    ``set`` so the update is locked and written to disk.
+    """
+
+    def __init__(self, workspace_id, root=None):
+        self.id = workspace_id
+        self.path = os.path.join(workspaces_dir(root), f"{workspace_id}.json")
+        self._lock = threading.Lock()
+        self._data = {key: make() for key, make in DEFAULTS.items()}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self._data.update(json.load(f, object_hook=_decode))
+
+    def get(self, key):
+        return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._save()
+
+    def append(self, key, item):
+        with self._lock:
+            self._data[key] = self._data[key] + [item]
+            self._save()
+
+    def _save(self):
+        def write(tmp_path):
+            with open(tmp_path, "w") as f:
+                json.dump(self._data, f, default=_encode)
+
+        files.atomic_write(self.path, write)
+
+
+def get_workspace(workspace_id, root=None):
+    """The process-wide ``Workspace`` for an id, loaded from disk on first use"""
+    if not valid_id(workspace_id):
+        raise ValueError(f"Invalid workspace id: {workspace_id!r}")
+    key = (workspace_id, root)
+    with _lock:
+        workspace = _workspaces.get(key)
+        if workspace is None:
+            workspace = _workspaces[key] = Workspace(workspace_id, root)
+        _workspaces.move_to_end(key)
+        # Evicted workspaces are reloaded from their file when next used
+        while len(_workspaces) > MAX_WORKSPACES:
+            _workspaces.popitem(last=False)
+    return workspace
+
+
+def market_history(days=HISTORY_DAYS, root=None):
+    """Daily MSTR market metrics of the last ``days`` days, shared by all sessions"""
+    history = alerts.metrics_history(root)
+    return history.tail(days).reset_index(drop=True)
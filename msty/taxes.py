@@ -0,0 +1,178 @@
+"""Tax treatment of MSTY distributions for taxable accounts.
+
+Distributions are split into ordinary income and return of capital (ROC). ROC
+is not taxed when received but reduces the cost basis of every lot; once a
+lot's basis reaches zero, further ROC is a capital gain, short-term or
+long-term depending on how long the lot has been held. ``lot_schedule`` works
+this out for every lot and month at once from cumulative ROC per share, so a
+portfolio of thousands of lots over decades is a few array operations.
+
+``TaxAccount`` tracks one jurisdiction's accrued tax, quarterly estimated
+payments and underpayment penalties. Penalties follow the usual federal
+shape: each installment is compared with the least of 90% of the current
+year's tax, 100% (110% for high incomes) of last year's tax and the annualized
+income installment, and shortfalls accrue interest until the next due date
+or the April filing deadline.
+"""
+import numpy as np
+
+# Top marginal rates on ordinary income (%) and estimated payment installments.
+# These states tax capital gains as ordinary income; UT, TX and FL do not
+# require estimated payments for this income.
+STATE_RULES = {
+    "CA": {"rate": 9.3, "installments": (0.30, 0.40, 0.0, 0.30), "threshold": 500.0},
+    "NY": {"rate": 6.85, "installments": (0.25, 0.25, 0.25, 0.25), "threshold": 300.0},
+    "UT": {"rate": 4.55, "installments": None, "threshold": 0.0},
+    "TX": {"rate": 0.0, "installments": None, "threshold": 0.0},
+    "FL": {"rate": 0.0, "installments": None, "threshold": 0.0},
+    # Rate comes from the user
+    "Other": {"rate": None, "installments": (0.25, 0.25, 0.25, 0.25), "threshold": 500.0},
+}
+FEDERAL_INSTALLMENTS = (0.25, 0.25, 0.25, 0.25)
+FEDERAL_THRESHOLD = 1000.0
+
+QUARTERLY = "Quarterly estimates"
+SAFE_HARBOR = "Safe harbor (prior year)"
+AT_FILING = "Pay at filing (Apr 15)"
+EXTENSION = "Pay at extension (Oct 15)"
+PAYMENT_METHODS = [QUARTERLY, SAFE_HARBOR, AT_FILING, EXTENSION]
+
+# Installments are due in April, June and September, and January of the next
+# year (month 13). Under the annualized income method they cover the tax
+# through March, May, August and November, scaled to a full year.
+DUE_MONTHS = (4, 6, 9, 13)
+ANNUALIZED_THROUGH = np.array([3, 5, 8, 11])
+ANNUALIZATION = np.array([4.0, 2.4, 1.5, 12 / 11])
+# Years each shortfall is outstanding: until the next due date, the last one until April 15
+OUTSTANDING_YEARS = np.diff(DUE_MONTHS + (16,)) / 12
+
+UNDERPAYMENT_RATE = 0.08
+FAILURE_TO_PAY_MONTHLY = 0.005
+EXTENSION_MONTHS = 6
+LONG_TERM_MONTHS = 12
+
+
+def lot_schedule(roc_per_share, lot_start, lot_basis, lot_age=0):
+    """Per-share basis and ROC capital gains of every lot in every month.
+
+    ``roc_per_share`` has one entry per simulated month. Lot ``k`` is bought
+    at the end of month ``lot_start[k]`` (0 for lots held at the start) at
+    ``lot_basis[k]`` per share and had been held ``lot_age[k]`` months then.
+
+    Returns ``(basis, short_term, long_term)``: basis per share is
+    ``lots x (months + 1)`` including the start, gains per share are
+    ``lots x months``.
+    """
+    roc = np.asarray(roc_per_share, dtype=float)
+    start = np.asarray(lot_start, dtype=int)[:, None]
+    basis = np.asarray(lot_basis, dtype=float)[:, None]
+    age = np.broadcast_to(np.asarray(lot_age, dtype=float), start.shape[:1])[:, None]
+
+    cumulative = np.concatenate([[0.0], np.cumsum(roc)])
+    received = np.maximum(cumulative[None, :] - cumulative[start], 0.0)
+    excess = np.maximum(received - basis, 0.0)
+    gains = np.diff(excess, axis=1)
+
+    months = np.arange(1, len(roc) + 1)[None, :]
+    long_term = (months - start + age) > LONG_TERM_MONTHS
+    return np.maximum(basis - received, 0.0), np.where(long_term, 0.0, gains), np.where(long_term, gains, 0.0)
+
+
+def _installment(year, month):
+    """(installment index, tax year) of an estimated payment due this month, if any"""
+    if month == 1:
+        return 3, year - 1
+    if month in DUE_MONTHS[:3]:
+        return DUE_MONTHS.index(month), year
+    return None, None
+
+
+class TaxAccount:
+    """Accrued tax, estimated payments and penalties for one jurisdiction"""
+
+    def __init__(self, method, installments=FEDERAL_INSTALLMENTS, prior_year_tax=0.0, safe_harbor=1.0,
+                 threshold=FEDERAL_THRESHOLD):
+        self.method = method
+        self.cumulative = None if installments is None else np.cumsum(installments)
+        self.prior_year_tax = prior_year_tax
+        self.safe_harbor = safe_harbor
+        self.threshold = threshold
+        self.accrued = {}
+        self.estimates = {}
+        self.settled = set()
+
+    def accrue(self, year, month, amount):
+        self.accrued.setdefault(year, np.zeros(12))[month - 1] += amount
+
+    def total(self, year):
+        return float(self.accrued[year].sum()) if year in self.accrued else 0.0
+
+    def estimated(self, year):
+        return self.estimates.setdefault(year, np.zeros(4))
+
+    def _prior(self, year):
+        return self.total(year - 1) if year - 1 in self.accrued else self.prior_year_tax
+
+    def _annualized(self, year):
+        through = np.cumsum(self.accrued.get(year, np.zeros(12)))[ANNUALIZED_THROUGH - 1]
+        return 0.9 * ANNUALIZATION * through * self.cumulative
+
+    def required(self, year):
+        """Cumulative required installments for a tax year"""
+        regular = 0.9 * self.total(year) * self.cumulative
+        prior = self.safe_harbor * self._prior(year) * self.cumulative
+        return np.minimum(np.minimum(regular, prior), self._annualized(year))
+
+    def penalty(self, year):
+        """Underpayment penalty for a tax year, as of the April filing deadline"""
+        if self.cumulative is None:
+            return 0.0
+        paid = self.estimated(year)
+        if self.total(year) - paid.sum() < self.threshold:
+            return 0.0
+        shortfall = np.maximum(self.required(year) - np.cumsum(paid), 0.0)
+        return UNDERPAYMENT_RATE * float(shortfall @ OUTSTANDING_YEARS)
+
+    def step(self, year, month):
+        """Tax and penalty paid this month; a negative tax payment is a refund"""
+        paid = penalty = 0.0
+        q, tax_year = _installment(year, month)
+        if q is not None and self.cumulative is not None and self.method in (QUARTERLY, SAFE_HARBOR):
+            if self.method == QUARTERLY:
+                target = self._annualized(tax_year)[q]
+            else:
+                target = self.safe_harbor * self._prior(tax_year) * self.cumulative[q]
+            estimates = self.estimated(tax_year)
+            amount = max(float(target - estimates.sum()), 0.0)
+            estimates[q] += amount
+            paid += amount
+
+        settle_month = 10 if self.method == EXTENSION else 4
+        if month == settle_month and year - 1 in self.accrued:
+            balance = self.total(year - 1) - float(self.estimated(year - 1).sum())
+            penalty = self.penalty(year - 1)
+            if self.method == EXTENSION and balance > 0:
+                late = EXTENSION_MONTHS * FAILURE_TO_PAY_MONTHLY + UNDERPAYMENT_RATE * EXTENSION_MONTHS / 12
+                penalty += balance * late
+            paid += balance
+            self.settled.add(year - 1)
+        return paid, penalty
+
+    def unpaid(self):
+        """Tax accrued but not yet settled"""
+        return sum(self.total(year) - float(self.estimated(year).sum()) for year in self.accrued
+                   if year not in self.settled)
+
+
+def accounts(method, state, state_rate, prior_year_tax=0.0, high_income=False, state_prior_year_tax=0.0):
+    """Federal and state ``TaxAccount`` plus the state's income tax rate (%).
+
+    ``prior_year_tax`` and ``state_prior_year_tax`` are last year's federal and
+    state tax on this income; they set each account's first-year safe harbor.
+    """
+    rules = STATE_RULES.get(state, STATE_RULES["Other"])
+    safe_harbor = 1.1 if high_income else 1.0
+    federal = TaxAccount(method, FEDERAL_INSTALLMENTS, prior_year_tax, safe_harbor, FEDERAL_THRESHOLD)
+    state_account = TaxAccount(method, rules["installments"], state_prior_year_tax, safe_harbor, rules["threshold"])
+    rate = state_rate if rules["rate"] is None else rules["rate"]
+    return federal, state_account, rate
@@ -0,0 +1,45 @@
+"""Per-tab page modules, imported only when their tab is first selected.
+
+Each module exposes a ``render()`` function. Heavy dependencies such as plotly
+and yfinance are imported by the view modules themselves, so they are only
+paid for when a tab that needs them is opened.
+"""
+import importlib
+import sys
+import time
+
+import streamlit as st
+
+from msty import perf, store
+
+# Sidebar label -> module name in this package
+TABS = {
+    "📈 Compounding Simulator": "compounding",
+    "📊 Cost Basis Tool": "cost_basis",
+    "💸 Return on Debt": "return_on_debt",
+    "🛡️ Hedging Tool": "hedging",
+    "📊 Simulated vs. Actual": "simulated_vs_actual",
+    "📉 Market Monitoring": "market_monitoring",
+    "🏦 Margin Monitor": "margin",
+    "🔔 Alerts": "alerts",
+    "�� Export Center": None,
+}
+
+
+def load_view(tab):
+    """Import (once per process) and return the page module for a tab"""
+    name = TABS.get(tab)
+    if name is None:
+        return None
+    module_name = f"{__name__}.{name}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        perf.record_import(module_name, time.perf_counter() - start)
+    return module
+
+
+def workspace():
+    """The ``msty.store.Workspace`` of the current session"""
+    return store.get_workspace(st.session_state.workspace_id)
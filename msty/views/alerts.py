@@ -0,0 +1,90 @@
+"""🔔 Alerts tab."""
+import streamlit as st
+from datetime import date
+
+from msty import alerts, config, market, snapshots
+from msty.views import output
+
+LABELS = dict(alerts.METRICS, put_ask="Put ask", put_bid="Put bid", call_ask="Call ask", call_bid="Call bid")
+
+
+def render():
+    st.title("🔔 Alerts")
+    st.write("""
+    Register thresholds on MSTR market metrics. Every rule is checked whenever a new
+    options snapshot is loaded in Market Monitoring, and you get one email when a rule's
+    condition becomes true. Comparing against another metric alerts when the two cross.
+    """)
+    if not (config.EMAIL_FROM and config.SMTP_SERVER):
+        st.warning("Email delivery is not configured (EMAIL_FROM, SMTP_SERVER). Alerts will only be recorded.")
+
+    email = st.text_input("Your Email", key="alerts_email")
+
+    st.subheader("New Alert")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metric = st.selectbox("Metric", list(LABELS), format_func=LABELS.get)
+    with col2:
+        op = st.selectbox("Condition", alerts.OPS)
+    with col3:
+        compare = st.radio("Compare To", ["Value", "Another metric"], horizontal=True)
+
+    threshold = reference = expiration = strike = None
+    if compare == "Value":
+        threshold = st.number_input("Threshold", value=0.0, format="%.4f")
+    else:
+        reference = st.selectbox("Reference Metric", [m for m in alerts.METRICS if m != metric],
+                                 format_func=LABELS.get)
+    if metric in alerts.CONTRACT_METRICS:
+        col1, col2 = st.columns(2)
+        with col1:
+            expiration = st.date_input("Expiration", value=date.today())
+        with col2:
+            strike = st.number_input("Strike ($)", min_value=0.0, value=0.0, step=5.0)
+    note = st.text_input("Note (optional)")
+
+    if st.button("Add Alert"):
+        try:
+            alerts.add_rule(email, metric, op, threshold=threshold, reference=reference,
+                            expiration=expiration, strike=strike, note=note)
+            st.success("Alert added.")
+        except ValueError as e:
+            st.error(str(e))
+
+    if not email:
+        return
+
+    rules = alerts.load_rules()
+    mine = rules[rules["email"] == email.strip()]
+    st.subheader("Your Alerts")
+    if mine.empty:
+        st.info("No alerts registered for this email yet.")
+        return
+
+    rules_df = mine.assign(Rule=[alerts.describe(rule) for _, rule in mine.iterrows()])
+    rules_df = rules_df[["id", "Rule", "note", "active", "last_triggered", "last_value"]].rename(columns={
+        'id': 'ID',
+        'note': 'Note',
+        'active': 'Triggered',
+        'last_triggered': 'Last Triggered',
+        'last_value': 'Value When Triggered'
+    })
+    output.dataframe("rules_df", rules_df, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        rule_id = st.selectbox("Alert", rules_df["ID"],
+                               format_func=lambda i: rules_df.loc[rules_df["ID"] == i, "Rule"].iloc[0])
+        if st.button("Remove Alert"):
+            alerts.remove_rule(rule_id)
+            st.rerun()
+    with col2:
+        if st.button("Check Now"):
+            try:
+                current_price = market.info("MSTR")['regularMarketPrice']
+                chain_df = snapshots.to_frame(snapshots.build_snapshot("MSTR", market.chain_scan("MSTR"),
+                                                                       current_price))
+                _, fired = alerts.check_snapshot(chain_df, current_price, force=True)
+                st.success(f"{len(fired)} alert(s) triggered.")
+            except Exception as e:
+                st.error(f"Error checking alerts: {str(e)}")
@@ -0,0 +1,137 @@
+"""📈 Compounding Simulator tab."""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from msty import taxes
+from msty.simulator import simulate_compounding, aggregate
+from msty.views import output, workspace
+
+
+def render():
+    st.title("📈 Compounding Simulator")
+
+    # Input Parameters
+    initial_shares = st.number_input("Initial Share Count", min_value=0, value=1000)
+    cost_basis = st.number_input("Initial Purchase Cost Basis ($)", min_value=0.01, value=25.00)
+    reinvest_price = st.number_input("Average Reinvestment Cost Per Share ($)", min_value=0.01, value=25.00)
+    avg_dividend = st.number_input("Average Monthly Dividend per Share ($)", min_value=0.0, value=2.0)
+    months = st.slider("Holding Period (Months)", 1, 480, 24)
+    today = datetime.today()
+
+    lots = None
+    blocks = workspace().get("blocks")
+    if blocks:
+        if st.checkbox("Start from my Cost Basis Tool lots"):
+            lots = pd.DataFrame(blocks)
+            lots["Months Held"] = [(today.year - d.year) * 12 + today.month - d.month for d in lots["Date"]]
+            lots = lots[["Shares", "Price", "Months Held"]]
+            st.caption(f"{len(lots)} lots, {lots['Shares'].sum():,.2f} shares")
+
+    acct_type = st.selectbox("Account Type", ["Taxable", "Tax Deferred", "Non Taxable"])
+    if acct_type == "Taxable":
+        state = st.selectbox("Select State", ["Other", "CA", "NY", "TX", "UT", "FL"])
+        fed_tax = st.slider("Federal Tax Rate (%)", 0, 50, 20)
+        ltcg_tax = st.slider("Long-Term Capital Gains Rate (%)", 0, 30, 15)
+        if taxes.STATE_RULES[state]["rate"] is None:
+            state_tax = st.slider("State Tax Rate (%)", 0, 20, 5)
+        else:
+            state_tax = taxes.STATE_RULES[state]["rate"]
+            st.caption(f"{state} taxes distributions and capital gains at {state_tax:.2f}%")
+        roc_percent = st.slider("Return of Capital Portion of Distributions (%)", 0, 100, 0,
+                                help="Return of capital is not taxed when paid; it lowers each lot's cost basis, and once a lot's basis reaches zero the excess is a capital gain.")
+        payment_method = st.selectbox("Tax Payment Method", taxes.PAYMENT_METHODS,
+                                      help="Missing quarterly estimated payments incurs underpayment penalties; an extension only delays filing, not payment.")
+        prior_year_tax = st.number_input("Prior Year Federal Tax on This Income ($)", min_value=0.0, value=0.0)
+        if taxes.STATE_RULES[state]["installments"] is None:
+            state_prior_year_tax = 0.0
+        else:
+            state_prior_year_tax = st.number_input("Prior Year State Tax on This Income ($)", min_value=0.0,
+                                                   value=0.0)
+        high_income = st.checkbox("Prior year AGI over $150,000 (110% safe harbor)")
+    else:
+        fed_tax = 0
+        state_tax = 0
+        ltcg_tax = 0
+        roc_percent = 0
+        payment_method = taxes.QUARTERLY
+        prior_year_tax = 0.0
+        state_prior_year_tax = 0.0
+        high_income = False
+        state = "N/A"
+
+    reinvest_dividends = st.checkbox("Reinvest Dividends?")
+    if reinvest_dividends:
+        withdrawal = 0
+        reinvest_percent = st.slider("Percent of Dividends to Reinvest (%)", 0, 100, 100)
+    else:
+        reinvest_percent = 0
+        withdrawal = st.number_input("Withdraw this Dollar Amount Monthly ($)", min_value=0, value=2000)
+
+    current_price = st.number_input("Current Price per Share ($)", min_value=0.01, value=25.0)
+    view_mode = st.selectbox("How would you like to view the projection?", ["Monthly", "Yearly", "Total"])
+    run = st.button("Run Simulation")
+
+    params = dict(
+        initial_shares=initial_shares, avg_dividend=avg_dividend, reinvest_price=reinvest_price,
+        months=months, acct_type=acct_type, fed_tax=fed_tax, state_tax=state_tax,
+        reinvest_dividends=reinvest_dividends, reinvest_percent=reinvest_percent, withdrawal=withdrawal,
+        start_year=today.year, start_month=today.month, cost_basis=cost_basis, state=state,
+        roc_percent=roc_percent, ltcg_tax=ltcg_tax, payment_method=payment_method,
+        prior_year_tax=prior_year_tax, state_prior_year_tax=state_prior_year_tax, high_income=high_income,
+        lots=lots,
+    )
+    if run:
+        st.session_state.compounding_params = params
+        # Saved to the workspace for the Simulated vs. Actual tab
+        monthly_df, _ = simulate_compounding(**params)
+        workspace().set("simulation_results", monthly_df[["Date", "Shares", "Net Dividends", "Reinvested"]]
+                        .rename(columns={"Net Dividends": "Net_Dividends"}))
+
+    # Keep showing the last run while only the view mode changes; the monthly
+    # projection comes from the memo cache and is just re-aggregated.
+    if _same_params(st.session_state.get("compounding_params"), params):
+        monthly_df, totals = simulate_compounding(**params)
+        df = aggregate(monthly_df, view_mode)
+        shares = totals["shares"]
+        total_dividends = totals["dividends"]
+        total_reinvested = totals["reinvested"]
+        total_tax_paid = totals["tax_paid"]
+        total_penalties = totals["penalties"]
+
+        st.success(f"📈 Final Share Count: {shares:,.2f}")
+        st.success(f"💸 Total Dividends Collected: ${total_dividends:,.2f}")
+        st.success(f"🔁 Total Reinvested: ${total_reinvested:,.2f}")
+        st.success(f"💰 Total Taxes Paid: ${total_tax_paid:,.2f}")
+        st.success(f"⚠️ Total Penalties Paid: ${total_penalties:,.2f}")
+        if acct_type == "Taxable":
+            st.info(f"🧾 Tax Accrued but Not Yet Due: ${totals['tax_due']:,.2f} · "
+                    f"Return of Capital: ${totals['return_of_capital']:,.2f} · "
+                    f"Capital Gains from Return of Capital: ${totals['capital_gains']:,.2f} · "
+                    f"Remaining Cost Basis: ${totals['cost_basis']:,.2f}")
+        output.table("df", df, {
+            "Shares": "{:,.2f}",
+            "Net Dividends": "${:,.2f}",
+            "Reinvested": "${:,.2f}",
+            "New Shares": "{:,.2f}",
+            "Return of Capital": "${:,.2f}",
+            "Capital Gains": "${:,.2f}",
+            "Cost Basis": "${:,.2f}",
+            "Taxes Paid": "${:,.2f}",
+            "Cumulative Taxes": "${:,.2f}",
+            "Penalties Paid": "${:,.2f}"
+        })
+
+
+def _same_params(a, b):
+    """Parameter dicts are equal; the lots DataFrame is compared by value"""
+    if a is None or a.keys() != b.keys():
+        return False
+    for key in a:
+        x, y = a[key], b[key]
+        if isinstance(x, pd.DataFrame) or isinstance(y, pd.DataFrame):
+            if not (isinstance(x, pd.DataFrame) and isinstance(y, pd.DataFrame) and x.equals(y)):
+                return False
+        elif x != y:
+            return False
+    return True
@@ -0,0 +1,30 @@
+"""📊 Cost Basis Tool tab."""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from msty.views import output, workspace
+
+
+def render():
+    st.title("📊 Cost Basis Tracker")
+
+    ws = workspace()
+
+    with st.form("add_block"):
+        d = st.date_input("Date of Purchase", value=datetime.today())
+        shares = st.number_input("Shares Purchased", min_value=0.0, step=1.0)
+        price = st.number_input("Price per Share", min_value=0.0)
+        submitted = st.form_submit_button("Add Entry")
+        if submitted:
+            ws.append("blocks", {"Date": d, "Shares": shares, "Price": price})
+
+    if ws.get("blocks"):
+        df = pd.DataFrame(ws.get("blocks"))
+        df["Total"] = df["Shares"] * df["Price"]
+        total_shares = df["Shares"].sum()
+        total_cost = df["Total"].sum()
+        avg_cost = total_cost / total_shares if total_shares else 0
+        output.dataframe("df", df)
+        st.markdown(f"**Total Shares:** {total_shares:,.2f}")
+        st.markdown(f"**Average Cost Basis:** ${avg_cost:,.2f}")
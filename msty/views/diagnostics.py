@@ -0,0 +1,45 @@
+"""Sidebar performance diagnostics panel."""
+import sys
+
+import streamlit as st
+import pandas as pd
+
+from msty import perf
+
+
+def render_sidebar(timer):
+    """Show timings for the rerun that just finished and process-wide counters"""
+    stats = perf.summary()
+    with st.sidebar.expander("⏱️ Performance Diagnostics", expanded=True):
+        st.caption(
+            f"Cold start: {stats['cold_start_ms']:,.0f} ms · "
+            f"Last rerun: {timer.seconds * 1000:,.0f} ms · "
+            f"p95: {stats['p95_rerun_ms']:,.0f} ms"
+        )
+
+        spans = timer.trace["spans"]
+        if spans:
+            st.markdown("**This rerun**")
+            spans_df = pd.DataFrame(spans)[["name", "kind", "duration_ms"]]
+            st.dataframe(spans_df.sort_values("duration_ms", ascending=False), hide_index=True)
+            by_kind = spans_df.groupby("kind")["duration_ms"].sum()
+            st.caption(" · ".join(f"{kind}: {ms:,.0f} ms" for kind, ms in by_kind.items()))
+
+        counters = perf.counters()
+        if counters:
+            st.markdown("**Upstream calls (process)**")
+            counters_df = pd.DataFrame.from_dict(counters, orient="index")
+            counters_df["kb"] = counters_df.pop("bytes") / 1024
+            st.dataframe(counters_df.round(1))
+
+        # Only report on the scheduler if a view has already loaded market data
+        market = sys.modules.get("msty.market")
+        if market is not None:
+            sched = market.scheduler.stats()
+            st.caption(
+                f"Scheduler: {sched['rate']:g} req/s (burst {sched['burst']}) · "
+                f"{sched['submitted']} sent · {sched['coalesced']} coalesced · {sched['pending']} queued"
+            )
+
+        st.download_button("Export traces (JSON lines)", perf.export_traces(),
+                           file_name="msty_traces.jsonl", mime="application/json")
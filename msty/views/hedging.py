@@ -0,0 +1,358 @@
+"""🛡️ Hedging Tool tab."""
+import streamlit as st
+from datetime import datetime
+import plotly.graph_objects as go
+
+from msty import alerts, market, risk, rolls
+from msty.hedging import position_metrics, hedge_strategies, hedged_values, cost_benefit
+from msty.memo import memoize
+from msty.scheduler import INTERACTIVE
+from msty.views import output
+
+
+def render():
+    st.title("🛡️ MSTR Hedging Tool")
+    
+    # Fetch MSTR data
+    try:
+        current_mstr_price = market.info("MSTR", priority=INTERACTIVE)['regularMarketPrice']
+        st.success(f"Current MSTR Price: ${current_mstr_price:,.2f}")
+    except:
+        current_mstr_price = st.number_input("MSTR Current Price ($)", min_value=0.01, value=500.0)
+        st.warning("Could not fetch live MSTR price. Using manual input.")
+
+    # User inputs with explanations
+    st.subheader("Your Position Details")
+    col1, col2 = st.columns(2)
+    with col1:
+        msty_holdings = st.number_input("Your MSTY Holdings (shares)", min_value=0)
+        msty_price = st.number_input("Current MSTY Price ($)", min_value=0.01, value=25.0)
+        expected_exit_price = st.number_input("Expected Bottom/Exit Price ($)", 
+                                            min_value=0.01, 
+                                            value=msty_price * 0.7,
+                                            help="The price level at which you want maximum protection or expect to exit the position")
+    with col2:
+        correlation = st.slider("MSTR-MSTY Correlation", min_value=0.0, max_value=1.0, value=0.85,
+                              help="Historical correlation between MSTR and MSTY prices. Higher values indicate stronger price relationship.")
+        hedge_percentage = st.slider("Desired Hedge Percentage", min_value=0, max_value=100, value=50,
+                                   help="Percentage of your position you want to hedge. 100% provides maximum protection but higher cost.")
+
+    # Calculate initial position metrics
+    metrics = position_metrics(msty_holdings, msty_price, expected_exit_price, hedge_percentage,
+                               current_mstr_price, correlation)
+    msty_position_value = metrics["msty_position_value"]
+    hedge_value_needed = metrics["hedge_value_needed"]
+    max_loss_without_hedge = metrics["max_loss_without_hedge"]
+    max_loss_percentage = metrics["max_loss_percentage"]
+
+    # Display position summary
+    st.subheader("Position Summary")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("MSTY Position Value", f"${msty_position_value:,.2f}")
+    with col2:
+        st.metric("Hedge Value Needed", f"${hedge_value_needed:,.2f}")
+    with col3:
+        st.metric("Max Potential Loss", f"${max_loss_without_hedge:,.2f}",
+                 delta=max_loss_percentage)
+
+    render_position_risk(msty_position_value, metrics["mstr_equivalent"], current_mstr_price,
+                         metrics["mstr_equivalent_exit"])
+
+    # Detailed hedge calculation explanation
+    st.subheader("Hedge Calculation Details")
+    st.write("""
+    The hedge is calculated using the following steps:
+    1. Calculate total MSTY position value
+    2. Determine hedge value needed based on hedge percentage
+    3. Convert MSTY hedge value to MSTR equivalent using correlation
+    4. Calculate number of put contracts needed (each contract = 100 shares)
+    5. Determine optimal strike price based on expected exit price
+    """)
+
+    # Show the math
+    mstr_equivalent = metrics["mstr_equivalent"]
+    contracts_needed = metrics["contracts_needed"]
+    mstr_equivalent_exit = metrics["mstr_equivalent_exit"]
+
+    st.write(f"""
+    **Detailed Calculations:**
+    - MSTY Position Value = {msty_holdings:,.0f} shares × ${msty_price:.2f} = ${msty_position_value:,.2f}
+    - Hedge Value Needed = ${msty_position_value:,.2f} × {hedge_percentage}% = ${hedge_value_needed:,.2f}
+    - MSTR Equivalent Shares = ${hedge_value_needed:,.2f} ÷ (${current_mstr_price:.2f} × {correlation:.2f}) = {mstr_equivalent:.2f} shares
+    - Contracts Needed = {mstr_equivalent:.2f} shares ÷ 100 shares/contract = {contracts_needed:.2f} contracts
+    - Equivalent MSTR Exit Price = ${current_mstr_price:.2f} × (${expected_exit_price:.2f} ÷ ${msty_price:.2f}) = ${mstr_equivalent_exit:.2f}
+    """)
+
+    with st.expander("🔔 Exit Price Alert"):
+        alert_email = st.text_input("Email for alerts", key="hedge_alert_email")
+        if st.button(f"Alert me if MSTR falls below ${mstr_equivalent_exit:,.2f}"):
+            try:
+                alerts.add_rule(alert_email, "price", "below", threshold=mstr_equivalent_exit,
+                                note=f"MSTY exit at ${expected_exit_price:,.2f}")
+                st.success("Alert added. Manage it in the Alerts tab.")
+            except ValueError as e:
+                st.error(str(e))
+
+    # Fetch options chain
+    if st.button("Fetch Put Options"):
+        try:
+            # Get options expiration dates
+            exp_dates = market.options("MSTR", priority=INTERACTIVE)
+            
+            if exp_dates:
+                # Convert expiration dates to more readable format and add days until expiry
+                exp_dates_info = []
+                for date in exp_dates:
+                    exp_date = datetime.strptime(date, '%Y-%m-%d')
+                    days_to_exp = (exp_date - datetime.now()).days
+                    exp_dates_info.append({
+                        'date': date,
+                        'days': days_to_exp,
+                        'display': f"{date} ({days_to_exp} days)"
+                    })
+                
+                selected_date = st.selectbox(
+                    "Select Expiration Date",
+                    options=[info['date'] for info in exp_dates_info],
+                    format_func=lambda x: next(info['display'] for info in exp_dates_info if info['date'] == x)
+                )
+                
+                # Get options chain for selected date
+                opts = market.option_chain("MSTR", selected_date, priority=INTERACTIVE)
+                if opts.puts.empty:
+                    st.error("No put options data available for the selected date.")
+                    st.stop()
+                puts_df, strategies = hedge_strategies(opts.puts, current_mstr_price,
+                                                       mstr_equivalent_exit, contracts_needed)
+
+                st.subheader("Hedge Recommendations")
+
+                # Display recommendations for different strike prices
+                titles = {
+                    "Target Exit": "**Target Exit Strategy**",
+                    "ATM": "**At-the-Money (ATM) Strategy**",
+                    "OTM": "**Out-of-the-Money (OTM) Strategy**",
+                }
+                for col, strategy in zip(st.columns(3), strategies):
+                    with col:
+                        st.write(titles[strategy["name"]])
+                        st.write(f"""
+                        - Strike Price: ${strategy['strike']:,.2f}
+                        - Contracts Needed: {strategy['contracts']:.2f}
+                        - Premium per Contract: ${strategy['ask']:,.2f}
+                        - Total Cost: ${strategy['total_cost']:,.2f}
+                        - Protection at Exit: ${strategy['exit_protection']:,.2f}
+                        """)
+
+                # Display full options chain with enhanced information
+                st.subheader("Available Put Options")
+                display_cols = ['strike', 'Strike_Pct', 'lastPrice', 'bid', 'ask', 'volume', 'openInterest', 'impliedVolatility']
+                display_df = puts_df[display_cols].head(10).copy()
+                display_df.columns = ['Strike', '% From Current', 'Last Price', 'Bid', 'Ask', 'Volume', 'Open Interest', 'Implied Volatility']
+
+                output.table("display_df", display_df, {
+                    'Strike': '${:,.2f}',
+                    '% From Current': '{:,.1f}%',
+                    'Last Price': '${:,.2f}',
+                    'Bid': '${:,.2f}',
+                    'Ask': '${:,.2f}',
+                    'Volume': '{:,.0f}',
+                    'Open Interest': '{:,.0f}',
+                    'Implied Volatility': '{:.1%}'
+                })
+
+                # Hedge visualization
+                st.subheader("Hedge Visualization")
+                output.plotly_chart("hedge_figure", hedge_figure(strategies, msty_position_value, msty_holdings * expected_exit_price,
+                                                               mstr_equivalent, current_mstr_price))
+
+                # Add cost-benefit analysis
+                st.subheader("Cost-Benefit Analysis")
+                analysis_df = cost_benefit(strategies, msty_position_value, max_loss_without_hedge)
+
+                output.table("analysis_df", analysis_df, {
+                    'Strike Price': '${:,.2f}',
+                    'Total Cost': '${:,.2f}',
+                    'Protection at Exit': '${:,.2f}',
+                    'Cost % of Position': '{:.1f}%',
+                    'Protection % at Exit': '{:.1f}%'
+                })
+
+            else:
+                st.error("No options data available for MSTR")
+        except Exception as e:
+            st.error(f"Error fetching options data: {str(e)}")
+            st.info("If the error persists, you may need to wait a few minutes and try again.")
+
+    render_roll_simulator(current_mstr_price, mstr_equivalent)
+
+
+def render_position_risk(msty_position_value, mstr_equivalent, current_mstr_price, mstr_equivalent_exit):
+    """VaR/CVaR of the MSTY position, unhedged and with 30-day puts at the candidate strikes"""
+    st.subheader("Position Risk (VaR / CVaR)")
+    if msty_position_value <= 0:
+        st.info("Enter your MSTY holdings to see value at risk.")
+        return
+    try:
+        closes = risk.aligned_closes(market.daily_history("MSTR", "2y", priority=INTERACTIVE)["Close"],
+                                     market.daily_history("MSTY", "2y", priority=INTERACTIVE)["Close"])
+        fit = risk.estimate_beta(closes)
+    except Exception as e:
+        st.warning(f"Could not load MSTR/MSTY history for risk estimates: {str(e)}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        horizon_label = st.radio("Horizon", list(risk.HORIZONS), horizontal=True)
+    with col2:
+        method = st.radio("Method", ["Historical", "Monte Carlo"], horizontal=True)
+    with col3:
+        confidence = st.select_slider("Confidence", options=[0.90, 0.95, 0.99], value=risk.CONFIDENCE,
+                                      format_func=lambda c: f"{c:.0%}")
+    horizon = risk.HORIZONS[horizon_label]
+
+    try:
+        if method == "Historical":
+            mstr_returns, msty_returns = risk.historical_scenarios(closes, horizon)
+        else:
+            mstr_returns, msty_returns = risk.monte_carlo_scenarios(closes, horizon)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+
+    candidates = {
+        "Target Exit Put": mstr_equivalent_exit,
+        "ATM Put": current_mstr_price,
+        "10% OTM Put": current_mstr_price * 0.9,
+    }
+    hedge_pnl = risk.put_pnl(mstr_returns, current_mstr_price, tuple(candidates.values()), 30,
+                             fit["mstr_vol"], horizon)
+    table = risk.position_risk(msty_position_value, msty_returns, mstr_equivalent, hedge_pnl,
+                               list(candidates), confidence)
+    st.caption(
+        f"{len(msty_returns):,} scenarios · estimated MSTY beta to MSTR {fit['beta']:.2f} "
+        f"(correlation {fit['correlation']:.2f}) · puts priced at {fit['mstr_vol']:.0%} MSTR realized vol"
+    )
+
+    risk_df = table.rename(columns={
+        'hedge': 'Hedge',
+        'var': f'VaR ({confidence:.0%})',
+        'cvar': f'CVaR ({confidence:.0%})',
+        'expected_cost': 'Expected Hedge Cost'
+    })
+    output.table("risk_df", risk_df, {
+        f'VaR ({confidence:.0%})': '${:,.2f}',
+        f'CVaR ({confidence:.0%})': '${:,.2f}',
+        'Expected Hedge Cost': '${:,.2f}'
+    }, hide_index=True)
+
+
+def render_roll_simulator(current_mstr_price, mstr_equivalent):
+    """Cost vs protection of rolling put programs over simulated or historical MSTR paths"""
+    st.subheader("Rolling Hedge Simulator")
+    st.write("""
+    Compare rolling put programs: buy puts at a strike rule and tenor, roll them a set number of
+    days before expiry, and repeat over the horizon. Every combination below is evaluated on every path.
+    """)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        horizon_months = st.slider("Horizon (months)", min_value=1, max_value=24, value=12)
+        source = st.radio("Price Paths", ["Simulated", "Historical"], horizontal=True)
+    with col2:
+        strikes_pct = st.multiselect("Strike (% of MSTR price)", [110, 100, 95, 90, 85, 80, 70],
+                                     default=[100, 90, 80])
+        tenors = st.multiselect("Tenor (days)", [14, 30, 45, 60, 90, 180], default=[30, 60, 90])
+    with col3:
+        roll_before = st.multiselect("Roll N Days Before Expiry", [0, 3, 7, 14, 21, 30], default=[7])
+        vol = st.slider("Implied Volatility (%)", min_value=20, max_value=200, value=80) / 100
+
+    days = horizon_months * rolls.TRADING_DAYS // 12
+    try:
+        if source == "Simulated":
+            n_paths = st.select_slider("Paths", options=[250, 500, 1000, 2000, 5000], value=1000)
+            paths = rolls.simulated_paths(current_mstr_price, days, vol, n_paths=n_paths, seed=42)
+        else:
+            closes = market.daily_history("MSTR", "5y")["Close"].to_numpy()
+            paths = rolls.historical_paths(closes, days, spot=current_mstr_price)
+    except Exception as e:
+        st.error(f"Could not build price paths: {str(e)}")
+        return
+
+    rules = rolls.roll_rules([p / 100 for p in strikes_pct], tenors, roll_before)
+    if rules.empty:
+        st.info("Pick at least one strike, a tenor and a roll timing shorter than the tenor.")
+        return
+
+    shares = mstr_equivalent if mstr_equivalent > 0 else 100
+    results = rolls.simulate_rolls(paths, rules, vol)
+    summary = rolls.summarize(paths, rules, results, shares=shares)
+    st.caption(f"{len(rules)} programs × {len(paths):,} paths, hedging {shares:,.0f} MSTR shares")
+
+    summary_df = summary.assign(moneyness=summary["moneyness"] * 100).rename(columns={
+        'moneyness': 'Strike %',
+        'tenor': 'Tenor (days)',
+        'roll_before': 'Roll Before (days)',
+        'rolls': 'Rolls',
+        'premium_paid': 'Premium Paid',
+        'net_cost': 'Net Cost',
+        'cost_pct': 'Net Cost %',
+        'protection': 'Protection Delivered',
+        'worst_unhedged': 'Worst 5% Unhedged',
+        'worst_hedged': 'Worst 5% Hedged',
+        'hedged_tail': 'Hedged 5th Pct'
+    })
+    output.table("roll_summary", summary_df, {
+        'Strike %': '{:.0f}%',
+        'Premium Paid': '${:,.0f}',
+        'Net Cost': '${:,.0f}',
+        'Net Cost %': '{:.1f}%',
+        'Protection Delivered': '${:,.0f}',
+        'Worst 5% Unhedged': '${:,.0f}',
+        'Worst 5% Hedged': '${:,.0f}',
+        'Hedged 5th Pct': '${:,.0f}'
+    }, hide_index=True)
+
+    fig = go.Figure(go.Scatter(
+        x=summary["net_cost"], y=summary["worst_hedged"] - summary["worst_unhedged"], mode="markers",
+        text=[f"{m:.0%} / {t}d / roll {r}d" for m, t, r in zip(summary["moneyness"], summary["tenor"],
+                                                             summary["roll_before"])],
+        marker=dict(size=10, color=summary["premium_paid"], colorscale="Viridis", showscale=True,
+                    colorbar=dict(title="Premium"))
+    ))
+    fig.update_layout(
+        title="Net Hedge Cost vs Loss Avoided in the Worst 5% of Paths",
+        xaxis_title="Average Net Cost ($)",
+        yaxis_title="Loss Avoided ($)"
+    )
+    output.plotly_chart("roll_tradeoff", fig, use_container_width=True)
+
+
+@memoize(maxsize=16)
+def hedge_figure(strategies, msty_position_value, exit_value, mstr_equivalent, current_mstr_price):
+    """Position value vs MSTR price for each hedge strategy"""
+    fig = go.Figure()
+
+    # Add current position value
+    fig.add_hline(y=msty_position_value, line_dash="dash", line_color="green",
+                annotation_text="Current Position Value")
+
+    # Add expected exit price line
+    fig.add_hline(y=exit_value, line_dash="dash", line_color="red",
+                annotation_text="Expected Exit Value")
+
+    # Add hedged position scenarios
+    labels = {"Target Exit": "Target Exit Hedged", "ATM": "ATM Hedged", "OTM": "OTM Hedged"}
+    strikes = tuple(float(s["strike"]) for s in strategies)
+    price_range, values = hedged_values(strikes, msty_position_value, mstr_equivalent, current_mstr_price)
+    for strategy, hedged in zip(strategies, values):
+        fig.add_trace(go.Scatter(x=price_range, y=hedged,
+                               name=f"{labels[strategy['name']]} (Strike: ${strategy['strike']:,.2f})"))
+
+    fig.update_layout(
+        title="Position Value vs MSTR Price",
+        xaxis_title="MSTR Price ($)",
+        yaxis_title="Position Value ($)",
+        hovermode="x unified"
+    )
+    return fig
@@ -0,0 +1,136 @@
+"""🏦 Margin Monitor tab."""
+import logging
+from datetime import date
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from msty import funds, margin, market, quotes
+from msty.views import output, workspace
+
+logger = logging.getLogger(__name__)
+
+LIVE_REFRESH_SECONDS = 2
+
+
+def render():
+    st.title("🏦 Margin Monitor")
+    st.write("""
+    Loan-to-value of your debt-funded MSTY position: the loan balance over the value of your
+    Cost Basis Tool lots, the MSTY price that would trigger a margin call, and LTV under price
+    shocks for every month left on the loan.
+    """)
+    ws = workspace()
+
+    blocks = ws.get("blocks")
+    shares = margin.collateral_shares(blocks)
+    if shares > 0:
+        st.caption(f"Collateral: {shares:,.2f} MSTY shares from {len(blocks)} Cost Basis Tool lots")
+    else:
+        st.info("No lots in the Cost Basis Tool yet; enter the shares pledged instead.")
+        shares = st.number_input("MSTY Shares Pledged", min_value=0.0, value=4000.0, step=100.0)
+
+    saved = ws.get("loan") or {}
+    with st.expander("Loan", expanded=not saved):
+        col1, col2 = st.columns(2)
+        with col1:
+            debt_amount = st.number_input("Loan Amount ($)", min_value=0.0, value=saved.get("debt_amount", 100000.0))
+            monthly_principal = st.number_input("Monthly Principal Payment ($)", min_value=0.0,
+                                                value=saved.get("monthly_principal", 3000.0))
+            interest_rate = st.number_input("Annual Interest Rate (%)", min_value=0.0,
+                                            value=saved.get("interest_rate", 5.0), key="margin_rate")
+        with col2:
+            loan_term = st.number_input("Loan Term (Months)", min_value=1, value=saved.get("loan_term", 36),
+                                        key="margin_term")
+            start = st.date_input("Loan Start", value=saved.get("start", date.today()))
+        loan = dict(debt_amount=debt_amount, monthly_principal=monthly_principal, interest_rate=interest_rate,
+                    loan_term=int(loan_term), start=start)
+        if loan != saved and st.button("Save Loan"):
+            ws.set("loan", loan)
+            st.success("Loan saved to your workspace.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        max_ltv = st.slider("Margin Call Above LTV (%)", 10, 95, int(margin.MAX_LTV * 100)) / 100
+    with col2:
+        warning_ltv = st.slider("Warn Above LTV (%)", 5, 95, int(margin.WARNING_LTV * 100)) / 100
+
+    price, source = msty_price()
+    if price is None:
+        price = st.number_input("MSTY Price ($)", min_value=0.01, value=25.0)
+        source = "manual"
+
+    balances = margin.remaining_balances(loan)
+    base = margin.stress_base(balances, shares)
+    if st.toggle("Live MSTY price", key="margin_live"):
+        render_live(balances, base, shares, price, max_ltv, warning_ltv)
+    else:
+        render_status(balances, base, shares, price, source, max_ltv, warning_ltv)
+
+
+def msty_price():
+    """Latest MSTY price and where it came from, falling back to the stored fund history"""
+    try:
+        return market.info("MSTY")["regularMarketPrice"], "live"
+    except Exception as e:
+        logger.warning("Could not fetch MSTY price: %s", e)
+    stored = funds.latest(funds.load_history())
+    stored = stored[stored["symbol"] == "MSTY"]
+    if not stored.empty and stored["price"].iloc[0] > 0:
+        return float(stored["price"].iloc[0]), f"stored {stored['date'].iloc[0]}"
+    return None, None
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live(balances, base, shares, start_price, max_ltv, warning_ltv):
+    """Status at the latest streamed price; only the price-dependent division is redone per tick"""
+    last = quotes.stream("MSTY", start_price=start_price).last()
+    price = start_price if last is None else last["close"]
+    render_status(balances, base, shares, price, "streaming", max_ltv, warning_ltv)
+
+
+def render_status(balances, base, shares, price, source, max_ltv, warning_ltv):
+    balance = balances[0]
+    current = margin.ltv(balance, shares, price)
+    call_price = margin.margin_call_price(balance, shares, max_ltv)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Collateral Value", f"${shares * price:,.2f}", help=f"MSTY at ${price:,.2f} ({source})")
+    with col2:
+        st.metric("Loan Balance", f"${balance:,.2f}")
+    with col3:
+        st.metric("Current LTV", f"{current:.1%}")
+    with col4:
+        st.metric("Margin Call Price", f"${call_price:,.2f}",
+                  f"{(call_price / price - 1) * 100:+.1f}% from here" if np.isfinite(call_price) else None,
+                  delta_color="off")
+    if current > max_ltv:
+        st.error(f"LTV {current:.1%} is above the {max_ltv:.0%} margin call level.")
+    elif current > warning_ltv:
+        st.warning(f"LTV {current:.1%} is above your {warning_ltv:.0%} warning level.")
+
+    grid = margin.stress_grid(base, price)
+    fig = go.Figure(go.Heatmap(
+        x=list(grid.columns),
+        y=[f"+{m}" for m in range(len(grid))],
+        z=np.minimum(grid.to_numpy() * 100, 200),
+        zmin=0,
+        zmax=max_ltv * 150,
+        # The margin call level sits two thirds up the scale
+        colorscale=[[0, "green"], [min(warning_ltv / max_ltv, 1) / 1.5, "yellow"], [1 / 1.5, "red"],
+                    [1, "darkred"]],
+        colorbar=dict(title="LTV %"),
+        hovertemplate="Shock %{x}, month %{y}: LTV %{z:.1f}%<extra></extra>"
+    ))
+    fig.update_layout(title="LTV Under Price Shocks", xaxis_title="MSTY Price Shock",
+                      yaxis_title="Months Ahead", height=500)
+    output.plotly_chart("ltv_stress", fig, use_container_width=True)
+
+    call_prices = balances / (max_ltv * shares) if shares > 0 else np.full(len(balances), np.inf)
+    fig_call = go.Figure(go.Scatter(x=np.arange(len(balances)), y=call_prices, name="Margin Call Price"))
+    fig_call.add_hline(y=price, line_dash="dash", line_color="blue", annotation_text="MSTY Price")
+    fig_call.update_layout(title="Margin Call Price as the Loan Amortizes", xaxis_title="Months Ahead",
+                           yaxis_title="MSTY Price ($)", height=350)
+    output.plotly_chart("margin_call_prices", fig_call, use_container_width=True)
@@ -0,0 +1,619 @@
+"""📉 Market Monitoring tab."""
+import logging
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+import plotly.graph_objects as go
+
+from msty import alerts, analytics, config, funds, market, perf, quotes, snapshots, store, yields
+from msty.views import output
+
+logger = logging.getLogger(__name__)
+
+LIVE_REFRESH_SECONDS = 2
+
+
+def render():
+    st.title("📉 Market Monitoring")
+
+    # One MSTR quote and one chain scan per rerun, shared by every sub-tab
+    try:
+        mstr_info = market.info("MSTR")
+        current_mstr_price = mstr_info['regularMarketPrice']
+    except Exception as e:
+        st.error(f"Error fetching MSTR data: {str(e)}")
+        st.info("If the error persists, you may need to wait a few minutes and try again.")
+        return
+    try:
+        chains = market.chain_scan("MSTR")
+        chain_df = snapshots.to_frame(snapshots.build_snapshot("MSTR", chains, current_mstr_price))
+        chain_error = None
+    except Exception as e:
+        chains, chain_df, chain_error = None, None, e
+
+    # Create tabs for different monitoring views
+    monitor_tab = st.tabs(["MSTR Price", "Options Analysis", "Covered Call Market"])
+    
+    with monitor_tab[0]:  # MSTR Price Tab
+        try:
+            prev_close = mstr_info['previousClose']
+            price_change = current_mstr_price - prev_close
+            price_change_pct = (price_change / prev_close) * 100
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("MSTR Current Price", 
+                         f"${current_mstr_price:,.2f}",
+                         f"{price_change:,.2f} ({price_change_pct:,.1f}%)")
+            with col2:
+                st.metric("24h Volume", 
+                         f"{mstr_info['volume']:,.0f}",
+                         f"{((mstr_info['volume']/mstr_info['averageVolume'])-1)*100:,.1f}% vs Avg")
+            with col3:
+                st.metric("Market Cap",
+                         f"${mstr_info['marketCap']/1e9:,.2f}B")
+            
+            if st.toggle("Stream live quotes", key="stream_quotes"):
+                render_live_quotes(current_mstr_price)
+
+            # Historical price chart
+            st.subheader("MSTR Price History")
+            timeframes = {
+                "1D": "1d",
+                "5D": "5d",
+                "1M": "1mo",
+                "3M": "3mo",
+                "6M": "6mo",
+                "YTD": "ytd",
+                "1Y": "1y",
+                "5Y": "5y"
+            }
+            selected_timeframe = st.selectbox("Select Timeframe", list(timeframes.keys()))
+            
+            hist = market.history("MSTR", timeframes[selected_timeframe], interval="1d")
+            fig = go.Figure()
+            fig.add_trace(go.Candlestick(
+                x=hist.index,
+                open=hist['Open'],
+                high=hist['High'],
+                low=hist['Low'],
+                close=hist['Close'],
+                name='MSTR'
+            ))
+            fig.update_layout(
+                title=f"MSTR Price ({selected_timeframe})",
+                yaxis_title="Price ($)",
+                xaxis_title="Date",
+                height=600
+            )
+            output.plotly_chart("fig", fig, use_container_width=True)
+            
+            # Volume chart
+            fig_volume = go.Figure()
+            fig_volume.add_trace(go.Bar(
+                x=hist.index,
+                y=hist['Volume'],
+                name='Volume'
+            ))
+            fig_volume.update_layout(
+                title="Trading Volume",
+                yaxis_title="Volume",
+                xaxis_title="Date",
+                height=300
+            )
+            output.plotly_chart("fig_volume", fig_volume, use_container_width=True)
+            
+            # Key statistics
+            st.subheader("Key Statistics")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("52 Week High", f"${mstr_info['fiftyTwoWeekHigh']:,.2f}")
+                st.metric("50 Day Avg", f"${mstr_info['fiftyDayAverage']:,.2f}")
+                st.metric("Beta", f"{mstr_info.get('beta', 'N/A')}")
+            with col2:
+                st.metric("52 Week Low", f"${mstr_info['fiftyTwoWeekLow']:,.2f}")
+                st.metric("200 Day Avg", f"${mstr_info['twoHundredDayAverage']:,.2f}")
+                st.metric("Shares Outstanding", f"{mstr_info['sharesOutstanding']:,.0f}")
+            with col3:
+                st.metric("52 Week Range", 
+                         f"${mstr_info['fiftyTwoWeekLow']:,.2f} - ${mstr_info['fiftyTwoWeekHigh']:,.2f}")
+                st.metric("Avg Volume", f"{mstr_info['averageVolume']:,.0f}")
+                st.metric("Float", f"{mstr_info.get('floatShares', 'N/A'):,.0f}")
+            
+        except Exception as e:
+            st.error(f"Error fetching MSTR data: {str(e)}")
+            st.info("If the error persists, you may need to wait a few minutes and try again.")
+    
+    with monitor_tab[1]:  # Options Analysis Tab
+        st.subheader("Options Market Analysis")
+        
+        try:
+            if chain_error is not None:
+                raise chain_error
+            exp_dates = list(chains)
+            
+            # Options market overview metrics
+            total_call_oi = 0
+            total_put_oi = 0
+            total_call_volume = 0
+            total_put_volume = 0
+            put_call_ratios = []
+            
+            # Collect data for all expiration dates
+            options_data = []
+            for date, opt_chain in chains.items():
+                # Calculate metrics for this expiration
+                calls_oi = opt_chain.calls['openInterest'].sum()
+                puts_oi = opt_chain.puts['openInterest'].sum()
+                calls_vol = opt_chain.calls['volume'].sum()
+                puts_vol = opt_chain.puts['volume'].sum()
+                
+                total_call_oi += calls_oi
+                total_put_oi += puts_oi
+                total_call_volume += calls_vol
+                total_put_volume += puts_vol
+                
+                # Calculate Put/Call ratio
+                pc_ratio_oi = puts_oi / calls_oi if calls_oi > 0 else 0
+                pc_ratio_vol = puts_vol / calls_vol if calls_vol > 0 else 0
+                
+                options_data.append({
+                    'Expiration': date,
+                    'Calls_OI': calls_oi,
+                    'Puts_OI': puts_oi,
+                    'Calls_Volume': calls_vol,
+                    'Puts_Volume': puts_vol,
+                    'PC_Ratio_OI': pc_ratio_oi,
+                    'PC_Ratio_Volume': pc_ratio_vol
+                })
+            
+            # Display overall options market metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Call Open Interest", f"{total_call_oi:,.0f}")
+                st.metric("Total Put Open Interest", f"{total_put_oi:,.0f}")
+            with col2:
+                st.metric("Total Call Volume", f"{total_call_volume:,.0f}")
+                st.metric("Total Put Volume", f"{total_put_volume:,.0f}")
+            with col3:
+                overall_pc_ratio_oi = total_put_oi / total_call_oi if total_call_oi > 0 else 0
+                overall_pc_ratio_vol = total_put_volume / total_call_volume if total_call_volume > 0 else 0
+                st.metric("Put/Call Ratio (OI)", f"{overall_pc_ratio_oi:.2f}")
+                st.metric("Put/Call Ratio (Volume)", f"{overall_pc_ratio_vol:.2f}")
+            
+            # Options Chain Analysis
+            st.subheader("Options Chain Analysis by Expiration")
+            
+            # Convert to DataFrame for display
+            options_df = pd.DataFrame(options_data)
+            output.table("options_df", options_df, {
+                'Calls_OI': '{:,.0f}',
+                'Puts_OI': '{:,.0f}',
+                'Calls_Volume': '{:,.0f}',
+                'Puts_Volume': '{:,.0f}',
+                'PC_Ratio_OI': '{:.2f}',
+                'PC_Ratio_Volume': '{:.2f}'
+            })
+            
+            # Detailed Options Analysis for selected expiration
+            st.subheader("Detailed Options Analysis")
+            selected_exp = st.selectbox("Select Expiration Date", exp_dates)
+            
+            if selected_exp:
+                opt_chain = chains[selected_exp]
+                
+                # Analyze call options distribution
+                calls_df = opt_chain.calls.copy()
+                calls_df['moneyness'] = (calls_df['strike'] - current_mstr_price) / current_mstr_price
+                
+                # Plot options distribution
+                fig = go.Figure()
+                
+                # Call options distribution
+                fig.add_trace(go.Bar(
+                    x=calls_df['strike'],
+                    y=calls_df['openInterest'],
+                    name='Calls Open Interest',
+                    marker_color='green',
+                    opacity=0.6
+                ))
+                
+                # Put options distribution
+                puts_df = opt_chain.puts.copy()
+                fig.add_trace(go.Bar(
+                    x=puts_df['strike'],
+                    y=puts_df['openInterest'],
+                    name='Puts Open Interest',
+                    marker_color='red',
+                    opacity=0.6
+                ))
+                
+                # Add current price line
+                fig.add_vline(x=current_mstr_price, line_dash="dash", line_color="blue",
+                            annotation_text="Current Price")
+                
+                fig.update_layout(
+                    title=f"Options Open Interest Distribution ({selected_exp})",
+                    xaxis_title="Strike Price ($)",
+                    yaxis_title="Open Interest",
+                    barmode='overlay'
+                )
+                output.plotly_chart("fig", fig, use_container_width=True)
+                
+                # Display options chain details
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.subheader("Calls Analysis")
+                    calls_analysis = calls_df[['strike', 'lastPrice', 'volume', 'openInterest', 'impliedVolatility']]
+                    output.table("calls_analysis", calls_analysis, {
+                        'strike': '${:,.2f}',
+                        'lastPrice': '${:,.2f}',
+                        'volume': '{:,.0f}',
+                        'openInterest': '{:,.0f}',
+                        'impliedVolatility': '{:.1%}'
+                    })
+                
+                with col2:
+                    st.subheader("Puts Analysis")
+                    puts_analysis = puts_df[['strike', 'lastPrice', 'volume', 'openInterest', 'impliedVolatility']]
+                    output.table("puts_analysis", puts_analysis, {
+                        'strike': '${:,.2f}',
+                        'lastPrice': '${:,.2f}',
+                        'volume': '{:,.0f}',
+                        'openInterest': '{:,.0f}',
+                        'impliedVolatility': '{:.1%}'
+                    })
+        
+        except Exception as e:
+            st.error(f"Error analyzing options data: {str(e)}")
+
+        render_options_history()
+    
+    with monitor_tab[2]:  # Covered Call Market Tab
+        st.subheader("Covered Call Market Analysis")
+        
+        try:
+            render_fund_tracker()
+            
+            # Covered Call Market Metrics
+            st.subheader("Covered Call Market Metrics")
+            
+            # Calculate metrics for near-the-money calls
+            try:
+                if chain_error is not None:
+                    raise chain_error
+                current_price = current_mstr_price
+                calls = chains[next(iter(chains))].calls  # Nearest expiration
+                
+                # Find near-the-money calls (within 5% of current price)
+                ntm_calls = calls[
+                    (calls['strike'] >= current_price * 0.95) &
+                    (calls['strike'] <= current_price * 1.05)
+                ]
+                
+                # Calculate covered call market metrics
+                total_ntm_premium = (ntm_calls['lastPrice'] * ntm_calls['openInterest']).sum()
+                avg_call_premium = ntm_calls['lastPrice'].mean()
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Near-the-Money Call Premium", f"${avg_call_premium:,.2f}")
+                    st.metric("Total Premium Value", f"${total_ntm_premium:,.2f}")
+                with col2:
+                    st.metric("Active Covered Calls", f"{ntm_calls['openInterest'].sum():,.0f}")
+                    st.metric("Daily Volume", f"{ntm_calls['volume'].sum():,.0f}")
+                
+                # Premium Yield Analysis across every expiration and strike of the same scan
+                call_yields = yields.call_yields(chain_df, current_price, datetime.now())
+                annual_yield = yields.distribution_proxy(call_yields)
+                if annual_yield is not None:
+                    st.metric("Estimated Monthly Yield", f"{annual_yield / 12 * 100:.1f}%")
+                    st.metric("Estimated Annual Yield", f"{annual_yield * 100:.1f}%")
+                    st.caption("Open-interest weighted time value of 7-45 day calls within 5% of the money, "
+                               "annualized by days to expiry.")
+
+                render_premium_yields(call_yields)
+
+            except Exception as e:
+                st.error(f"Error calculating covered call metrics: {str(e)}")
+            
+            # Historical Trends Analysis
+            st.subheader("Market Convergence/Divergence Analysis")
+            
+            # Update market history
+            if chain_error is None:
+                update_market_history(current_mstr_price, chains, chain_df)
+            
+            history_df = store.market_history().copy()
+            if len(history_df) > 1:
+                
+                # Create convergence/divergence plot
+                fig_conv = go.Figure()
+                
+                # Plot covered call ratio trend
+                fig_conv.add_trace(go.Scatter(
+                    x=history_df['date'],
+                    y=history_df['covered_call_ratio'],
+                    name='Covered Call Ratio',
+                    line=dict(color='blue')
+                ))
+                
+                # Plot market activity ratio trend
+                fig_conv.add_trace(go.Scatter(
+                    x=history_df['date'],
+                    y=history_df['market_activity_ratio'],
+                    name='Market Activity Ratio',
+                    line=dict(color='red')
+                ))
+                
+                # Calculate and plot convergence/divergence
+                history_df['convergence'] = history_df['covered_call_ratio'] - history_df['market_activity_ratio']
+                fig_conv.add_trace(go.Bar(
+                    x=history_df['date'],
+                    y=history_df['convergence'],
+                    name='Convergence/Divergence',
+                    marker_color='green',
+                    opacity=0.3
+                ))
+                
+                fig_conv.update_layout(
+                    title="Options Market Convergence/Divergence Analysis",
+                    xaxis_title="Date",
+                    yaxis_title="Ratio",
+                    height=400,
+                    showlegend=True
+                )
+                output.plotly_chart("fig_conv", fig_conv, use_container_width=True)
+                
+                # Market trend metrics
+                st.subheader("Market Trend Metrics")
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Calculate trend indicators
+                    latest_conv = history_df['convergence'].iloc[-1]
+                    conv_change = latest_conv - history_df['convergence'].iloc[-2]
+                    
+                    st.metric(
+                        "Current Convergence",
+                        f"{latest_conv:.3f}",
+                        f"{conv_change:+.3f}"
+                    )
+                    
+                    # Market pressure indicator
+                    pressure = "Increasing" if conv_change > 0 else "Decreasing"
+                    st.metric(
+                        "Market Pressure",
+                        pressure,
+                        f"{abs(conv_change/latest_conv)*100:.1f}% change" if latest_conv != 0 else "N/A"
+                    )
+                
+                with col2:
+                    # Calculate moving averages
+                    history_df['ma5'] = history_df['convergence'].rolling(5).mean()
+                    history_df['ma10'] = history_df['convergence'].rolling(10).mean()
+                    
+                    latest_ma5 = history_df['ma5'].iloc[-1]
+                    latest_ma10 = history_df['ma10'].iloc[-1]
+                    
+                    st.metric(
+                        "5-Day Moving Average",
+                        f"{latest_ma5:.3f}" if not pd.isna(latest_ma5) else "N/A"
+                    )
+                    st.metric(
+                        "10-Day Moving Average",
+                        f"{latest_ma10:.3f}" if not pd.isna(latest_ma10) else "N/A"
+                    )
+                
+                # Historical data table
+                st.subheader("Historical Data")
+                display_df = history_df[[
+                    'date', 'price', 'covered_call_ratio', 'market_activity_ratio', 'convergence'
+                ]].copy()
+                output.table("display_df", display_df, {
+                    'price': '${:,.2f}',
+                    'covered_call_ratio': '{:.3f}',
+                    'market_activity_ratio': '{:.3f}',
+                    'convergence': '{:.3f}'
+                })
+            else:
+                st.info("Collecting market history data. Check back tomorrow for trend analysis.")
+            
+        except Exception as e:
+            st.error(f"Error analyzing covered call market: {str(e)}")
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_quotes(start_price):
+    """Intraday bars from the shared quote stream; reruns on its own without rerunning the page"""
+    live = quotes.stream("MSTR", start_price=start_price)
+    state = st.session_state.setdefault("live_quotes", {"seq": 0, "bars": None})
+    # Only bars that changed since the last run come back: the open bar and any new ones
+    changed, state["seq"] = live.since(state["seq"])
+    bars = state["bars"]
+    if not changed.empty:
+        if bars is not None:
+            changed = pd.concat([bars[~bars.index.isin(changed.index)], changed])
+        state["bars"] = bars = changed.tail(live.buffer.capacity)
+    if bars is None:
+        st.info("Waiting for the first live quote...")
+        return
+
+    last = bars.iloc[-1]
+    session_change = last["close"] - bars["open"].iloc[0]
+    st.metric("MSTR Live", f"${last['close']:,.2f}",
+              f"{session_change:+,.2f} ({session_change / bars['open'].iloc[0] * 100:+.2f}%) since streaming")
+    fig = go.Figure(go.Candlestick(x=bars["time"], open=bars["open"], high=bars["high"], low=bars["low"],
+                                   close=bars["close"], name="MSTR"))
+    fig.update_layout(title=f"MSTR Live ({live.buffer.bar_seconds}s bars)", yaxis_title="Price ($)",
+                      xaxis_rangeslider_visible=False, height=400)
+    output.plotly_chart("live_quotes", fig, use_container_width=True)
+
+
+def render_fund_tracker():
+    """AUM, volume and estimated creation/redemption flows of option-income ETFs"""
+    st.subheader("Option Income ETF Tracker")
+    infos = market.infos(config.FUND_SYMBOLS)
+    if not infos:
+        st.info("No fund data available right now.")
+        return
+    try:
+        history = funds.record(infos)
+    except OSError as e:
+        logger.warning("Could not store fund history: %s", e)
+        # Show today's values without flows rather than nothing
+        history = funds.fund_rows(infos, datetime.now().date()).assign(flow_shares=None, flow=None)
+
+    current = funds.latest(history)
+    funds_df = current[["symbol", "name", "aum", "volume", "shares_outstanding", "flow"]].rename(columns={
+        'symbol': 'Symbol',
+        'name': 'Name',
+        'aum': 'AUM',
+        'volume': 'Daily Volume',
+        'shares_outstanding': 'Shares Outstanding',
+        'flow': 'Est. Daily Flow'
+    })
+    output.table("funds_df", funds_df, {
+        'AUM': '${:,.0f}',
+        'Daily Volume': '{:,.0f}',
+        'Shares Outstanding': '{:,.0f}',
+        'Est. Daily Flow': '${:,.0f}'
+    })
+
+    flows = funds.flow_table(history).dropna(how="all")
+    if not flows.empty:
+        fig = go.Figure()
+        for symbol in flows.columns:
+            fig.add_trace(go.Bar(x=flows.index, y=flows[symbol], name=symbol))
+        fig.update_layout(
+            title="Estimated Daily Creations (+) / Redemptions (-)",
+            xaxis_title="Date",
+            yaxis_title="Flow ($)",
+            barmode="relative"
+        )
+        output.plotly_chart("fund_flows", fig, use_container_width=True)
+
+
+def render_premium_yields(call_yields):
+    """Premium yield by moneyness bucket, across expirations and over time"""
+    st.subheader("Premium Yield by Moneyness")
+    by_bucket = yields.yield_by_bucket(call_yields)
+    output.table("premium_yield_buckets", by_bucket, {
+        'median_yield': '{:.1%}',
+        'contracts': '{:,.0f}',
+        'open_interest': '{:,.0f}',
+        'annualized_yield': '{:.1%}'
+    })
+
+    surface = yields.yield_surface(call_yields)
+    fig_surface = go.Figure(go.Heatmap(
+        x=[str(c) for c in surface.columns],
+        y=[f"{pd.Timestamp(e):%Y-%m-%d}" for e in surface.index],
+        z=surface.to_numpy() * 100,
+        colorbar=dict(title="Annualized %")
+    ))
+    fig_surface.update_layout(title="Annualized Premium Yield by Expiration and Moneyness",
+                              xaxis_title="Moneyness", yaxis_title="Expiration", height=500)
+    output.plotly_chart("premium_yield_surface", fig_surface, use_container_width=True)
+
+    history = analytics.derived_tables("MSTR")["premium_yield"]
+    if history is not None and history["taken_at"].nunique() > 1:
+        proxy = history.drop_duplicates("taken_at").dropna(subset=["distribution_proxy"])
+        fig_history = go.Figure()
+        fig_history.add_trace(go.Scatter(x=proxy["taken_at"], y=proxy["distribution_proxy"] * 100,
+                                         name="Near-the-Money Yield"))
+        fig_history.update_layout(title="Near-the-Money Premium Yield Over Time (MSTY Distribution Proxy)",
+                                  xaxis_title="Date", yaxis_title="Annualized Yield (%)")
+        output.plotly_chart("premium_yield_history", fig_history, use_container_width=True)
+
+
+def render_options_history():
+    """IV term structure, skew, max pain and OI changes from stored snapshots"""
+    st.subheader("Historical Options Analytics")
+    try:
+        analytics.refresh("MSTR")
+        tables = analytics.derived_tables("MSTR")
+    except Exception as e:
+        st.error(f"Error loading options history: {str(e)}")
+        return
+
+    term = tables["term_structure"]
+    if term is None or term.empty:
+        st.info("No stored chain snapshots yet. A snapshot is saved each day the Covered Call Market tab loads.")
+        return
+
+    latest = term["taken_at"].max()
+    fig_term = go.Figure()
+    month_ago = term[term["taken_at"] <= latest - pd.Timedelta(days=30)]["taken_at"].max()
+    for taken_at, name in ((latest, "Latest"), (month_ago, "30 Days Ago")):
+        if pd.isna(taken_at):
+            continue
+        curve = term[term["taken_at"] == taken_at]
+        fig_term.add_trace(go.Scatter(x=curve["expiration"], y=curve["atm_iv"] * 100,
+                                      name=f"{name} ({taken_at:%Y-%m-%d})", mode="lines+markers"))
+    fig_term.update_layout(title="ATM Implied Volatility Term Structure", xaxis_title="Expiration",
+                           yaxis_title="Implied Volatility (%)")
+    output.plotly_chart("iv_term_structure", fig_term, use_container_width=True)
+
+    skew = tables["skew"].dropna(subset=["skew"])
+    if not skew.empty:
+        # Follow the expiration closest to 30 days out on each snapshot date
+        skew = skew.assign(dte_gap=((skew["expiration"] - skew["taken_at"]).dt.days - 30).abs())
+        skew_30d = skew.loc[skew.groupby("taken_at")["dte_gap"].idxmin()]
+        fig_skew = go.Figure()
+        fig_skew.add_trace(go.Scatter(x=skew_30d["taken_at"], y=skew_30d["skew"] * 100, name="25Δ Put - Call IV"))
+        fig_skew.update_layout(title="25-Delta Skew (~30 Days to Expiry)", xaxis_title="Date",
+                               yaxis_title="Skew (vol points)")
+        output.plotly_chart("iv_skew", fig_skew, use_container_width=True)
+
+    pain = tables["max_pain"]
+    pain_latest = pain[pain["taken_at"] == pain["taken_at"].max()]
+    spot = term.loc[term["taken_at"] == latest, "spot"].iloc[0]
+    fig_pain = go.Figure()
+    fig_pain.add_trace(go.Bar(x=pain_latest["expiration"], y=pain_latest["max_pain"], name="Max Pain"))
+    fig_pain.add_hline(y=spot, line_dash="dash", line_color="blue", annotation_text="MSTR Price")
+    fig_pain.update_layout(title="Max Pain by Expiration", xaxis_title="Expiration", yaxis_title="Strike ($)")
+    output.plotly_chart("max_pain", fig_pain, use_container_width=True)
+
+    activity = tables["strike_activity"]
+    activity = activity[activity["taken_at"] == activity["taken_at"].max()]
+    expirations = sorted(activity["expiration"].unique())
+    if expirations:
+        selected = st.selectbox("OI Change for Expiration", expirations,
+                                format_func=lambda e: f"{pd.Timestamp(e):%Y-%m-%d}")
+        changes = activity[activity["expiration"] == selected]
+        fig_oi = go.Figure()
+        for kind, name, color in (("C", "Calls", "green"), ("P", "Puts", "red")):
+            side = changes[changes["type"] == kind]
+            fig_oi.add_trace(go.Bar(x=side["strike"], y=side["oi_change"], name=f"{name} OI Change",
+                                    marker_color=color, opacity=0.6))
+        fig_oi.add_vline(x=spot, line_dash="dash", line_color="blue", annotation_text="Current Price")
+        fig_oi.update_layout(title="Open Interest Change Since Previous Snapshot", xaxis_title="Strike Price ($)",
+                             yaxis_title="OI Change", barmode="overlay")
+        output.plotly_chart("oi_change", fig_oi, use_container_width=True)
+
+
+@perf.timed("update_market_history")
+def update_market_history(current_price, chains, chain_df):
+    """Store today's snapshot and metrics, and check registered alerts against them"""
+    try:
+        # Keep one full-chain snapshot per day for historical analysis
+        try:
+            snapshots.capture_daily("MSTR", chains, current_price)
+        except OSError as e:
+            logger.warning("Could not store MSTR chain snapshot: %s", e)
+
+        # Daily market metrics are stored by the alerts check and shared by all
+        # sessions through store.market_history
+        try:
+            _, fired = alerts.check_snapshot(chain_df, current_price)
+        except OSError as e:
+            logger.warning("Could not store market metrics or check alerts: %s", e)
+        else:
+            for _, rule in fired.iterrows():
+                st.toast(f"🔔 {alerts.describe(rule)}")
+                
+    except Exception as e:
+        st.error(f"Error updating market history: {str(e)}")
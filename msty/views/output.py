@@ -0,0 +1,90 @@
+"""Streamlit output helpers that time rendering in ``msty.perf``.
+
+DataFrame styling and Plotly serialization both happen inside the Streamlit
+call, so the span around it captures their cost.
+
+``table`` is the cheap way to show a formatted frame. Styler renders HTML and
+CSS for every cell on the server, so ``str.format`` specs such as
+``'${:,.2f}'`` or ``'{:.1%}'`` are translated to ``st.column_config``
+number formats that the browser applies instead. Frames longer than one page
+are sent a page at a time, and Styler is only used for small frames whose
+formats have no column config equivalent.
+"""
+import re
+
+import streamlit as st
+
+from msty import perf
+
+PAGE_SIZE = 500
+# Largest frame (rows x columns) still rendered through Styler when needed
+STYLER_MAX_CELLS = 5000
+
+# Optional prefix, one format field with thousands separator/precision/type, optional suffix
+_SPEC = re.compile(r"^(?P<prefix>[^{}]*)\{:(?P<comma>,?)(?:\.(?P<digits>\d+))?(?P<type>[fd%])\}(?P<suffix>[^{}]*)$")
+
+
+def dataframe(name, data, **kwargs):
+    rows = len(getattr(data, "data", data))
+    with perf.span(f"render:{name}", "render", rows=rows):
+        return st.dataframe(data, **kwargs)
+
+
+def plotly_chart(name, fig, **kwargs):
+    with perf.span(f"render:{name}", "render", traces=len(fig.data)):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def number_format(spec):
+    """printf format for a ``str.format`` spec and whether values must be scaled by 100.
+
+    Returns None when the spec has no printf equivalent.
+    """
+    match = _SPEC.match(spec)
+    if match is None:
+        return None
+    prefix, suffix = (match[part].replace("%", "%%") for part in ("prefix", "suffix"))
+    digits = match["digits"] or ("0" if match["type"] == "d" else "6")
+    conversion = "d" if match["type"] == "d" else f".{digits}f"
+    if match["type"] == "%":
+        suffix = "%%" + suffix
+    return f"{prefix}%{match['comma']}{conversion}{suffix}", match["type"] == "%"
+
+
+def _page(name, df, page_size):
+    pages = -(-len(df) // page_size)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{name}_page")
+    start = (page - 1) * page_size
+    st.caption(f"Rows {start + 1:,}–{min(start + page_size, len(df)):,} of {len(df):,}")
+    return df.iloc[start:start + page_size]
+
+
+def table(name, df, formats=None, page_size=PAGE_SIZE, **kwargs):
+    """Show a DataFrame with ``str.format`` specs per column, a page at a time"""
+    formats = formats or {}
+    if len(df) > page_size:
+        df = _page(name, df, page_size)
+
+    column_config = {}
+    scaled = {}
+    unconverted = {}
+    for column, spec in formats.items():
+        if column not in df:
+            continue
+        converted = number_format(spec)
+        if converted is None:
+            unconverted[column] = spec
+            continue
+        column_config[column], percent = converted
+        if percent:
+            scaled[column] = df[column] * 100
+    if scaled:
+        df = df.assign(**scaled)
+    column_config = {column: st.column_config.NumberColumn(format=fmt) for column, fmt in column_config.items()}
+    column_config.update(kwargs.pop("column_config", None) or {})
+
+    data = df
+    if unconverted and df.size <= STYLER_MAX_CELLS:
+        data = df.style.format(unconverted)
+    with perf.span(f"render:{name}", "render", rows=len(df), styled=data is not df):
+        return st.dataframe(data, column_config=column_config or None, **kwargs)
@@ -0,0 +1,130 @@
+"""💸 Return on Debt tab."""
+from datetime import date
+
+import numpy as np
+import streamlit as st
+
+from msty import market, optimizer
+from msty.debt import return_on_debt
+from msty.views import output, workspace
+
+
+def render():
+    st.title("💸 Return on Debt")
+
+    debt_amount = st.number_input("Total Debt Incurred ($)", min_value=0.0, value=100000.0)
+    monthly_principal = st.number_input("Monthly Principal Payment Toward Debt ($)", min_value=0.0, value=3000.0)
+    interest_rate = st.number_input("Annual Interest Rate (%)", min_value=0.0, value=5.0)
+    share_cost = st.number_input("Cost Basis per Share ($)", min_value=0.01, value=25.0)
+    loan_term = st.number_input("Loan Term (Months)", min_value=1, value=36)
+    compounding_term = st.number_input("Compounding Period (Months)", min_value=1, value=36)
+    reinvest_price = st.number_input("Reinvestment Share Price ($)", min_value=0.01, value=30.0)
+    avg_dividend = st.number_input("Average Monthly Dividend per Share ($)", min_value=0.01, value=2.00)
+    expected_price = st.number_input("Estimated Price per Share at End ($)", min_value=0.01, value=40.0)
+
+    run_debt = st.button("Calculate Return on Debt")
+
+    if run_debt:
+        result = return_on_debt(debt_amount, monthly_principal, interest_rate, share_cost, loan_term,
+                                compounding_term, reinvest_price, avg_dividend, expected_price)
+        initial_shares = result["initial_shares"]
+        total_interest = result["total_interest"]
+        new_shares = result["new_shares"]
+        final_share_count = result["final_share_count"]
+        final_value = result["final_value"]
+
+        st.markdown(f"**Initial Shares Purchased:** {initial_shares:,.2f}")
+        st.markdown(f"**Total Interest Paid:** ${total_interest:,.2f}")
+        st.markdown(f"**New Shares Reinvested:** {new_shares:,.2f}")
+        st.markdown(f"**Final Total Shares:** {final_share_count:,.2f}")
+        st.markdown(f"**Portfolio Value at Exit Price:** ${final_value:,.2f}")
+
+    if st.button("Track This Loan in the Margin Monitor"):
+        workspace().set("loan", dict(debt_amount=debt_amount, monthly_principal=monthly_principal,
+                                     interest_rate=interest_rate, loan_term=int(loan_term), start=date.today()))
+        st.success("Loan saved; the Margin Monitor tab now tracks it against your Cost Basis lots.")
+
+    render_optimizer(interest_rate, avg_dividend / share_cost * 100)
+
+
+def render_optimizer(interest_rate, dividend_yield):
+    """Search loan size, payoff schedule, reinvestment and hedging for the best feasible plan"""
+    st.subheader("Debt Plan Optimizer")
+    st.write("""
+    Search every combination of loan amount, principal payoff schedule, reinvestment and put hedge
+    percentage for the plan with the highest expected equity at the horizon, among plans that stay
+    within your margin call and drawdown limits.
+    """)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        own_equity = st.number_input("Your Own Capital ($)", min_value=0.0, value=100000.0, step=10000.0)
+        max_loan = st.number_input("Largest Loan to Consider ($)", min_value=0.0, value=200000.0, step=10000.0)
+        months = st.slider("Horizon (Months)", 12, 120, 60, key="optimizer_months")
+    with col2:
+        yield_pct = st.number_input("Monthly Distribution Yield (%)", min_value=0.0, value=float(dividend_yield),
+                                    step=0.5)
+        source = st.radio("MSTY Price Paths", ["Assumed", "MSTY history"], horizontal=True)
+        drift = st.number_input("Expected Annual Price Change (%)", value=-10.0, step=5.0,
+                                disabled=source != "Assumed")
+        vol = st.number_input("Annual Volatility (%)", min_value=1.0, value=60.0, step=5.0)
+    with col3:
+        max_ltv = st.slider("Margin Call Above LTV (%)", 10, 95, 70)
+        max_call_prob = st.slider("Max Margin Call Probability (%)", 0, 50, 5)
+        max_drawdown = st.slider("Drawdown Limit (%)", 0, 100, 0, help="0 disables the drawdown constraint")
+        drawdown_prob = st.slider("Max Probability of Exceeding It (%)", 0, 50, 10, disabled=max_drawdown == 0)
+
+    params = dict(own_equity=own_equity, max_loan=max_loan, months=months, yield_pct=yield_pct, source=source,
+                  drift=drift, vol=vol, max_ltv=max_ltv, max_call_prob=max_call_prob, max_drawdown=max_drawdown,
+                  drawdown_prob=drawdown_prob, interest_rate=interest_rate)
+    if st.button("Optimize Plan"):
+        st.session_state.optimizer_params = params
+    if st.session_state.get("optimizer_params") != params:
+        return
+
+    n_paths = optimizer.STAGES[-1]
+    if source == "Assumed":
+        returns = optimizer.simulated_returns(months, n_paths, drift / 100, vol / 100, seed=7)
+    else:
+        try:
+            closes = market.daily_history("MSTY", "2y")["Close"].to_numpy()
+            returns = optimizer.bootstrap_returns(closes, months, n_paths, seed=7)
+        except Exception as e:
+            st.error(f"Could not load MSTY history: {str(e)}")
+            return
+
+    plans = optimizer.plan_grid(np.linspace(0, max_loan, 21), [0, 12, 24, 36, 60, 90, 120],
+                                np.arange(0, 101, 10), np.arange(0, 101, 10))
+    best, stats = optimizer.optimize(plans, returns, own_equity, interest_rate / 100, yield_pct / 100, vol / 100,
+                                     max_ltv=max_ltv / 100, max_call_prob=max_call_prob / 100,
+                                     max_drawdown=max_drawdown / 100 or None, drawdown_prob=drawdown_prob / 100)
+    st.caption(f"{len(plans):,} plans searched; "
+               + " → ".join(f"{row.plans:,} on {row.paths:,} paths" for row in stats.itertuples()))
+    if best.empty:
+        st.warning("No plan meets the constraints. Loosen the limits or lower the loan range.")
+        return
+
+    top = best.iloc[0]
+    payoff = "interest only" if top["payoff_months"] == 0 else f"paid off over {top['payoff_months']:.0f} months"
+    st.success(f"Best plan: borrow ${top['loan']:,.0f} ({payoff}), reinvest {top['reinvest_pct']:.0f}% and "
+               f"hedge {top['hedge_pct']:.0f}% for an expected ${top['mean_equity']:,.0f} of equity "
+               f"after {months} months.")
+    plans_df = best.head(20).rename(columns={
+        'loan': 'Loan',
+        'payoff_months': 'Payoff Months',
+        'reinvest_pct': 'Reinvest %',
+        'hedge_pct': 'Hedge %',
+        'mean_equity': 'Expected Equity',
+        'p5_equity': '5th Pct Equity',
+        'call_prob': 'Margin Call Prob',
+        'drawdown_prob': 'Drawdown Breach Prob'
+    })
+    output.table("optimizer_plans", plans_df, {
+        'Loan': '${:,.0f}',
+        'Payoff Months': '{:,.0f}',
+        'Reinvest %': '{:.0f}%',
+        'Hedge %': '{:.0f}%',
+        'Expected Equity': '${:,.0f}',
+        '5th Pct Equity': '${:,.0f}',
+        'Margin Call Prob': '{:.1%}',
+        'Drawdown Breach Prob': '{:.1%}'
+    }, hide_index=True)
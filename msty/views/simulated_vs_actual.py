@@ -0,0 +1,162 @@
+"""📊 Simulated vs. Actual Performance tab."""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+import plotly.graph_objects as go
+
+from msty.views import output, workspace
+
+
+def render():
+    st.title("📊 Simulated vs. Actual Performance")
+    ws = workspace()
+
+    # Add actual performance data
+    st.subheader("Add Actual Performance Data")
+    with st.form("add_actual_performance"):
+        date = st.date_input("Date", value=datetime.today())
+        actual_shares = st.number_input("Actual Shares", min_value=0.0, step=1.0)
+        actual_dividends = st.number_input("Actual Dividends Received ($)", min_value=0.0, step=1.0)
+        actual_reinvested = st.number_input("Amount Reinvested ($)", min_value=0.0, step=1.0)
+        reinvestment_price = st.number_input("Reinvestment Price per Share ($)", min_value=0.01, step=0.01)
+        submitted = st.form_submit_button("Add Entry")
+        
+        if submitted:
+            new_shares_from_reinvestment = actual_reinvested / reinvestment_price if reinvestment_price > 0 else 0
+            ws.append("actual_performance", {
+                "Date": date.strftime("%Y-%m"),
+                "Actual_Shares": actual_shares,
+                "Actual_Dividends": actual_dividends,
+                "Actual_Reinvested": actual_reinvested,
+                "Reinvestment_Price": reinvestment_price,
+                "New_Shares_From_Reinvestment": new_shares_from_reinvestment
+            })
+
+    # View selection
+    view_mode = st.selectbox("View Mode", ["Monthly", "Yearly", "Total"])
+    
+    simulation_results = ws.get("simulation_results")
+    actual_performance = ws.get("actual_performance")
+    if simulation_results is not None and len(actual_performance) > 0:
+        # Create comparison DataFrame
+        actual_df = pd.DataFrame(actual_performance)
+        sim_df = simulation_results.copy()
+        
+        # Merge simulation and actual data
+        comparison_df = pd.merge(sim_df, actual_df, on="Date", how="outer")
+        
+        if view_mode == "Yearly":
+            comparison_df['Year'] = pd.to_datetime(comparison_df['Date']).dt.year
+            comparison_df = comparison_df.groupby("Year").agg({
+                "Shares": "last",
+                "Net_Dividends": "sum",
+                "Reinvested": "sum",
+                "Actual_Shares": "last",
+                "Actual_Dividends": "sum",
+                "Actual_Reinvested": "sum",
+                "Reinvestment_Price": "mean",
+                "New_Shares_From_Reinvestment": "sum"
+            }).reset_index()
+        elif view_mode == "Total":
+            comparison_df = pd.DataFrame([{
+                "Shares": comparison_df["Shares"].iloc[-1],
+                "Net_Dividends": comparison_df["Net_Dividends"].sum(),
+                "Reinvested": comparison_df["Reinvested"].sum(),
+                "Actual_Shares": comparison_df["Actual_Shares"].iloc[-1],
+                "Actual_Dividends": comparison_df["Actual_Dividends"].sum(),
+                "Actual_Reinvested": comparison_df["Actual_Reinvested"].sum(),
+                "Reinvestment_Price": comparison_df["Reinvestment_Price"].mean(),
+                "New_Shares_From_Reinvestment": comparison_df["New_Shares_From_Reinvestment"].sum()
+            }])
+        
+        # Calculate differences
+        comparison_df["Share_Difference"] = comparison_df["Actual_Shares"] - comparison_df["Shares"]
+        comparison_df["Dividend_Difference"] = comparison_df["Actual_Dividends"] - comparison_df["Net_Dividends"]
+        comparison_df["Reinvested_Difference"] = comparison_df["Actual_Reinvested"] - comparison_df["Reinvested"]
+        
+        # Calculate weighted average reinvestment price
+        total_reinvested = comparison_df["Actual_Reinvested"].sum()
+        total_new_shares = comparison_df["New_Shares_From_Reinvestment"].sum()
+        if total_new_shares > 0:
+            weighted_avg_price = total_reinvested / total_new_shares
+        else:
+            weighted_avg_price = 0
+
+        # Display comparison metrics
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            share_diff = comparison_df["Share_Difference"].iloc[-1]
+            st.metric("Share Difference", f"{share_diff:,.2f}", 
+                     delta=f"{(share_diff/comparison_df['Shares'].iloc[-1]*100):,.1f}%" if comparison_df['Shares'].iloc[-1] > 0 else "0%")
+        with col2:
+            div_diff = comparison_df["Dividend_Difference"].sum()
+            st.metric("Dividend Difference", f"${div_diff:,.2f}", 
+                     delta=f"{(div_diff/comparison_df['Net_Dividends'].sum()*100):,.1f}%" if comparison_df['Net_Dividends'].sum() > 0 else "0%")
+        with col3:
+            reinv_diff = comparison_df["Reinvested_Difference"].sum()
+            st.metric("Reinvestment Difference", f"${reinv_diff:,.2f}", 
+                     delta=f"{(reinv_diff/comparison_df['Reinvested'].sum()*100):,.1f}%" if comparison_df['Reinvested'].sum() > 0 else "0%")
+        with col4:
+            st.metric("Weighted Avg Reinvestment Price", f"${weighted_avg_price:,.2f}")
+
+        # Display reinvestment summary
+        st.subheader("Reinvestment Summary")
+        summary_col1, summary_col2, summary_col3 = st.columns(3)
+        with summary_col1:
+            st.metric("Total Amount Reinvested", f"${total_reinvested:,.2f}")
+        with summary_col2:
+            st.metric("Total Shares from Reinvestment", f"{total_new_shares:,.2f}")
+        with summary_col3:
+            st.metric("Weighted Avg Reinvestment Price", f"${weighted_avg_price:,.2f}")
+        
+        # Display detailed comparison table
+        st.subheader("Detailed Comparison")
+        output.table("comparison_df", comparison_df, {
+            "Shares": "{:,.2f}",
+            "Net_Dividends": "${:,.2f}",
+            "Reinvested": "${:,.2f}",
+            "Actual_Shares": "{:,.2f}",
+            "Actual_Dividends": "${:,.2f}",
+            "Actual_Reinvested": "${:,.2f}",
+            "Reinvestment_Price": "${:,.2f}",
+            "New_Shares_From_Reinvestment": "{:,.2f}",
+            "Share_Difference": "{:,.2f}",
+            "Dividend_Difference": "${:,.2f}",
+            "Reinvested_Difference": "${:,.2f}"
+        })
+        
+        # Visualization
+        if view_mode != "Total":
+            # Share Growth Comparison
+            fig1 = go.Figure()
+            fig1.add_trace(go.Scatter(x=comparison_df['Year'] if view_mode == "Yearly" else comparison_df['Date'],
+                                    y=comparison_df['Shares'],
+                                    name='Simulated Shares',
+                                    line=dict(color='blue')))
+            fig1.add_trace(go.Scatter(x=comparison_df['Year'] if view_mode == "Yearly" else comparison_df['Date'],
+                                    y=comparison_df['Actual_Shares'],
+                                    name='Actual Shares',
+                                    line=dict(color='green')))
+            fig1.update_layout(title='Share Growth Comparison',
+                             xaxis_title='Time Period',
+                             yaxis_title='Number of Shares')
+            output.plotly_chart("fig1", fig1)
+            
+            # Dividend Comparison
+            fig2 = go.Figure()
+            fig2.add_trace(go.Bar(x=comparison_df['Year'] if view_mode == "Yearly" else comparison_df['Date'],
+                                y=comparison_df['Net_Dividends'],
+                                name='Simulated Dividends'))
+            fig2.add_trace(go.Bar(x=comparison_df['Year'] if view_mode == "Yearly" else comparison_df['Date'],
+                                y=comparison_df['Actual_Dividends'],
+                                name='Actual Dividends'))
+            fig2.update_layout(title='Dividend Comparison',
+                             xaxis_title='Time Period',
+                             yaxis_title='Dividends ($)',
+                             barmode='group')
+            output.plotly_chart("fig2", fig2)
+    else:
+        if simulation_results is None:
+            st.warning("Please run a simulation first in the Compounding Simulator tab.")
+        if len(actual_performance) == 0:
+            st.warning("Please add actual performance data to compare.")
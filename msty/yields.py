@@ -0,0 +1,112 @@
+"""Covered-call premium yield across every expiration and strike.
+
+Works on one chain snapshot in the ``msty.snapshots`` column layout, so the
+same code runs on a live chain scan and on stored history. Yields use the
+call's time value (premium above intrinsic), which is what a covered call
+writer keeps when the stock is called away, normalized by days to expiry and
+annualized. Aggregates are weighted by open interest.
+"""
+import numpy as np
+import pandas as pd
+
+from msty import pricing
+
+MONEYNESS_EDGES = [-np.inf, -0.10, -0.05, 0.0, 0.05, 0.10, 0.20, np.inf]
+BUCKETS = ["ITM >10%", "ITM 5-10%", "ITM 0-5%", "OTM 0-5%", "OTM 5-10%", "OTM 10-20%", "OTM >20%"]
+
+# MSTY mostly sells short-dated calls close to the money
+DISTRIBUTION_BUCKETS = ["ITM 0-5%", "OTM 0-5%"]
+DISTRIBUTION_DTE = (7, 45)
+
+
+def _per_row(value, mask):
+    """A scalar as-is, or an array aligned with the chain filtered to calls"""
+    if np.ndim(value) == 0:
+        return value
+    return np.asarray(value)[mask]
+
+
+def call_yields(chain, spot, as_of):
+    """Per-call premium, time value and annualized yield.
+
+    ``chain`` has the snapshot columns ``type``, ``expiration``, ``strike``,
+    ``bid``, ``ask``, ``last_price``, ``open_interest`` and ``volume``.
+    ``spot`` and ``as_of`` are scalars, or arrays aligned with ``chain`` when
+    it stacks several snapshots.
+    """
+    is_call = (chain["type"] == "C").to_numpy()
+    calls = chain[is_call]
+    spot = np.asarray(_per_row(spot, is_call), dtype=float)
+    as_of = pd.to_datetime(_per_row(as_of, is_call))
+    if getattr(as_of, "tz", None) is not None:
+        as_of = as_of.tz_localize(None)
+    bid = calls["bid"].to_numpy(dtype=float)
+    ask = calls["ask"].to_numpy(dtype=float)
+    last = calls["last_price"].to_numpy(dtype=float)
+    strike = calls["strike"].to_numpy(dtype=float)
+
+    # Mid when there is a two-sided quote, otherwise the last trade
+    premium = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, last)
+    time_value = np.maximum(premium - np.maximum(spot - strike, 0), 0)
+    expiration = pd.to_datetime(calls["expiration"].astype("datetime64[ns]")).to_numpy()
+    dte = np.maximum((expiration - np.asarray(as_of.normalize(), dtype="datetime64[ns]")) // np.timedelta64(1, "D"), 1)
+    period_yield = time_value / spot
+    moneyness = strike / spot - 1
+
+    return pd.DataFrame({
+        "expiration": expiration,
+        "strike": strike,
+        "dte": dte,
+        "moneyness": moneyness,
+        "bucket": pd.cut(moneyness, MONEYNESS_EDGES, labels=BUCKETS),
+        "premium": premium,
+        "time_value": time_value,
+        "period_yield": period_yield,
+        "annualized_yield": period_yield * pricing.DAYS_PER_YEAR / dte,
+        "open_interest": calls["open_interest"].to_numpy(dtype=float),
+        "volume": calls["volume"].to_numpy(dtype=float),
+    }, index=calls.index)
+
+
+def _weighted(yields, by):
+    # +1 keeps contracts with no open interest from vanishing entirely
+    weight = yields["open_interest"] + 1
+    frame = yields.assign(weight=weight, weighted=yields["annualized_yield"] * weight)
+    grouped = frame.groupby(by, observed=True)
+    table = grouped.agg(weighted=("weighted", "sum"), weight=("weight", "sum"),
+                        median_yield=("annualized_yield", "median"), contracts=("strike", "size"),
+                        open_interest=("open_interest", "sum"))
+    table["annualized_yield"] = table.pop("weighted") / table.pop("weight")
+    return table.reset_index()
+
+
+def yield_by_bucket(yields, by=()):
+    """OI-weighted annualized yield per moneyness bucket (and any ``by`` keys)"""
+    return _weighted(yields, list(by) + ["bucket"])
+
+
+def yield_surface(yields):
+    """OI-weighted annualized yield, expirations x moneyness buckets"""
+    table = _weighted(yields, ["expiration", "bucket"])
+    return table.pivot(index="expiration", columns="bucket", values="annualized_yield")
+
+
+def _near_the_money(yields):
+    low, high = DISTRIBUTION_DTE
+    return yields[yields["bucket"].isin(DISTRIBUTION_BUCKETS) & yields["dte"].between(low, high)]
+
+
+def distribution_proxy(yields):
+    """Annualized yield of short-dated near-the-money calls, or None if none are listed"""
+    near = _near_the_money(yields)
+    if near.empty:
+        return None
+    weight = near["open_interest"] + 1
+    return float((near["annualized_yield"] * weight).sum() / weight.sum())
+
+
+def distribution_proxies(yields, by):
+    """``distribution_proxy`` for every group of ``by`` keys at once"""
+    near = _near_the_money(yields)
+    table = _weighted(near, list(by))
+    return table.set_index(list(by))["annualized_yield"].rename("distribution_proxy")
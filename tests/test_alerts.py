@@ -0,0 +1,109 @@
+import smtplib
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import alerts
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path)
+
+
+def chain():
+    return pd.DataFrame({
+        "expiration": pd.to_datetime(["2026-12-18", "2026-12-18", "2026-12-18"]),
+        "type": ["P", "P", "C"],
+        "strike": [300.0, 350.0, 300.0],
+        "bid": [11.0, 30.0, 110.0],
+        "ask": [11.5, 31.0, 112.0],
+    })
+
+
+def test_evaluate_thresholds_references_and_contracts(root):
+    alerts.add_rule("a@example.com", "price", "below", threshold=310, root=root)
+    alerts.add_rule("a@example.com", "convergence", "above", reference="convergence_ma10", root=root)
+    alerts.add_rule("a@example.com", "put_ask", "below", threshold=12, expiration="2026-12-18", strike=300,
+                    root=root)
+    alerts.add_rule("a@example.com", "call_bid", "above", threshold=1, expiration="2027-01-15", strike=300,
+                    root=root)
+    rules = alerts.load_rules(root)
+    metrics = {"price": 305.0, "convergence": 0.02, "convergence_ma10": 0.05}
+    holds, values = alerts.evaluate(rules, metrics, chain())
+    assert holds.tolist() == [True, False, True, False]
+    assert values[2] == 11.5
+    # Unlisted contracts have no value and never hold
+    assert np.isnan(values[3])
+
+
+def test_add_rule_validates_input(root):
+    with pytest.raises(ValueError):
+        alerts.add_rule("not-an-email", "price", "below", threshold=1, root=root)
+    with pytest.raises(ValueError):
+        alerts.add_rule("a@example.com", "price", "below", root=root)
+    with pytest.raises(ValueError):
+        alerts.add_rule("a@example.com", "put_ask", "below", threshold=1, root=root)
+
+
+def test_rules_fire_once_and_rearm(root):
+    alerts.add_rule("a@example.com", "price", "below", threshold=310, root=root)
+    assert len(alerts.check({"price": 305.0}, root=root)) == 1
+    assert len(alerts.check({"price": 300.0}, root=root)) == 0
+    assert len(alerts.check({"price": 320.0}, root=root)) == 0
+    fired = alerts.check({"price": 309.0}, root=root)
+    assert len(fired) == 1
+    assert fired["last_value"].iloc[0] == 309.0
+
+
+def test_failed_notification_is_retried(root):
+    alerts.add_rule("a@example.com", "price", "below", threshold=310, root=root)
+
+    def fail(triggered):
+        raise smtplib.SMTPException("server down")
+
+    sent = []
+    assert alerts.check({"price": 305.0}, root=root, notify=fail).empty
+    assert not alerts.load_rules(root)["active"].any()
+    fired = alerts.check({"price": 305.0}, root=root, notify=sent.append)
+    assert len(fired) == 1
+    assert len(sent) == 1 and sent[0]["last_value"].iloc[0] == 305.0
+    assert alerts.load_rules(root)["active"].all()
+
+
+def test_concurrent_metric_updates_store_one_row_per_day(root, tmp_path):
+    day = pd.Timestamp("2026-10-19")
+    errors = []
+
+    def update(price):
+        try:
+            alerts.with_history({"price": price, "convergence": 0.0}, day=day, root=root)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=update, args=(300.0 + i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    history = alerts.metrics_history(root)
+    assert history["date"].tolist() == [day]
+    assert not [path for path in tmp_path.rglob("*.tmp")]
+
+
+def test_mail_is_sent_outside_the_lock_and_only_once(root):
+    alerts.add_rule("a@example.com", "price", "below", threshold=310, root=root)
+    during = []
+
+    def notify(triggered):
+        assert not alerts._lock.locked()
+        # A check running while the mail goes out sees the rule as already fired
+        during.append(alerts.check({"price": 305.0}, root=root, notify=notify))
+        alerts.add_rule("b@example.com", "price", "above", threshold=400, root=root)
+
+    assert len(alerts.check({"price": 305.0}, root=root, notify=notify)) == 1
+    assert len(during) == 1 and during[0].empty
+    assert len(alerts.load_rules(root)) == 2
@@ -0,0 +1,95 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from msty import analytics, snapshots
+
+
+def oi_frame(strikes, calls, puts, source="a", expiration="2026-11-20"):
+    n = len(strikes)
+    return pd.DataFrame({
+        "source": source,
+        "taken_at": pd.Timestamp("2026-10-19"),
+        "expiration": pd.Timestamp(expiration),
+        "strike": np.tile(strikes, 2).astype(float),
+        "type": ["C"] * n + ["P"] * n,
+        "open_interest": np.concatenate([calls, puts]).astype(float),
+    })
+
+
+def brute_force_max_pain(strikes, calls, puts):
+    strikes = np.asarray(strikes, dtype=float)
+    payouts = [100 * (np.sum(calls * np.maximum(s - strikes, 0)) + np.sum(puts * np.maximum(strikes - s, 0)))
+               for s in strikes]
+    return strikes[int(np.argmin(payouts))], min(payouts)
+
+
+def test_max_pain_matches_brute_force():
+    rng = np.random.default_rng(7)
+    strikes = np.arange(200, 600, 10)
+    for _ in range(20):
+        calls = rng.integers(0, 5000, len(strikes))
+        puts = rng.integers(0, 5000, len(strikes))
+        result = analytics.max_pain(oi_frame(strikes, calls, puts))
+        strike, payout = brute_force_max_pain(strikes, calls, puts)
+        assert result["max_pain"].iloc[0] == strike
+        assert np.isclose(result["holder_payout"].iloc[0], payout)
+        assert result["total_oi"].iloc[0] == calls.sum() + puts.sum()
+
+
+def test_max_pain_is_computed_per_expiration():
+    strikes = np.array([100, 110, 120])
+    df = pd.concat([
+        # Heavy calls at the low strike pull max pain down, heavy puts at the top pull it up
+        oi_frame(strikes, np.array([1000, 0, 0]), np.array([0, 0, 10]), expiration="2026-11-20"),
+        oi_frame(strikes, np.array([10, 0, 0]), np.array([0, 0, 1000]), expiration="2026-12-18"),
+    ])
+    result = analytics.max_pain(df).set_index("expiration")["max_pain"]
+    assert result[pd.Timestamp("2026-11-20")] == 100
+    assert result[pd.Timestamp("2026-12-18")] == 120
+
+
+def test_concurrent_refreshes_fold_each_snapshot_once(tmp_path):
+    strikes = np.array([300.0, 350.0, 400.0])
+    frame = pd.DataFrame({"contractSymbol": [f"C{k}" for k in strikes], "strike": strikes,
+                          "lastTradeDate": pd.Timestamp("2026-10-16", tz="UTC"), "lastPrice": 10.0, "bid": 9.0,
+                          "ask": 11.0, "volume": 10.0, "openInterest": 100.0, "impliedVolatility": 0.8})
+    chains = {"2026-11-20": SimpleNamespace(calls=frame, puts=frame)}
+    start = datetime(2026, 10, 19, 14, tzinfo=timezone.utc)
+    for day in range(3):
+        snapshots.write_snapshot(snapshots.build_snapshot("MSTR", chains, 350.0, start + timedelta(days=day)),
+                                 str(tmp_path / "chains"))
+
+    counts = []
+    threads = [threading.Thread(target=lambda: counts.append(
+        analytics.refresh("MSTR", str(tmp_path / "chains"), str(tmp_path / "derived")))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(counts) == [0, 0, 0, 3]
+    tables = analytics.derived_tables("MSTR", str(tmp_path / "derived"))
+    assert tables["max_pain"]["source"].nunique() == 3
+    assert len(tables["max_pain"]) == 3
+
+
+def test_refresh_without_new_snapshots_reads_no_tables(tmp_path, monkeypatch):
+    strikes = np.array([300.0, 350.0])
+    frame = pd.DataFrame({"contractSymbol": [f"C{k}" for k in strikes], "strike": strikes,
+                          "lastTradeDate": pd.Timestamp("2026-10-16", tz="UTC"), "lastPrice": 10.0, "bid": 9.0,
+                          "ask": 11.0, "volume": 10.0, "openInterest": 100.0, "impliedVolatility": 0.8})
+    snapshots.write_snapshot(
+        snapshots.build_snapshot("MSTR", {"2026-11-20": SimpleNamespace(calls=frame, puts=frame)}, 325.0,
+                                 datetime(2026, 10, 19, 14, tzinfo=timezone.utc)), str(tmp_path / "chains"))
+    assert analytics.refresh("MSTR", str(tmp_path / "chains"), str(tmp_path / "derived")) == 1
+
+    assert analytics.refresh("MSTR", str(tmp_path / "chains"), str(tmp_path / "derived")) == 0
+
+    reads = []
+    read_table = analytics.pq.read_table
+    monkeypatch.setattr(analytics.pq, "read_table", lambda *a, **kw: reads.append(a) or read_table(*a, **kw))
+    assert analytics.refresh("MSTR", str(tmp_path / "chains"), str(tmp_path / "derived")) == 0
+    assert not reads
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import batch, snapshots
+
+COMPOUNDING = {"initial_shares": 1000, "avg_dividend": 2.0, "reinvest_price": 25.0, "months": 12,
+               "acct_type": "Taxable", "fed_tax": 22, "state_tax": 5, "reinvest_dividends": True,
+               "reinvest_percent": 100, "withdrawal": 0, "start_year": 2026, "start_month": 10}
+RETURN_ON_DEBT = {"debt_amount": 100000, "monthly_principal": 3000, "interest_rate": 5, "share_cost": 25,
+                  "loan_term": 36, "compounding_term": 36, "reinvest_price": 30, "avg_dividend": 2,
+                  "expected_price": 40}
+HEDGE = {"msty_holdings": 5000, "msty_price": 25, "expected_exit_price": 17.5, "hedge_percentage": 50,
+         "correlation": 0.85, "days": 30}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    strikes = np.array([250.0, 300.0, 350.0])
+    side = pd.DataFrame({"contractSymbol": [f"MSTR{k:.0f}" for k in strikes], "strike": strikes,
+                         "lastTradeDate": pd.Timestamp("2026-10-16", tz="UTC"), "lastPrice": 10.0, "bid": 9.0,
+                         "ask": 11.0, "volume": 10.0, "openInterest": 100.0, "impliedVolatility": 0.8})
+    chains = {"2026-11-20": SimpleNamespace(calls=side, puts=side)}
+    taken_at = datetime(2026, 10, 19, 14, tzinfo=timezone.utc)
+    return snapshots.write_snapshot(snapshots.build_snapshot("MSTR", chains, 350.0, taken_at),
+                                    str(tmp_path / "chains"))
+
+
+def params_file(directory, filename, params):
+    directory.mkdir(exist_ok=True)
+    path = directory / filename
+    path.write_text(json.dumps(params))
+    return str(path)
+
+
+def test_good_file_writes_every_section(tmp_path, snapshot_path):
+    path = params_file(tmp_path / "in", "base.json", {"name": "base-case", "compounding": COMPOUNDING,
+                                                      "return_on_debt": RETURN_ON_DEBT, "hedge": HEDGE})
+    out = tmp_path / "out"
+    row = batch.run_file(path, str(out), "csv", snapshot_path)
+    assert row["status"] == "ok"
+    assert row["compounding.shares"] > 1000
+    for section in batch.SECTIONS:
+        assert not pd.read_csv(out / "base-case" / f"{section}.csv").empty
+    assert not list(out.rglob("*.tmp"))
+
+
+def test_unknown_section_is_reported_in_the_summary(tmp_path, snapshot_path):
+    params_file(tmp_path / "in", "good.json", {"compounding": COMPOUNDING})
+    params_file(tmp_path / "in", "typo.json", {"compunding": COMPOUNDING})
+    summary = batch.run_batch([str(tmp_path / "in")], str(tmp_path / "out"), "parquet", workers=1,
+                              snapshot_path=snapshot_path)
+    status = summary.set_index("name")["status"]
+    assert status["good"] == "ok"
+    assert status["typo"] == "error: ValueError: Unknown sections: compunding"
+    assert len(pd.read_parquet(tmp_path / "out" / "summary.parquet")) == 2
+
+
+def test_missing_snapshot_fails_the_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "latest_snapshot", lambda symbol: None)
+    path = params_file(tmp_path / "in", "hedge.json", {"hedge": HEDGE})
+    assert batch.main([path, "--out", str(tmp_path / "out"), "--workers", "1"]) == 1
+    summary = pd.read_csv(tmp_path / "out" / "summary.csv")
+    assert summary["status"].iloc[0].startswith("error: ValueError: No stored MSTR option snapshot")
+
+
+def test_names_cannot_leave_the_output_directory(tmp_path):
+    path = params_file(tmp_path / "in", "escape.json", {"name": "../x", "compounding": COMPOUNDING})
+    row = batch.run_file(path, str(tmp_path / "out"), "csv")
+    assert row["status"].startswith("error: ValueError: Invalid name")
+    assert not (tmp_path / "x").exists()
+
+
+def test_files_sharing_a_name_are_not_run(tmp_path):
+    params_file(tmp_path / "in", "a.json", {"name": "same", "compounding": COMPOUNDING})
+    params_file(tmp_path / "in", "b.json", {"name": "same", "compounding": COMPOUNDING})
+    params_file(tmp_path / "in", "c.json", {"compounding": COMPOUNDING})
+    summary = batch.run_batch([str(tmp_path / "in")], str(tmp_path / "out"), workers=1, snapshot_path="unused")
+    assert summary["status"].tolist()[:2] == ["error: ValueError: Name 'same' is used by 2 files"] * 2
+    assert summary["status"].iloc[2] == "ok"
+    assert not (tmp_path / "out" / "same").exists()
@@ -0,0 +1,32 @@
+import threading
+from datetime import date
+
+import pytest
+
+from msty import funds
+
+
+def info(price, shares, aum=None):
+    return {"regularMarketPrice": price, "navPrice": price, "sharesOutstanding": shares,
+            "totalAssets": aum or price * shares, "volume": 1000}
+
+
+def test_flow_is_share_change_times_nav(tmp_path):
+    root = str(tmp_path)
+    funds.record({"MSTY": info(20.0, 1_000_000)}, day=date(2026, 10, 16), root=root)
+    history = funds.record({"MSTY": info(21.0, 1_100_000)}, day=date(2026, 10, 19), root=root)
+    latest = funds.latest(history).set_index("symbol")
+    assert latest.loc["MSTY", "flow_shares"] == 100_000
+    assert latest.loc["MSTY", "flow"] == pytest.approx(2_100_000)
+
+
+def test_concurrent_records_keep_every_fund(tmp_path):
+    root = str(tmp_path)
+    symbols = [f"F{i}" for i in range(8)]
+    threads = [threading.Thread(target=funds.record, args=({symbol: info(10.0, 1000)},),
+                                kwargs={"day": date(2026, 10, 19), "root": root}) for symbol in symbols]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(funds.load_history(root)["symbol"]) == symbols
@@ -0,0 +1,71 @@
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import config, loadtest, market, snapshots
+from msty.views import TABS
+
+
+def test_app_warnings_are_collected_while_sessions_run():
+    with loadtest._logged_problems() as problems:
+        logging.getLogger("msty.alerts").warning("Could not store %s", "metrics")
+        logging.getLogger("msty.alerts").info("Stored metrics")
+        logging.getLogger("streamlit").warning("Not ours")
+    logging.getLogger("msty.alerts").warning("After the run")
+    assert problems == ["msty.alerts: Could not store metrics"]
+
+
+def write_replay(root, symbols):
+    """Small synthetic replay data set in the layout ``record`` writes"""
+    (root / "info").mkdir(parents=True)
+    (root / "history").mkdir()
+    for symbol in symbols:
+        info = {"regularMarketPrice": 400.0, "previousClose": 395.0, "navPrice": 20.0, "volume": 1e7,
+                "averageVolume": 9e6, "marketCap": 1e11, "fiftyTwoWeekHigh": 500.0, "fiftyTwoWeekLow": 200.0,
+                "fiftyDayAverage": 380.0, "twoHundredDayAverage": 350.0, "sharesOutstanding": 2e8,
+                "floatShares": 1.8e8, "totalAssets": 1e9, "beta": 2.0}
+        (root / "info" / f"{symbol}.json").write_text(json.dumps(info))
+
+    rng = np.random.default_rng(1)
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=300, tz="America/New_York")
+    for symbol, start in (("MSTR", 300.0), ("MSTY", 25.0)):
+        close = start * np.exp(np.cumsum(rng.normal(0, 0.03, len(index))))
+        pd.DataFrame({"Open": close, "High": close * 1.02, "Low": close * 0.98, "Close": close,
+                      "Volume": 1e6}, index=index).to_parquet(root / "history" / f"{symbol}.parquet")
+
+    strikes = np.arange(300.0, 520.0, 20.0)
+    side = pd.DataFrame({"contractSymbol": [f"MSTR{k:.0f}" for k in strikes], "strike": strikes,
+                         "lastTradeDate": pd.Timestamp.now(tz="UTC"), "lastPrice": 20.0, "bid": 19.0, "ask": 21.0,
+                         "volume": 50.0, "openInterest": 500.0, "impliedVolatility": 0.8})
+    today = datetime.now(timezone.utc)
+    chains = {f"{today + timedelta(days=days):%Y-%m-%d}": SimpleNamespace(calls=side, puts=side)
+              for days in (9, 37, 72)}
+    snapshots.write_snapshot(snapshots.build_snapshot("MSTR", chains, 400.0, today), str(root / "chains"))
+
+
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    root = tmp_path / "replay"
+    write_replay(root, {"MSTR", *config.FUND_SYMBOLS})
+    monkeypatch.setattr(market, "_ticker", market._ticker)
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(config, "QUOTE_PROVIDER", "simulated")
+    loadtest.install_replay(str(root))
+    for memo in (market._info_memo, market._daily_history_memo, market.chain_scan.memo):
+        memo.clear()
+    yield root
+    for memo in (market._info_memo, market._daily_history_memo, market.chain_scan.memo):
+        memo.clear()
+
+
+def test_every_tab_runs_without_exceptions_on_replayed_data(replay):
+    with loadtest._logged_problems() as problems:
+        app, timings = loadtest.run_session("test", list(TABS), reruns=1, timeout=60)
+    assert [(t["tab"], t["kind"]) for t in timings if t["errors"]] == []
+    assert len(timings) == 1 + 2 * len(TABS)
+    assert problems == []
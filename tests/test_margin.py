@@ -0,0 +1,36 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from msty import margin
+
+
+def test_ltv_reaches_max_at_the_margin_call_price():
+    price = margin.margin_call_price(70_000, 4000)
+    assert price == pytest.approx(25.0)
+    assert margin.ltv(70_000, 4000, price) == pytest.approx(margin.MAX_LTV)
+    assert margin.ltv(70_000, 4000, price * 1.01) < margin.MAX_LTV
+
+
+def test_no_shares_or_no_loan():
+    assert margin.margin_call_price(10_000, 0) == np.inf
+    assert margin.ltv(10_000, 0, 20.0) == np.inf
+    assert margin.margin_call_price(0, 4000) == 0.0
+    assert margin.ltv(0, 4000, 20.0) == 0.0
+
+
+def test_stress_grid_is_balance_over_shocked_collateral():
+    balances = np.array([100_000.0, 97_000.0, 94_000.0])
+    grid = margin.stress_grid(margin.stress_base(balances, 4000), 25.0)
+    assert grid.shape == (3, len(margin.SHOCKS))
+    assert grid.columns[0] == "-80%" and grid.columns[-1] == "+20%"
+    expected = balances[:, None] / (4000 * 25.0 * (1 + margin.SHOCKS)[None, :])
+    np.testing.assert_allclose(grid.to_numpy(), expected)
+    assert grid["+0%"].iloc[0] == pytest.approx(margin.ltv(100_000, 4000, 25.0))
+
+
+def test_remaining_balances_start_at_the_current_month():
+    loan = {"debt_amount": 12_000, "monthly_principal": 1000, "loan_term": 12, "start": date(2026, 1, 15)}
+    balances = margin.remaining_balances(loan, today=date(2026, 4, 1), months=2)
+    assert balances.tolist() == [9000.0, 8000.0, 7000.0]
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from msty import market
+
+
+@pytest.fixture
+def ticker_calls(monkeypatch):
+    """Replace Yahoo with a counting stub and start from an empty info cache"""
+    calls = []
+
+    def ticker(symbol):
+        calls.append(symbol)
+        return SimpleNamespace(info={"symbol": symbol, "regularMarketPrice": 10.0})
+
+    monkeypatch.setattr(market, "_ticker", ticker)
+    market._info_memo.clear()
+    yield calls
+    market._info_memo.clear()
+
+
+def test_info_is_shared_between_calls(ticker_calls):
+    assert market.info("MSTR")["regularMarketPrice"] == 10.0
+    assert market.info("MSTR")["symbol"] == "MSTR"
+    assert ticker_calls == ["MSTR"]
+
+
+def test_infos_only_fetches_uncached_symbols(ticker_calls):
+    market.info("MSTY")
+    result = market.infos(["MSTR", "MSTY", "YMAX"])
+    assert list(result) == ["MSTR", "MSTY", "YMAX"]
+    assert sorted(ticker_calls) == ["MSTR", "MSTY", "YMAX"]
+    market.infos(["MSTR", "YMAX"])
+    assert len(ticker_calls) == 3
+
+
+def test_infos_leaves_out_failed_symbols(monkeypatch, ticker_calls):
+    def ticker(symbol):
+        if symbol == "BAD":
+            raise LookupError(symbol)
+        return SimpleNamespace(info={"symbol": symbol})
+
+    monkeypatch.setattr(market, "_ticker", ticker)
+    assert list(market.infos(["BAD", "MSTR"])) == ["MSTR"]
+
+
+def test_daily_history_is_shared_per_symbol_and_period(monkeypatch):
+    calls = []
+
+    def history(symbol, period, interval="1d", priority=market.NORMAL):
+        calls.append((symbol, period, interval))
+        return pd.DataFrame({"Close": [1.0, 2.0]})
+
+    monkeypatch.setattr(market, "history", history)
+    market._daily_history_memo.clear()
+    try:
+        first = market.daily_history("MSTR", "5y")
+        assert market.daily_history("MSTR", "5y") is first
+        market.daily_history("MSTR", "2y")
+        assert calls == [("MSTR", "5y", "1d"), ("MSTR", "2y", "1d")]
+    finally:
+        market._daily_history_memo.clear()
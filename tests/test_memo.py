@@ -0,0 +1,62 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import memo
+from msty.memo import Memo, memoize, stable_hash
+
+
+def test_stable_hash_depends_on_values_not_identity():
+    df = pd.DataFrame({"Shares": [100.0, 200.0], "Price": [20.0, 25.0]})
+    assert stable_hash(df, 5, when=date(2026, 1, 1)) == stable_hash(df.copy(), 5, when=date(2026, 1, 1))
+    assert stable_hash(df) != stable_hash(df.assign(Price=[20.0, 26.0]))
+    assert stable_hash(np.arange(3)) != stable_hash(np.arange(3.0))
+    assert stable_hash({"a": 1, "b": 2}) == stable_hash({"b": 2, "a": 1})
+    assert stable_hash(1) != stable_hash("1")
+
+
+def test_stable_hash_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        stable_hash(object())
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = Memo(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(memo.time, "monotonic", lambda: now[0])
+    cache = Memo(ttl=30)
+    assert cache.get_or_compute("quote", lambda: 1) == 1
+    now[0] += 29
+    assert cache.get_or_compute("quote", lambda: 2) == 1
+    now[0] += 2
+    assert cache.get_or_compute("quote", lambda: 3) == 3
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_memoize_recomputes_only_on_new_inputs():
+    calls = []
+
+    @memoize(maxsize=4)
+    def total(df, scale=1):
+        calls.append(scale)
+        return df["x"].sum() * scale
+
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    assert total(df) == 6
+    assert total(df.copy()) == 6
+    assert total(df, scale=2) == 12
+    assert calls == [1, 2]
+    assert total.memo.stats()["hits"] == 1
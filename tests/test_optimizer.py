@@ -0,0 +1,40 @@
+import numpy as np
+
+from msty import optimizer
+
+SETUP = dict(own_equity=50_000, rate=0.07, dividend_yield=0.015, vol=0.9)
+
+
+def returns(paths=256, months=24):
+    return optimizer.simulated_returns(months, paths, 0.05, 0.9, seed=5)
+
+
+def test_staged_search_finds_the_brute_force_best_plan():
+    plans = optimizer.plan_grid(np.linspace(0, 100_000, 6), [0, 12, 24], [0, 100], [0, 50])
+    paths = returns()
+    best, stats = optimizer.optimize(plans, paths, max_call_prob=0.1, stages=(16, 64, 256), **SETUP)
+
+    everything = optimizer.simulate_plans(plans, paths, max_call_prob=0.1, **SETUP)
+    feasible = everything[everything["feasible"]].sort_values("mean_equity", ascending=False)
+    assert best.index[0] == feasible.index[0]
+    assert np.isclose(best["mean_equity"].iloc[0], feasible["mean_equity"].iloc[0])
+    assert stats["plans"].iloc[0] == len(plans) and stats["plans"].iloc[-1] < len(plans)
+
+
+def test_plans_pruned_mid_run_are_the_ones_over_the_limit():
+    plans = optimizer.plan_grid(np.linspace(0, 200_000, 9), [0, 24], [100], [0])
+    paths = returns(128)
+    unconstrained = optimizer.simulate_plans(plans, paths, **SETUP)
+    constrained = optimizer.simulate_plans(plans, paths, max_call_prob=0.1, **SETUP)
+    assert (constrained["feasible"] == (unconstrained["call_prob"] <= 0.1)).all()
+    kept = constrained["feasible"]
+    assert np.allclose(constrained.loc[kept, "mean_equity"], unconstrained.loc[kept, "mean_equity"])
+
+
+def test_infeasible_constraints_return_no_plans():
+    # Borrowing this much is over the LTV limit from the first month on every path
+    plans = optimizer.plan_grid([150_000, 200_000], [0, 12], [100], [0])
+    best, stats = optimizer.optimize(plans, returns(64), max_ltv=0.5, max_call_prob=0.0, stages=(16, 64),
+                                     **SETUP)
+    assert best.empty
+    assert stats["feasible"].tolist() == [0]
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from msty.views import output
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("${:,.2f}", ("$%,.2f", False)),
+    ("{:.1%}", ("%.1f%%", True)),
+    ("{:,d} shares", ("%,d shares", False)),
+    ("{:.3f}%", ("%.3f%%", False)),
+    ("{:,}", None),
+    ("{:%Y-%m-%d}", None),
+])
+def test_number_format_translates_format_specs(spec, expected):
+    assert output.number_format(spec) == expected
+
+
+@pytest.fixture
+def shown(monkeypatch):
+    """Replace Streamlit with a stub recording what ``table`` shows; page 2 is selected"""
+    calls = {}
+    fake = SimpleNamespace(
+        number_input=lambda label, **kwargs: 2,
+        caption=lambda text: calls.setdefault("caption", text),
+        dataframe=lambda data, **kwargs: calls.update(data=data, **kwargs),
+        column_config=SimpleNamespace(NumberColumn=lambda format: format),
+    )
+    monkeypatch.setattr(output, "st", fake)
+    return calls
+
+
+def test_table_sends_one_page_with_column_formats(shown):
+    df = pd.DataFrame({"price": range(1200), "weight": 0.5})
+    output.table("prices", df, {"price": "${:,.2f}", "weight": "{:.0%}"})
+    page = shown["data"]
+    assert page.index[0] == 500 and len(page) == 500
+    assert shown["caption"] == "Rows 501–1,000 of 1,200"
+    assert shown["column_config"] == {"price": "$%,.2f", "weight": "%.0f%%"}
+    assert (page["weight"] == 50).all()
+    # The caller's frame is not changed
+    assert (df["weight"] == 0.5).all()
+
+
+def test_styler_only_for_small_frames_with_unconverted_formats(shown):
+    small = pd.DataFrame({"when": pd.date_range("2026-01-01", periods=10)})
+    output.table("small", small, {"when": "{:%Y-%m-%d}"})
+    assert isinstance(shown["data"], pd.io.formats.style.Styler)
+
+    wide = pd.DataFrame({f"c{i}": range(100) for i in range(60)})
+    output.table("wide", wide, {"c0": "{:%Y-%m-%d}"})
+    assert shown["data"] is wide
+    assert shown["column_config"] is None
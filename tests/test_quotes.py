@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from msty import quotes
+
+
+def test_provider_must_implement_ticks():
+    class Incomplete(quotes.QuoteProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_ticks_build_bars_and_readers_get_only_changes():
+    buffer = quotes.BarBuffer(capacity=3, bar_seconds=60)
+    buffer.add_tick(0, 10.0, 1.0)
+    buffer.add_tick(30, 12.0, 2.0)
+    bars, seq = buffer.since()
+    assert bars[["open", "high", "low", "close", "volume"]].iloc[0].tolist() == [10.0, 12.0, 10.0, 12.0, 3.0]
+
+    buffer.add_tick(61, 11.0)
+    changed, seq = buffer.since(seq)
+    assert len(changed) == 1 and changed["open"].iloc[0] == 11.0
+    assert buffer.last()["close"] == 11.0
+
+
+def test_simulated_feed_yields_ticks():
+    async def first_ticks():
+        ticks = quotes.SimulatedFeed(100.0, interval=0, seed=1).ticks("MSTY")
+        try:
+            return [await ticks.__anext__() for _ in range(3)]
+        finally:
+            await ticks.aclose()
+
+    ticks = asyncio.run(first_ticks())
+    assert len(ticks) == 3
+    assert all(price > 0 for _, price, _ in ticks)
+
+
+def test_reading_the_last_bar_keeps_the_stream_alive():
+    stream = quotes.QuoteStream("MSTY", quotes.SimulatedFeed(100.0))
+    stream.buffer.add_tick(0, 10.0)
+    stream.last_read = 0.0
+    assert stream.last()["close"] == 10.0
+    assert stream.last_read > 0.0
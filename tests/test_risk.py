@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import risk
+
+
+def closes(days=120, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01 09:30", periods=days, freq="B", tz="America/New_York")
+    mstr = 300 * np.exp(np.cumsum(rng.normal(0, 0.04, days)))
+    msty = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.Series(mstr, index=index), pd.Series(msty[5:], index=index[5:])
+
+
+def test_aligned_closes_keeps_common_days_and_is_memoized():
+    mstr, msty = closes()
+    first = risk.aligned_closes(mstr, msty)
+    assert len(first) == len(msty)
+    assert first.index.tz is None
+    assert (first.index == first.index.normalize()).all()
+    assert risk.aligned_closes(mstr.copy(), msty.copy()) is first
+
+
+def test_position_risk_unhedged_var_matches_sorted_losses():
+    returns = np.linspace(-0.2, 0.2, 101)
+    table = risk.position_risk(1000.0, returns, 10, np.zeros((1, 101)), ["Put"], confidence=0.95)
+    # 5 of 101 scenarios are in the tail; the 5th worst return is -0.184
+    assert table["var"].iloc[0] == pytest.approx(184.0)
+    assert table["cvar"].iloc[0] == pytest.approx(-1000 * returns[:5].mean())
+    assert table["expected_cost"].tolist() == [0.0, 0.0]
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from msty import pricing, rolls
+
+
+def loop_rolls(path, moneyness, tenor, roll_before, vol):
+    """One rule on one path, rolled day by day"""
+    days = len(path) - 1
+    hold = max(1, round((tenor - roll_before) * rolls.TRADING_DAYS / pricing.DAYS_PER_YEAR))
+    calendar = pricing.DAYS_PER_YEAR / rolls.TRADING_DAYS
+    premium = proceeds = payoff = 0.0
+    legs = 0
+    day = 0
+    while day < days:
+        close = min(day + hold, days)
+        strike = moneyness * path[day]
+        remaining = max(tenor - (close - day) * calendar, 0.0)
+        premium += float(pricing.put_price(path[day], strike, tenor / pricing.DAYS_PER_YEAR, vol))
+        proceeds += float(pricing.put_price(path[close], strike, remaining / pricing.DAYS_PER_YEAR, vol))
+        payoff += max(strike - path[close], 0.0)
+        legs += 1
+        day = close
+    return {"premium": premium, "proceeds": proceeds, "payoff": payoff, "net_cost": premium - proceeds,
+            "rolls": legs - 1}
+
+
+def test_vectorized_rolls_match_a_loop():
+    paths = rolls.simulated_paths(300.0, 63, 0.8, n_paths=5, seed=11)
+    rules = rolls.roll_rules([0.9, 1.0], [14, 30, 60], [0, 7])
+    results = rolls.simulate_rolls(paths, rules, 0.8)
+    for i, rule in rules.iterrows():
+        for p, path in enumerate(paths):
+            expected = loop_rolls(path, rule["moneyness"], rule["tenor"], rule["roll_before"], 0.8)
+            for name, value in expected.items():
+                got = results[name][i] if name == "rolls" else results[name][i, p]
+                assert got == pytest.approx(value), (name, dict(rule), p)
+
+
+def test_roll_rules_drop_rolls_at_or_after_expiry():
+    rules = rolls.roll_rules([1.0], [7, 30], [7, 14])
+    assert rules[["tenor", "roll_before"]].values.tolist() == [[30, 7], [30, 14]]
+
+
+def test_historical_paths_are_rescaled_windows():
+    closes = np.array([10.0, 11.0, 12.0, 9.0])
+    paths = rolls.historical_paths(closes, 2, spot=100.0)
+    np.testing.assert_allclose(paths, [[100.0, 110.0, 120.0], [100.0, 12 / 11 * 100, 9 / 11 * 100]])
+    with pytest.raises(ValueError):
+        rolls.historical_paths(closes, 4)
@@ -0,0 +1,103 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from msty.scheduler import BULK, INTERACTIVE, NORMAL, Scheduler, TokenBucket
+
+
+@contextmanager
+def blocked_scheduler(workers=1):
+    """A scheduler whose workers are all busy until the returned event is set"""
+    scheduler = Scheduler(rate=1000, burst=1000, workers=workers)
+    release = threading.Event()
+    started = threading.Barrier(workers + 1)
+
+    def block():
+        started.wait()
+        release.wait()
+
+    for i in range(workers):
+        scheduler.submit(("block", i), block)
+    started.wait(timeout=5)
+    try:
+        yield scheduler, release
+    finally:
+        release.set()
+
+
+def test_token_bucket_allows_burst_then_refuses():
+    bucket = TokenBucket(rate=0.001, capacity=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    bucket.release()
+    assert bucket.try_acquire()
+
+
+def test_token_bucket_penalty_blocks_tokens():
+    bucket = TokenBucket(rate=1, capacity=5)
+    bucket.penalize(30)
+    assert not bucket.try_acquire()
+
+
+def test_identical_requests_are_coalesced():
+    with blocked_scheduler() as (scheduler, release):
+        calls = []
+        first, created = scheduler.submit(("info", "MSTR"), lambda: calls.append(1) or "quote")
+        second, coalesced = scheduler.submit(("info", "MSTR"), lambda: calls.append(2) or "other")
+        assert created and not coalesced
+        assert first is second
+        release.set()
+        assert first.result(timeout=5) == "quote"
+        assert calls == [1]
+        assert scheduler.stats()["coalesced"] == 1
+
+
+def test_finished_requests_are_not_coalesced():
+    scheduler = Scheduler(rate=1000, burst=1000)
+    future, _ = scheduler.submit("key", lambda: 1)
+    assert future.result(timeout=5) == 1
+    deadline = time.monotonic() + 5
+    while scheduler.pending() or "key" in scheduler._inflight:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    _, created = scheduler.submit("key", lambda: 2)
+    assert created
+
+
+def test_higher_priority_runs_first_while_workers_are_busy():
+    with blocked_scheduler(workers=2) as (scheduler, release):
+        order = []
+        futures = [scheduler.submit(("bulk", i), lambda i=i: order.append(f"bulk{i}"), BULK)[0] for i in range(3)]
+        futures.append(scheduler.submit("normal", lambda: order.append("normal"), NORMAL)[0])
+        futures.append(scheduler.submit("interactive", lambda: order.append("interactive"), INTERACTIVE)[0])
+        # Nothing leaves the queue while no worker is free
+        time.sleep(0.05)
+        assert scheduler.pending() == 5
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        assert order[:2] == ["interactive", "normal"]
+
+
+def test_coalesced_request_is_promoted():
+    with blocked_scheduler() as (scheduler, release):
+        order = []
+        scheduler.submit("a", lambda: order.append("a"), NORMAL)
+        future, _ = scheduler.submit("b", lambda: order.append("b"), BULK)
+        scheduler.submit("b", lambda: None, INTERACTIVE)
+        release.set()
+        future.result(timeout=5)
+        assert order[0] == "b"
+
+
+def test_exceptions_reach_the_caller_and_free_the_worker():
+    scheduler = Scheduler(rate=1000, burst=1000, workers=1)
+
+    def fail():
+        raise ValueError("throttled")
+
+    future, _ = scheduler.submit("fail", fail)
+    with pytest.raises(ValueError, match="throttled"):
+        future.result(timeout=5)
+    assert scheduler.submit("next", lambda: 1)[0].result(timeout=5) == 1
@@ -0,0 +1,31 @@
+from msty import taxes
+from msty.simulator import simulate_compounding
+
+
+def run(**kwargs):
+    params = dict(initial_shares=1000, avg_dividend=1.0, reinvest_price=20.0, months=4, acct_type="Tax Deferred",
+                  fed_tax=0, state_tax=0, reinvest_dividends=True, reinvest_percent=100, withdrawal=0,
+                  start_year=2026, start_month=1)
+    params.update(kwargs)
+    return simulate_compounding(**params)
+
+
+def test_months_roll_into_the_next_year_after_december():
+    monthly, _ = run(start_month=11)
+    assert monthly["Date"].tolist() == ["2026-11", "2026-12", "2027-01", "2027-02"]
+
+
+def test_january_start_stays_in_the_start_year():
+    monthly, _ = run(months=13)
+    assert monthly["Date"].iloc[0] == "2026-01"
+    assert monthly["Date"].iloc[11] == "2026-12"
+    assert monthly["Date"].iloc[12] == "2027-01"
+
+
+def test_state_safe_harbor_uses_prior_year_state_tax():
+    common = dict(acct_type="Taxable", fed_tax=0, state="NY", months=11, start_month=2,
+                  reinvest_dividends=False, withdrawal=0, payment_method=taxes.SAFE_HARBOR)
+    _, without = run(**common)
+    _, with_prior = run(state_prior_year_tax=400.0, **common)
+    # The April, June and September installments are 25% of last year's state tax each
+    assert with_prior["tax_paid"] - without["tax_paid"] == 300.0
@@ -0,0 +1,76 @@
+import os
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import snapshots
+
+
+def side(kind, strikes):
+    return pd.DataFrame({
+        "contractSymbol": [f"MSTR{kind}{k:.0f}" for k in strikes],
+        "lastTradeDate": pd.Timestamp("2026-10-16 20:00", tz="UTC"),
+        "strike": strikes,
+        "lastPrice": 10.0,
+        "bid": 9.5,
+        "ask": 10.5,
+        "change": 0.0,
+        "percentChange": 0.0,
+        "volume": [5.0, np.nan, 7.0],
+        "openInterest": [100.0, 200.0, 300.0],
+        "impliedVolatility": 0.8,
+        "inTheMoney": False,
+    })
+
+
+@pytest.fixture
+def chains():
+    strikes = np.array([300.0, 350.0, 400.0])
+    chain = SimpleNamespace(calls=side("C", strikes), puts=side("P", strikes))
+    return {"2026-11-20": chain, "2026-12-18": chain}
+
+
+def test_round_trip_keeps_contracts_and_metadata(tmp_path, chains):
+    taken_at = datetime(2026, 10, 19, 14, 30, tzinfo=timezone.utc)
+    path = snapshots.write_snapshot(snapshots.build_snapshot("MSTR", chains, 350.0, taken_at), str(tmp_path))
+    table = snapshots.read_snapshot(path, expirations=["2026-12-18"])
+    meta = snapshots.snapshot_metadata(table.schema)
+    assert meta["symbol"] == "MSTR"
+    assert meta["underlying_price"] == 350.0
+    assert meta["taken_at"] == taken_at
+    df = snapshots.to_frame(table)
+    assert len(df) == 6
+    assert df["volume"].tolist() == [5, 0, 7, 5, 0, 7]
+    assert snapshots.list_snapshots("MSTR", str(tmp_path)) == [path]
+
+
+def test_capture_daily_writes_one_snapshot_per_day(tmp_path, chains):
+    paths = []
+
+    def capture():
+        paths.append(snapshots.capture_daily("MSTR", chains, 350.0, str(tmp_path)))
+
+    threads = [threading.Thread(target=capture) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len([p for p in paths if p]) == 1
+    assert len(snapshots.list_snapshots("MSTR", str(tmp_path))) == 1
+
+
+def test_failed_write_leaves_no_snapshot_and_is_retried(tmp_path, chains, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(snapshots.pq, "write_table", fail)
+        with pytest.raises(OSError):
+            snapshots.capture_daily("MSTR", chains, 350.0, str(tmp_path))
+    assert not any(name.endswith(".tmp") for _, _, names in os.walk(tmp_path) for name in names)
+    assert not snapshots.has_snapshot_for("MSTR", datetime.now(timezone.utc), str(tmp_path))
+    assert snapshots.capture_daily("MSTR", chains, 350.0, str(tmp_path)) is not None
@@ -0,0 +1,49 @@
+import threading
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from msty import store
+
+
+def test_values_round_trip_through_the_workspace_file(tmp_path):
+    root = str(tmp_path)
+    frame = pd.DataFrame({"Month": [1, 2], "Shares": [100.5, 101.25]})
+    workspace = store.Workspace("abc", root)
+    workspace.set("simulation_results", frame)
+    workspace.set("loan", {"opened": date(2026, 10, 19), "updated": datetime(2026, 10, 19, 9, 30),
+                           "balance": np.float64(1500.5), "payments": np.int64(3)})
+    workspace.append("blocks", {"Date": date(2026, 1, 5), "Shares": 10.0, "Price": 21.5})
+
+    loaded = store.Workspace("abc", root)
+    pd.testing.assert_frame_equal(loaded.get("simulation_results"), frame, check_index_type=False)
+    assert loaded.get("loan") == {"opened": date(2026, 10, 19), "updated": datetime(2026, 10, 19, 9, 30),
+                                  "balance": 1500.5, "payments": 3}
+    assert loaded.get("blocks") == [{"Date": date(2026, 1, 5), "Shares": 10.0, "Price": 21.5}]
+    assert loaded.get("actual_performance") == []
+
+
+def test_unsupported_values_are_rejected(tmp_path):
+    with pytest.raises(TypeError):
+        store.Workspace("abc", str(tmp_path)).set("loan", {"value": object()})
+
+
+def test_concurrent_appends_are_all_saved(tmp_path):
+    root = str(tmp_path)
+    workspace = store.get_workspace("shared", root)
+    threads = [threading.Thread(target=workspace.append, args=("actual_performance", {"month": i}))
+               for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    saved = store.Workspace("shared", root).get("actual_performance")
+    assert sorted(entry["month"] for entry in saved) == list(range(16))
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_workspace_ids_are_validated():
+    with pytest.raises(ValueError):
+        store.get_workspace("../etc")
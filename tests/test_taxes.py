@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from msty import taxes
+
+
+def test_lot_schedule_roc_reduces_basis_then_becomes_gain():
+    # $1 of ROC a month on a $2.50 lot held from the start
+    basis, short_term, long_term = taxes.lot_schedule(np.ones(4), [0], [2.5])
+    assert basis[0].tolist() == [2.5, 1.5, 0.5, 0.0, 0.0]
+    assert short_term[0].tolist() == [0.0, 0.0, 0.5, 1.0]
+    assert not long_term.any()
+
+
+def test_lot_schedule_new_lots_only_see_later_roc():
+    basis, short_term, _ = taxes.lot_schedule(np.full(3, 2.0), [0, 1, 2], [10.0, 3.0, 1.0])
+    assert basis[:, -1].tolist() == [4.0, 0.0, 0.0]
+    # The lot bought at the end of month 1 gets ROC from month 2 on
+    assert short_term[1].tolist() == [0.0, 0.0, 1.0]
+    assert short_term[2].tolist() == [0.0, 0.0, 1.0]
+
+
+def test_lot_schedule_splits_gains_by_holding_period():
+    _, short_term, long_term = taxes.lot_schedule(np.ones(3), [0, 0], [0.0, 0.0], lot_age=[11, 0])
+    # The first lot passes 12 months held in month 2
+    assert short_term[0].tolist() == [1.0, 0.0, 0.0]
+    assert long_term[0].tolist() == [0.0, 1.0, 1.0]
+    assert short_term[1].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_accounts_pass_prior_year_tax_to_each_jurisdiction():
+    federal, state, rate = taxes.accounts(taxes.SAFE_HARBOR, "CA", 0, prior_year_tax=1000.0,
+                                          high_income=True, state_prior_year_tax=200.0)
+    assert rate == taxes.STATE_RULES["CA"]["rate"]
+    assert federal.step(2026, 4) == (pytest.approx(275.0), 0.0)
+    assert state.step(2026, 4) == (pytest.approx(66.0), 0.0)
+
+
+def penalty_at_filing(prior_year_tax):
+    account = taxes.TaxAccount(taxes.AT_FILING, prior_year_tax=prior_year_tax)
+    for month in range(1, 13):
+        account.accrue(2026, month, 1000.0)
+    for month in range(1, 13):
+        account.step(2026, month)
+    paid, penalty = account.step(2027, 4)
+    assert paid == 12000.0
+    return penalty
+
+
+def test_unpaid_quarterly_estimates_are_penalized():
+    # Without a prior year tax there is no safe harbor floor to fall short of
+    assert penalty_at_filing(prior_year_tax=0.0) == 0.0
+    assert penalty_at_filing(prior_year_tax=6000.0) > 0